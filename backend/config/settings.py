@@ -67,6 +67,13 @@ DATABASES = {
     ),
 }
 
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://"),
+    # Content versions, serialized API responses and their hit/miss counters.
+    # Point at a shared backend (file or Redis) when running several workers.
+    "content": env.cache("CONTENT_CACHE_URL", default="locmemcache://content"),
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -118,6 +125,19 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Compiled answer keys for published tests are shared between workers through
+# this cache alias (see exams.utils.answer_key).
+ANSWER_KEY_CACHE_ALIAS = env("ANSWER_KEY_CACHE_ALIAS", default="default")
+ANSWER_KEY_CACHE_TIMEOUT = env.int("ANSWER_KEY_CACHE_TIMEOUT", default=60 * 60 * 24)
+
+CONTENT_CACHE_ALIAS = "content"
+RESPONSE_CACHE_TIMEOUT = env.int("RESPONSE_CACHE_TIMEOUT", default=600)
+PROFILE_CACHE_TIMEOUT = env.int("PROFILE_CACHE_TIMEOUT", default=300)
+ACCESS_CACHE_TIMEOUT = env.int("ACCESS_CACHE_TIMEOUT", default=300)
+# Optional directory for the generated verb library (exams.data.verb_library);
+# empty keeps it in memory only.
+VERB_LIBRARY_CACHE_DIR = env("VERB_LIBRARY_CACHE_DIR", default="")
+
 JAZZMIN_SETTINGS = {
     "site_title": "Norskkurs Admin",
     "site_header": "Norskkurs",
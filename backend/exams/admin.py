@@ -1,17 +1,18 @@
-import csv
-import io
-
 from django import forms
 from django.contrib import admin, messages
-from django.http import HttpResponse
-from django.shortcuts import redirect
+from django.core.exceptions import PermissionDenied
+from django.http import FileResponse, Http404, JsonResponse
+from django.shortcuts import get_object_or_404, redirect
 from django.template.response import TemplateResponse
-from django.urls import path
+from django.urls import path, reverse
+from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 
+from .jobs import content_key_for_model, enqueue_export, enqueue_import
 from .models import (
     Answer,
     Assignment,
+    CsvJob,
     Exercise,
     Expression,
     GlossaryTerm,
@@ -25,13 +26,12 @@ from .models import (
     Test,
     VerbEntry,
 )
-from .utils.expression_csv import (
-    export_expressions_to_file,
-    import_expressions_from_reader,
-)
-from .utils.glossary_csv import export_glossary_to_file, import_glossary_from_reader
-from .utils.reading_csv import export_readings_to_file, import_readings_from_reader
-from .utils.verb_csv import export_verbs_to_file, import_verbs_from_reader
+from .utils.csv_export import streaming_csv_response
+from .utils.csv_import import read_upload
+from .utils.expression_csv import import_expressions_from_reader, iter_expression_rows
+from .utils.glossary_csv import import_glossary_from_reader, iter_glossary_rows
+from .utils.reading_csv import import_readings_from_reader, iter_reading_rows
+from .utils.verb_csv import import_verbs_from_reader, iter_verb_rows
 
 
 class OptionInline(admin.TabularInline):
@@ -62,6 +62,9 @@ class TestAdmin(admin.ModelAdmin):
     inlines = [QuestionInline]
     ordering = ("stream", "level", "title")
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_question_stats()
+
 
 @admin.register(Question)
 class QuestionAdmin(admin.ModelAdmin):
@@ -83,14 +86,16 @@ class SubmissionAdmin(admin.ModelAdmin):
     list_display = (
         "test",
         "name",
-        "email",
+        "student",
         "score",
         "total_questions",
         "percent",
         "created_at",
     )
     list_filter = ("test__level", "created_at")
-    search_fields = ("name", "email")
+    search_fields = ("name", "student__email")
+    list_select_related = ("test", "student")
+    autocomplete_fields = ("student",)
     readonly_fields = ("score", "total_questions", "percent", "created_at")
     inlines = [AnswerInline]
 
@@ -111,9 +116,11 @@ class AnswerAdmin(admin.ModelAdmin):
 
 @admin.register(Assignment)
 class AssignmentAdmin(admin.ModelAdmin):
-    list_display = ("student_email", "test", "assigned_by", "created_at", "expires_at")
-    search_fields = ("student_email", "test__title", "test__slug")
+    list_display = ("student", "test", "assigned_by", "created_at", "expires_at")
+    search_fields = ("student__email", "test__title", "test__slug")
     list_filter = ("test__level", "test__is_restricted")
+    list_select_related = ("student", "test", "assigned_by")
+    autocomplete_fields = ("student",)
 
 
 @admin.register(StudentProfile)
@@ -138,8 +145,10 @@ class MaterialAdmin(admin.ModelAdmin):
         "level",
         "material_type",
         "is_published",
-        "assigned_to_email",
+        "assigned_to",
     )
+    list_select_related = ("assigned_to",)
+    autocomplete_fields = ("assigned_to",)
     search_fields = ("title", "tags")
     list_filter = ("stream", "level", "material_type", "is_published")
 
@@ -162,77 +171,148 @@ class ReadingAdminForm(forms.ModelForm):
         self.fields["translation_ru"].label = _("Translation ru")
 
 
-@admin.register(Reading)
-class ReadingAdmin(admin.ModelAdmin):
-    form = ReadingAdminForm
-    list_display = ("title", "stream", "level", "is_published", "updated_at")
-    search_fields = ("title", "tags", "body")
-    list_filter = ("stream", "level", "is_published")
-    prepopulated_fields = {"slug": ("title",)}
-    change_list_template = "admin/exams/reading/change_list.html"
+class VerbImportForm(forms.Form):
+    csv_file = forms.FileField(label=_("CSV file"))
+    update_existing = forms.BooleanField(
+        required=False, label=_("Update existing entries")
+    )
+    run_in_background = forms.BooleanField(
+        required=False, label=_("Run in background (for large files)")
+    )
+    dry_run = forms.BooleanField(
+        required=False, label=_("Preview changes only (dry run)")
+    )
+
+
+class CsvImportExportAdminMixin:
+    """CSV template export and import views for content admins.
+
+    Exports stream rows from ``csv_export_rows``; imports decode the upload
+    incrementally and hand the rows straight to ``csv_importer``. Either can
+    instead be queued as a ``CsvJob`` for ``manage.py run_jobs``.
+    """
+
+    csv_export_filename = ""
+    csv_export_bom = False
+    csv_export_rows = None
+    csv_importer = None
+    csv_import_title = ""
+    csv_import_template = "admin/exams/verbentry/import_csv.html"
+    # Dry-run report rows rendered; the totals always cover the whole file.
+    csv_report_limit = 500
 
     def get_urls(self):
         urls = super().get_urls()
+        info = self.model._meta.app_label, self.model._meta.model_name
         custom_urls = [
             path(
                 "export-csv/",
                 self.admin_site.admin_view(self.export_csv_view),
-                name="exams_reading_export_csv",
+                name="%s_%s_export_csv" % info,
             ),
             path(
                 "import-csv/",
                 self.admin_site.admin_view(self.import_csv_view),
-                name="exams_reading_import_csv",
+                name="%s_%s_import_csv" % info,
             ),
         ]
         return custom_urls + urls
 
     def export_csv_view(self, request):
-        queryset = self.get_queryset(request)
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = 'attachment; filename="readings-template.csv"'
-        export_readings_to_file(response, queryset)
-        return response
+        if request.GET.get("background"):
+            job = enqueue_export(content_key_for_model(self.model), user=request.user)
+            return self._job_queued(request, job)
+        return streaming_csv_response(
+            self.csv_export_filename,
+            self.csv_export_rows(self.get_queryset(request)),
+            bom=self.csv_export_bom,
+        )
 
     def import_csv_view(self, request):
+        report = None
         if request.method == "POST":
             form = VerbImportForm(request.POST, request.FILES)
+            dry_run = form.is_valid() and form.cleaned_data["dry_run"]
+            if (
+                form.is_valid()
+                and form.cleaned_data["run_in_background"]
+                and not dry_run
+            ):
+                job = enqueue_import(
+                    content_key_for_model(self.model),
+                    form.cleaned_data["csv_file"],
+                    update=form.cleaned_data["update_existing"],
+                    user=request.user,
+                )
+                return self._job_queued(request, job)
             if form.is_valid():
-                upload = form.cleaned_data["csv_file"]
                 try:
-                    decoded = upload.read().decode("utf-8")
+                    with read_upload(form.cleaned_data["csv_file"]) as reader:
+                        stats = self.csv_importer(
+                            reader,
+                            update=form.cleaned_data["update_existing"],
+                            dry_run=dry_run,
+                        )
                 except UnicodeDecodeError:
                     form.add_error("csv_file", _("File must be UTF-8 encoded."))
+                except ValueError as exc:
+                    form.add_error("csv_file", str(exc))
                 else:
-                    reader = csv.DictReader(io.StringIO(decoded))
-                    try:
-                        stats = import_readings_from_reader(
-                            reader, update=form.cleaned_data["update_existing"]
-                        )
-                    except ValueError as exc:
-                        form.add_error("csv_file", str(exc))
+                    if dry_run:
+                        report = stats
                     else:
                         messages.success(
                             request,
                             _(
-                                "Import finished. Created: %(created)d Updated: %(updated)d Skipped: %(skipped)d"
+                                "Import finished. Created: %(created)d Updated: %(updated)d Unchanged: %(unchanged)d Skipped: %(skipped)d (%(duration).1fs)"
                             )
                             % {
                                 "created": stats.created,
                                 "updated": stats.updated,
+                                "unchanged": stats.unchanged,
                                 "skipped": stats.skipped,
+                                "duration": stats.duration,
                             },
                         )
-                        return redirect("admin:exams_reading_changelist")
+                        return redirect(
+                            "admin:%s_%s_changelist"
+                            % (self.model._meta.app_label, self.model._meta.model_name)
+                        )
         else:
             form = VerbImportForm()
         context = {
             **self.admin_site.each_context(request),
             "opts": self.model._meta,
             "form": form,
-            "title": _("Import readings from CSV"),
+            "title": self.csv_import_title,
+            "report": report,
+            "report_changes": report.changes[: self.csv_report_limit] if report else [],
+            "report_limit": self.csv_report_limit,
         }
-        return TemplateResponse(request, "admin/exams/reading/import_csv.html", context)
+        return TemplateResponse(request, self.csv_import_template, context)
+
+    def _job_queued(self, request, job):
+        messages.info(
+            request,
+            _("%(job)s queued as job #%(id)d.") % {"job": job, "id": job.pk},
+        )
+        return redirect("admin:exams_csvjob_change", job.pk)
+
+
+@admin.register(Reading)
+class ReadingAdmin(CsvImportExportAdminMixin, admin.ModelAdmin):
+    form = ReadingAdminForm
+    list_display = ("title", "stream", "level", "is_published", "updated_at")
+    search_fields = ("title", "tags", "body")
+    list_filter = ("stream", "level", "is_published")
+    prepopulated_fields = {"slug": ("title",)}
+    change_list_template = "admin/exams/reading/change_list.html"
+
+    csv_export_filename = "readings-template.csv"
+    csv_export_rows = staticmethod(iter_reading_rows)
+    csv_importer = staticmethod(import_readings_from_reader)
+    csv_import_title = _("Import readings from CSV")
+    csv_import_template = "admin/exams/reading/import_csv.html"
 
 
 @admin.register(Homework)
@@ -243,8 +323,10 @@ class HomeworkAdmin(admin.ModelAdmin):
         "level",
         "status",
         "due_date",
-        "assigned_to_email",
+        "assigned_to",
     )
+    list_select_related = ("assigned_to",)
+    autocomplete_fields = ("assigned_to",)
     search_fields = ("title", "instructions")
     list_filter = ("stream", "level", "status")
 
@@ -257,169 +339,43 @@ class ExerciseAdmin(admin.ModelAdmin):
         "level",
         "kind",
         "estimated_minutes",
-        "assigned_to_email",
+        "assigned_to",
     )
+    list_select_related = ("assigned_to",)
+    autocomplete_fields = ("assigned_to",)
     search_fields = ("title", "prompt", "tags")
     list_filter = ("stream", "level", "kind")
 
 
-class VerbImportForm(forms.Form):
-    csv_file = forms.FileField(label=_("CSV file"))
-    update_existing = forms.BooleanField(
-        required=False, label=_("Update existing entries")
-    )
-
-
 @admin.register(VerbEntry)
-class VerbEntryAdmin(admin.ModelAdmin):
+class VerbEntryAdmin(CsvImportExportAdminMixin, admin.ModelAdmin):
     list_display = ("verb", "stream", "infinitive", "present", "past", "perfect")
     search_fields = ("verb", "infinitive", "tags")
     list_filter = ("stream",)
     change_list_template = "admin/exams/verbentry/change_list.html"
 
-    def get_urls(self):
-        urls = super().get_urls()
-        custom_urls = [
-            path(
-                "export-csv/",
-                self.admin_site.admin_view(self.export_csv_view),
-                name="exams_verbentry_export_csv",
-            ),
-            path(
-                "import-csv/",
-                self.admin_site.admin_view(self.import_csv_view),
-                name="exams_verbentry_import_csv",
-            ),
-        ]
-        return custom_urls + urls
-
-    def export_csv_view(self, request):
-        queryset = self.get_queryset(request)
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = 'attachment; filename="verbs-template.csv"'
-        export_verbs_to_file(response, queryset)
-        return response
-
-    def import_csv_view(self, request):
-        if request.method == "POST":
-            form = VerbImportForm(request.POST, request.FILES)
-            if form.is_valid():
-                upload = form.cleaned_data["csv_file"]
-                try:
-                    decoded = upload.read().decode("utf-8")
-                except UnicodeDecodeError:
-                    form.add_error("csv_file", _("File must be UTF-8 encoded."))
-                else:
-                    reader = csv.DictReader(io.StringIO(decoded))
-                    try:
-                        stats = import_verbs_from_reader(
-                            reader, update=form.cleaned_data["update_existing"]
-                        )
-                    except ValueError as exc:
-                        form.add_error("csv_file", str(exc))
-                    else:
-                        messages.success(
-                            request,
-                            _(
-                                "Import finished. Created: %(created)d Updated: %(updated)d Skipped: %(skipped)d"
-                            )
-                            % {
-                                "created": stats.created,
-                                "updated": stats.updated,
-                                "skipped": stats.skipped,
-                            },
-                        )
-                        return redirect("admin:exams_verbentry_changelist")
-        else:
-            form = VerbImportForm()
-        context = {
-            **self.admin_site.each_context(request),
-            "opts": self.model._meta,
-            "form": form,
-            "title": _("Import verbs from CSV"),
-        }
-        return TemplateResponse(
-            request, "admin/exams/verbentry/import_csv.html", context
-        )
+    csv_export_filename = "verbs-template.csv"
+    csv_export_bom = True
+    csv_export_rows = staticmethod(iter_verb_rows)
+    csv_importer = staticmethod(import_verbs_from_reader)
+    csv_import_title = _("Import verbs from CSV")
 
 
 @admin.register(Expression)
-class ExpressionAdmin(admin.ModelAdmin):
+class ExpressionAdmin(CsvImportExportAdminMixin, admin.ModelAdmin):
     list_display = ("phrase", "stream")
     search_fields = ("phrase", "meaning", "tags")
     list_filter = ("stream",)
     change_list_template = "admin/exams/expression/change_list.html"
 
-    def get_urls(self):
-        urls = super().get_urls()
-        custom_urls = [
-            path(
-                "export-csv/",
-                self.admin_site.admin_view(self.export_csv_view),
-                name="exams_expression_export_csv",
-            ),
-            path(
-                "import-csv/",
-                self.admin_site.admin_view(self.import_csv_view),
-                name="exams_expression_import_csv",
-            ),
-        ]
-        return custom_urls + urls
-
-    def export_csv_view(self, request):
-        queryset = self.get_queryset(request)
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = (
-            'attachment; filename="expressions-template.csv"'
-        )
-        export_expressions_to_file(response, queryset)
-        return response
-
-    def import_csv_view(self, request):
-        if request.method == "POST":
-            form = VerbImportForm(request.POST, request.FILES)
-            if form.is_valid():
-                upload = form.cleaned_data["csv_file"]
-                try:
-                    decoded = upload.read().decode("utf-8")
-                except UnicodeDecodeError:
-                    form.add_error("csv_file", _("File must be UTF-8 encoded."))
-                else:
-                    reader = csv.DictReader(io.StringIO(decoded))
-                    try:
-                        stats = import_expressions_from_reader(
-                            reader, update=form.cleaned_data["update_existing"]
-                        )
-                    except ValueError as exc:
-                        form.add_error("csv_file", str(exc))
-                    else:
-                        messages.success(
-                            request,
-                            _(
-                                "Import finished. Created: %(created)d Updated: %(updated)d Skipped: %(skipped)d"
-                            )
-                            % {
-                                "created": stats.created,
-                                "updated": stats.updated,
-                                "skipped": stats.skipped,
-                            },
-                        )
-                        return redirect("admin:exams_expression_changelist")
-        else:
-            form = VerbImportForm()
-        context = {
-            **self.admin_site.each_context(request),
-            "opts": self.model._meta,
-            "form": form,
-            "title": _("Import expressions from CSV"),
-        }
-        return TemplateResponse(
-            request, "admin/exams/verbentry/import_csv.html", context
-        )
+    csv_export_filename = "expressions-template.csv"
+    csv_export_rows = staticmethod(iter_expression_rows)
+    csv_importer = staticmethod(import_expressions_from_reader)
+    csv_import_title = _("Import expressions from CSV")
 
 
 @admin.register(GlossaryTerm)
-class GlossaryTermAdmin(admin.ModelAdmin):
+class GlossaryTermAdmin(CsvImportExportAdminMixin, admin.ModelAdmin):
     list_display = (
         "term",
         "translation_en",
@@ -441,71 +397,102 @@ class GlossaryTermAdmin(admin.ModelAdmin):
     list_filter = ("stream", "level")
     change_list_template = "admin/exams/glossaryterm/change_list.html"
 
+    csv_export_filename = "glossary-template.csv"
+    csv_export_rows = staticmethod(iter_glossary_rows)
+    csv_importer = staticmethod(import_glossary_from_reader)
+    csv_import_title = _("Import glossary from CSV")
+
+    @admin.display(description=_("Tags"))
+    def display_tags(self, obj):
+        return ", ".join(obj.tags or [])
+
+
+@admin.register(CsvJob)
+class CsvJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "kind",
+        "content",
+        "status",
+        "processed",
+        "created",
+        "updated",
+        "unchanged",
+        "skipped",
+        "created_by",
+        "created_at",
+        "finished_at",
+    )
+    list_filter = ("kind", "content", "status")
+    readonly_fields = [field.name for field in CsvJob._meta.fields] + ["download_link"]
+    change_form_template = "admin/exams/csvjob/change_form.html"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
     def get_urls(self):
-        urls = super().get_urls()
         custom_urls = [
             path(
-                "export-csv/",
-                self.admin_site.admin_view(self.export_csv_view),
-                name="exams_glossaryterm_export_csv",
+                "<int:pk>/status/",
+                self.admin_site.admin_view(self.status_view),
+                name="exams_csvjob_status",
             ),
             path(
-                "import-csv/",
-                self.admin_site.admin_view(self.import_csv_view),
-                name="exams_glossaryterm_import_csv",
+                "<int:pk>/download/",
+                self.admin_site.admin_view(self.download_view),
+                name="exams_csvjob_download",
             ),
         ]
-        return custom_urls + urls
-
-    def export_csv_view(self, request):
-        queryset = self.get_queryset(request)
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = 'attachment; filename="glossary-template.csv"'
-        export_glossary_to_file(response, queryset)
-        return response
+        return custom_urls + super().get_urls()
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if request.user.is_superuser:
+            return queryset
+        # Uploaded files and exports may contain data only their author saw.
+        return queryset.filter(created_by=request.user)
+
+    def get_job(self, request, pk) -> CsvJob:
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        return get_object_or_404(self.get_queryset(request), pk=pk)
+
+    def status_view(self, request, pk):
+        job = self.get_job(request, pk)
+        return JsonResponse(
+            {
+                "id": job.pk,
+                "status": job.status,
+                "processed": job.processed,
+                "created": job.created,
+                "updated": job.updated,
+                "unchanged": job.unchanged,
+                "skipped": job.skipped,
+                "errors": job.errors,
+                "message": job.message,
+            }
+        )
 
-    def import_csv_view(self, request):
-        if request.method == "POST":
-            form = VerbImportForm(request.POST, request.FILES)
-            if form.is_valid():
-                upload = form.cleaned_data["csv_file"]
-                try:
-                    decoded = upload.read().decode("utf-8")
-                except UnicodeDecodeError:
-                    form.add_error("csv_file", _("File must be UTF-8 encoded."))
-                else:
-                    reader = csv.DictReader(io.StringIO(decoded))
-                    try:
-                        stats = import_glossary_from_reader(
-                            reader, update=form.cleaned_data["update_existing"]
-                        )
-                    except ValueError as exc:
-                        form.add_error("csv_file", str(exc))
-                    else:
-                        messages.success(
-                            request,
-                            _(
-                                "Import finished. Created: %(created)d Updated: %(updated)d Skipped: %(skipped)d"
-                            )
-                            % {
-                                "created": stats.created,
-                                "updated": stats.updated,
-                                "skipped": stats.skipped,
-                            },
-                        )
-                        return redirect("admin:exams_glossaryterm_changelist")
-        else:
-            form = VerbImportForm()
-        context = {
-            **self.admin_site.each_context(request),
-            "opts": self.model._meta,
-            "form": form,
-            "title": _("Import glossary from CSV"),
-        }
-        return TemplateResponse(
-            request, "admin/exams/verbentry/import_csv.html", context
+    def download_view(self, request, pk):
+        job = self.get_job(request, pk)
+        if not job.result:
+            raise Http404
+        return FileResponse(
+            job.result.open("rb"),
+            as_attachment=True,
+            filename=job.result.name.rsplit("/", 1)[-1],
+            content_type="text/csv",
         )
 
-    @admin.display(description=_("Tags"))
-    def display_tags(self, obj):
-        return ", ".join(obj.tags or [])
+    @admin.display(description=_("Result"))
+    def download_link(self, obj):
+        if not obj.result:
+            return "-"
+        return format_html(
+            '<a href="{}">{}</a>',
+            reverse("admin:exams_csvjob_download", args=[obj.pk]),
+            _("Download CSV"),
+        )
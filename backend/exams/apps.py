@@ -5,3 +5,11 @@ class ExamsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'exams'
     verbose_name = "Language Exams"
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+
+        from . import signals  # noqa: F401
+        from .search import sync_search_index
+
+        post_migrate.connect(sync_search_index, sender=self)
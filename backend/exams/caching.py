@@ -0,0 +1,139 @@
+"""Shared content versions and the serialized-response cache.
+
+Every content model has a version counter in the ``CONTENT_CACHE_ALIAS`` cache
+that change signals bump. Cached data embeds the versions it was built from,
+so invalidation is a single ``incr`` and stale entries simply stop being read
+(and age out through ``RESPONSE_CACHE_TIMEOUT``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Dict, Iterable, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+VERSION_KEY_PREFIX = "exams:content-version"
+RESPONSE_KEY_PREFIX = "exams:response"
+STATS_KEY_PREFIX = "exams:response-stats"
+
+# Query parameters normalized the same way the viewsets read them.
+_PARAM_NORMALIZERS = {
+    "stream": str.lower,
+    "level": str.upper,
+    "student_email": str.lower,
+}
+
+
+def content_cache():
+    return caches[getattr(settings, "CONTENT_CACHE_ALIAS", "default")]
+
+
+def _version_key(model) -> str:
+    return f"{VERSION_KEY_PREFIX}:{model._meta.label_lower}"
+
+
+def content_versions(*models) -> Tuple[int, ...]:
+    cache = content_cache()
+    keys = [_version_key(model) for model in models]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            # Seed with a timestamp rather than 0 so an evicted counter can never
+            # come back at a value older entries were stored under.
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+    return tuple(found[key] for key in keys)
+
+
+def bump_content_version(*models) -> None:
+    cache = content_cache()
+    for model in models:
+        key = _version_key(model)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+
+
+def normalize_params(params) -> str:
+    items = []
+    for name in sorted(params.keys()):
+        normalize = _PARAM_NORMALIZERS.get(name, lambda value: value)
+        values = sorted(
+            normalize(value.strip())
+            for value in params.getlist(name)
+            if value and value.strip()
+        )
+        if values:
+            items.append(f"{name}={','.join(values)}")
+    return "&".join(items)
+
+
+def _record(basename: str, outcome: str) -> None:
+    cache = content_cache()
+    key = f"{STATS_KEY_PREFIX}:{basename}:{outcome}"
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+def response_cache_stats(basenames: Iterable[str]) -> Dict[str, Dict[str, int]]:
+    cache = content_cache()
+    stats = {}
+    for basename in basenames:
+        hits = cache.get(f"{STATS_KEY_PREFIX}:{basename}:hit", 0)
+        misses = cache.get(f"{STATS_KEY_PREFIX}:{basename}:miss", 0)
+        stats[basename] = {"hits": hits, "misses": misses}
+    return stats
+
+
+class CachedListMixin:
+    """Cache serialized ``list`` payloads keyed by viewset, action and filters.
+
+    ``cache_dependencies`` lists the models whose changes invalidate the cached
+    payloads. Combined with ``ConditionalGetMixin`` (listed before this mixin),
+    the key also includes the validator stamp, so a payload cached from older
+    rows is never sent under a newer ETag even if a version bump is lost.
+    """
+
+    cache_dependencies: Tuple = ()
+
+    def get_response_cache_key(self, request) -> str:
+        versions = content_versions(*self.cache_dependencies)
+        raw = (
+            f"{request.get_host()}?{normalize_params(request.query_params)}"
+            f"#{getattr(self, 'validator_stamp', '')}"
+            f"#{self.get_cache_variant(request)}"
+        )
+        digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+        version = "-".join(str(value) for value in versions)
+        return f"{RESPONSE_KEY_PREFIX}:{self.basename}:{self.action}:{version}:{digest}"
+
+    def get_cache_variant(self, request) -> str:
+        """Request-specific state the payload depends on besides the filters
+        and content versions (e.g. data that changes as time passes)."""
+        return ""
+
+    def list(self, request, *args, **kwargs):
+        cache = content_cache()
+        key = self.get_response_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            _record(self.basename, "hit")
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+        _record(self.basename, "miss")
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(
+                key, response.data, getattr(settings, "RESPONSE_CACHE_TIMEOUT", 600)
+            )
+        response["X-Cache"] = "MISS"
+        return response
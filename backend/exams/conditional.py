@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Optional, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetMixin:
+    """ETag / Last-Modified validators for ``list`` and ``retrieve``.
+
+    The validator is computed with one cheap query (``MAX(updated_at)`` and
+    ``COUNT(*)`` over the filtered queryset, or the object's ``updated_at``), so a
+    revalidation that ends in ``304 Not Modified`` never loads or serializes rows.
+    """
+
+    last_modified_field = "updated_at"
+
+    def get_validator_queryset(self):
+        """Queryset the validators are computed from; override to drop
+        annotations or prefetches that do not affect freshness."""
+        return self.filter_queryset(self.get_queryset())
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.get_validator_queryset()
+        stats = queryset.order_by().aggregate(
+            last_modified=models.Max(self.last_modified_field),
+            count=models.Count("pk"),
+        )
+        # Cached list payloads are keyed by the same stamp (see
+        # exams.caching.CachedListMixin), so a body is only ever served under
+        # the validators of the rows it was built from.
+        self.validator_stamp = self._stamp(stats["last_modified"], stats["count"])
+        validators = self._validators(request, stats["last_modified"], stats["count"])
+        return self._conditional(request, validators) or self._with_validators(
+            super().list(request, *args, **kwargs), validators
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            last_modified = (
+                self.get_validator_queryset()
+                .filter(**{self.lookup_field: kwargs.get(lookup_url_kwarg)})
+                .order_by()
+                .values_list(self.last_modified_field, flat=True)
+                .first()
+            )
+        except (TypeError, ValueError, ValidationError):
+            # Malformed lookup value (e.g. a non-numeric pk).
+            last_modified = None
+        if last_modified is None:
+            # Missing object: let the regular retrieve produce the 404.
+            return super().retrieve(request, *args, **kwargs)
+        validators = self._validators(request, last_modified, 1)
+        return self._conditional(request, validators) or self._with_validators(
+            super().retrieve(request, *args, **kwargs), validators
+        )
+
+    @staticmethod
+    def _stamp(last_modified, count) -> str:
+        return f"{count}|{last_modified.isoformat() if last_modified else ''}"
+
+    def _validators(self, request, last_modified, count) -> Tuple[str, Optional[int]]:
+        # The full path (including query parameters such as ``fields`` or
+        # ``cursor``) is part of the tag because it selects the representation.
+        raw = f"{request.get_full_path()}|{self._stamp(last_modified, count)}"
+        etag = quote_etag(hashlib.sha1(raw.encode("utf-8")).hexdigest())
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        return etag, timestamp
+
+    def _conditional(self, request, validators):
+        etag, last_modified = validators
+        if request.method not in ("GET", "HEAD"):
+            return None
+        response = get_conditional_response(
+            request._request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            response = self._with_validators(response, validators)
+        return response
+
+    def _with_validators(self, response, validators):
+        etag, last_modified = validators
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+            # Clients may store the response but must revalidate before reuse.
+            patch_cache_control(response, no_cache=True)
+        return response
@@ -0,0 +1,370 @@
+"""Content snapshots as gzip-compressed NDJSON, keyed by natural keys.
+
+``dump_content`` writes one JSON object per line: a header, then the records of
+each content type. Tests carry their questions and options inline because
+those have no natural key of their own. ``load_content`` streams the file back
+through the batched CSV importer (``exams.utils.csv_import``) and matches
+questions and options by their ``order`` within the test (or question), so
+existing rows keep their ids and the answers pointing at them. Questions and
+options that already have answers are never deleted; the load is refused.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import gzip
+import json
+from collections import Counter
+from itertools import groupby, islice
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from django.db import models, transaction
+from django.utils import timezone
+
+from .caching import bump_content_version
+from .models import Answer, Option, Question, Test
+from .utils.csv_import import IMPORT_BATCH_SIZE, ImportSpec, ImportStats, run_import
+from .utils.expression_csv import EXPRESSION_SPEC
+from .utils.glossary_csv import GLOSSARY_SPEC
+from .utils.reading_csv import READING_SPEC
+from .utils.verb_csv import VERB_SPEC
+
+FORMAT = "norskkurs-content"
+VERSION = 1
+DUMP_CHUNK_SIZE = 1000
+TEST_BATCH_SIZE = 100
+
+# Content types in dump order; "tests" includes questions and options.
+FLAT_SPECS = {
+    "readings": READING_SPEC,
+    "glossary": GLOSSARY_SPEC,
+    "verbs": VERB_SPEC,
+    "expressions": EXPRESSION_SPEC,
+}
+CONTENT_TYPES = ("tests", *FLAT_SPECS)
+
+
+def dump_fields(model) -> List[str]:
+    """Editable stored fields; ids, timestamps and derived columns are rebuilt."""
+    return [
+        field.name
+        for field in model._meta.concrete_fields
+        if field.editable
+        and not field.primary_key
+        and not field.is_relation
+        and not isinstance(field, models.GeneratedField)
+        and not getattr(field, "auto_now", False)
+        and not getattr(field, "auto_now_add", False)
+    ]
+
+
+def _as_is(value):
+    return value
+
+
+def load_spec(content: str) -> ImportSpec:
+    """The CSV spec of ``content`` with every stored field taken verbatim."""
+    spec = FLAT_SPECS[content]
+    return dataclasses.replace(
+        spec,
+        fields={name: _as_is for name in dump_fields(spec.model)},
+        hooks=(),
+        required_columns=(),
+    )
+
+
+# Dump -----------------------------------------------------------------------
+
+
+def iter_records(content_types: Sequence[str] = CONTENT_TYPES) -> Iterator[dict]:
+    yield {"format": FORMAT, "version": VERSION}
+    for content in content_types:
+        if content == "tests":
+            yield from _iter_test_records()
+            continue
+        model = FLAT_SPECS[content].model
+        names = dump_fields(model)
+        rows = (
+            model.objects.order_by("pk")
+            .values(*names)
+            .iterator(chunk_size=DUMP_CHUNK_SIZE)
+        )
+        for fields in rows:
+            yield {"model": content, "fields": fields}
+
+
+def _iter_test_records() -> Iterator[dict]:
+    test_fields = dump_fields(Test)
+    question_fields = dump_fields(Question)
+    option_fields = dump_fields(Option)
+    tests = Test.objects.order_by("pk").prefetch_related("questions__options")
+    for test in tests.iterator(chunk_size=TEST_BATCH_SIZE):
+        yield {
+            "model": "tests",
+            "fields": _values(test, test_fields),
+            "questions": [
+                {
+                    **_values(question, question_fields),
+                    "options": [
+                        _values(option, option_fields)
+                        for option in question.options.all()
+                    ],
+                }
+                for question in test.questions.all()
+            ],
+        }
+
+
+def _values(instance, names) -> Dict[str, Any]:
+    return {name: getattr(instance, name) for name in names}
+
+
+def write_dump(file_obj: IO[bytes], content_types: Sequence[str] = CONTENT_TYPES):
+    """Write a gzip NDJSON dump; returns record counts per content type."""
+    counts = dict.fromkeys(content_types, 0)
+    with gzip.open(file_obj, "wt", encoding="utf-8") as stream:
+        for record in iter_records(content_types):
+            stream.write(json.dumps(record, ensure_ascii=False, default=str))
+            stream.write("\n")
+            if "model" in record:
+                counts[record["model"]] += 1
+    return counts
+
+
+# Load -----------------------------------------------------------------------
+
+
+def read_records(file_obj: IO[bytes]) -> Iterator[dict]:
+    with gzip.open(file_obj, "rt", encoding="utf-8") as stream:
+        lines = (line for line in stream if line.strip())
+        header = json.loads(next(lines, "{}"))
+        if header.get("format") != FORMAT or header.get("version") != VERSION:
+            raise ValueError("Not a content dump (or an unsupported version).")
+        for line in lines:
+            yield json.loads(line)
+
+
+def load_dump(
+    file_obj: IO[bytes],
+    content_types: Optional[Sequence[str]] = None,
+    *,
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> Dict[str, ImportStats]:
+    """Upsert every record of the dump in one transaction.
+
+    Records are matched on natural keys; nothing missing from the dump is
+    deleted, except surplus questions/options (without answers) of a test that
+    is in the dump.
+    """
+    results: Dict[str, ImportStats] = {}
+    # Records of one type normally form a single run; hand-edited files may
+    # split them, so the stats of every run are added up rather than sorting
+    # (and buffering) the whole file.
+    with transaction.atomic():
+        for content, records in groupby(read_records(file_obj), key=_model_of):
+            if content not in CONTENT_TYPES:
+                raise ValueError(f"Unknown content type '{content}'.")
+            if content_types is not None and content not in content_types:
+                for _ in records:
+                    pass
+                continue
+            if content == "tests":
+                stats = load_tests(records)
+            else:
+                stats = run_import(
+                    load_spec(content),
+                    (record["fields"] for record in records),
+                    update=True,
+                    batch_size=batch_size,
+                )
+            if content in results:
+                _add_stats(results[content], stats)
+            else:
+                results[content] = stats
+    return results
+
+
+def _add_stats(total: ImportStats, stats: ImportStats) -> None:
+    total.created += stats.created
+    total.updated += stats.updated
+    total.unchanged += stats.unchanged
+    total.skipped += stats.skipped
+    total.duration += stats.duration
+    total.errors.extend(stats.errors)
+    total.changes.extend(stats.changes)
+
+
+def _model_of(record: dict) -> str:
+    return record.get("model", "")
+
+
+def load_tests(records: Iterable[dict], *, update: bool = True) -> ImportStats:
+    """Upsert tests by slug and sync their questions/options by ``order``.
+
+    With ``update=False`` existing tests that differ are counted as skipped and
+    left alone. Raises ``ValueError`` when the sync would delete a question or
+    option that has answers.
+    """
+    stats = ImportStats()
+    records = iter(records)
+    while True:
+        batch = list(islice(records, TEST_BATCH_SIZE))
+        if not batch:
+            break
+        _load_test_batch(batch, stats, update)
+    if stats.created or stats.updated:
+        # Bulk writes skip the signals; bump once the rows are committed.
+        transaction.on_commit(lambda: bump_content_version(Test, Question, Option))
+    return stats
+
+
+def _load_test_batch(batch: List[dict], stats: ImportStats, update: bool) -> None:
+    test_fields = dump_fields(Test)
+    existing = {
+        test.slug: test
+        for test in Test.objects.filter(
+            slug__in=[record["fields"]["slug"] for record in batch]
+        ).prefetch_related("questions__options")
+    }
+    now = timezone.now()
+    new_tests, changed_tests = [], []
+    for record in batch:
+        test = existing.get(record["fields"]["slug"])
+        if test is None:
+            new_tests.append(Test(**record["fields"]))
+        elif not (
+            _assign(test, record["fields"], test_fields)
+            or _questions_changed(test, record["questions"])
+        ):
+            stats.unchanged += 1
+        elif not update:
+            stats.skipped += 1
+        else:
+            # ``updated_at`` versions the cached answer keys and ETags.
+            test.updated_at = now
+            changed_tests.append(test)
+    Test.objects.bulk_create(new_tests)
+    if changed_tests:
+        Test.objects.bulk_update(changed_tests, [*test_fields, "updated_at"])
+    stats.created += len(new_tests)
+    stats.updated += len(changed_tests)
+
+    # Postgres and SQLite return the ids of bulk-inserted rows.
+    by_slug = {test.slug: test for test in (*new_tests, *changed_tests)}
+    questions = [
+        (by_slug[record["fields"]["slug"]], record["questions"])
+        for record in batch
+        if record["fields"]["slug"] in by_slug
+    ]
+    changed = set(map(id, changed_tests))
+    _sync_children(
+        Question,
+        "test",
+        [
+            (test, list(test.questions.all()) if id(test) in changed else [], data)
+            for test, data in questions
+        ],
+        child_key="options",
+    )
+
+
+def _match(current: List, rows: List[dict]):
+    """Pair ``rows`` with the ``current`` instances that have the same
+    ``order``; rows sharing an order are paired in sequence. Returns the
+    ``(instance or None, row)`` pairs and the unmatched instances."""
+    by_key = {}
+    seen: Counter = Counter()
+    for instance in current:
+        by_key[(instance.order, seen[instance.order])] = instance
+        seen[instance.order] += 1
+    pairs = []
+    seen = Counter()
+    for data in rows:
+        pairs.append((by_key.pop((data["order"], seen[data["order"]]), None), data))
+        seen[data["order"]] += 1
+    return pairs, list(by_key.values())
+
+
+def _sync_children(model, parent_field, groups, child_key=None) -> None:
+    """Match ``(parent, existing, data)`` rows by ``order``: update in place,
+    create extras and delete surplus rows; recurse into ``child_key``."""
+    names = dump_fields(model)
+    to_create, to_update, to_delete, nested = [], [], [], []
+    for parent, current, rows in groups:
+        pairs, surplus = _match(current, rows)
+        for instance, data in pairs:
+            fields = {name: data[name] for name in names}
+            if instance is None:
+                instance = model(**{parent_field: parent}, **fields)
+                to_create.append(instance)
+            elif _assign(instance, fields, names):
+                to_update.append(instance)
+            if child_key:
+                nested.append((instance, data[child_key]))
+        to_delete.extend(instance.pk for instance in surplus)
+
+    if to_delete:
+        _check_unanswered(model, to_delete)
+        model.objects.filter(pk__in=to_delete).delete()
+    model.objects.bulk_create(to_create)
+    if to_update:
+        model.objects.bulk_update(to_update, names)
+    if child_key:
+        created = set(map(id, to_create))
+        _sync_children(
+            Option,
+            "question",
+            [
+                (
+                    question,
+                    [] if id(question) in created else list(question.options.all()),
+                    data,
+                )
+                for question, data in nested
+            ],
+        )
+
+
+def _check_unanswered(model, pks: List[int]) -> None:
+    """Refuse to delete questions/options that submissions point at; deleting
+    them would destroy (or blank out) student answer history."""
+    lookup = "question" if model is Question else "selected_option"
+    answered = Answer.objects.filter(**{f"{lookup}__in": pks})
+    if answered.exists():
+        label = model._meta.verbose_name_plural
+        raise ValueError(
+            f"The dump removes {label} that have answers "
+            f"({answered.values(lookup).distinct().count()}); "
+            "keep them in the dump or delete them in the admin first."
+        )
+
+
+def _assign(instance, fields: Dict[str, Any], names: Sequence[str]) -> bool:
+    changed = False
+    for name in names:
+        if getattr(instance, name) != fields[name]:
+            setattr(instance, name, fields[name])
+            changed = True
+    return changed
+
+
+def _questions_changed(test: Test, questions: List[dict]) -> bool:
+    question_fields = dump_fields(Question)
+    option_fields = dump_fields(Option)
+    pairs, surplus = _match(list(test.questions.all()), questions)
+    if surplus:
+        return True
+    for question, data in pairs:
+        if question is None or any(
+            getattr(question, name) != data[name] for name in question_fields
+        ):
+            return True
+        options, extra = _match(list(question.options.all()), data["options"])
+        if extra:
+            return True
+        for option, option_data in options:
+            if option is None or any(
+                getattr(option, name) != option_data[name] for name in option_fields
+            ):
+                return True
+    return False
@@ -1,6 +1,16 @@
 from __future__ import annotations
 
-from typing import Dict, List
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Bump when ``build_verbs`` output changes without the blueprint data changing,
+# so stale on-disk artifacts are not reused.
+ARTIFACT_FORMAT = 1
 
 
 INTRO_STYLES: Dict[str, Dict[str, str]] = {
@@ -1909,4 +1919,72 @@ def build_verbs() -> Dict[str, List[Dict]]:
     return by_stream
 
 
-VERBS_BY_STREAM = build_verbs()
+def blueprint_digest() -> str:
+    """Hash of everything ``build_verbs`` reads; names the on-disk artifact."""
+    data = [ARTIFACT_FORMAT, INTRO_STYLES, SUBJECTS, CONTEXT_TEMPLATES, VERB_BLUEPRINTS]
+    raw = json.dumps(data, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def artifact_path(directory) -> Path:
+    return Path(directory) / f"verb-library-{blueprint_digest()}.json"
+
+
+def load_artifact(directory) -> Optional[Dict[str, List[Dict]]]:
+    try:
+        with artifact_path(directory).open(encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def write_artifact(directory, verbs: Dict[str, List[Dict]]) -> Path:
+    path = artifact_path(directory)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a temporary file first so concurrent readers never see half a file.
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        json.dump(verbs, handle, ensure_ascii=False)
+    os.replace(tmp_name, path)
+    return path
+
+
+def _artifact_dir() -> Optional[str]:
+    from django.conf import settings
+
+    return getattr(settings, "VERB_LIBRARY_CACHE_DIR", None) or None
+
+
+_lock = threading.Lock()
+_verbs_by_stream: Optional[Dict[str, List[Dict]]] = None
+
+
+def get_verbs_by_stream() -> Dict[str, List[Dict]]:
+    """The generated verb library, built on first use and memoized per process.
+
+    With ``VERB_LIBRARY_CACHE_DIR`` set, the result is also stored there as
+    JSON named after ``blueprint_digest()``, so other processes load it instead
+    of generating the examples again. Callers must not mutate the payloads.
+    """
+    global _verbs_by_stream
+    if _verbs_by_stream is None:
+        with _lock:
+            if _verbs_by_stream is None:
+                directory = _artifact_dir()
+                verbs = load_artifact(directory) if directory else None
+                if verbs is None:
+                    verbs = build_verbs()
+                    if directory:
+                        try:
+                            write_artifact(directory, verbs)
+                        except OSError:
+                            pass  # the artifact is only an optimisation
+                _verbs_by_stream = verbs
+    return _verbs_by_stream
+
+
+def __getattr__(name: str):
+    # ``VERBS_BY_STREAM`` used to be built at import time.
+    if name == "VERBS_BY_STREAM":
+        return get_verbs_by_stream()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
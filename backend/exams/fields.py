@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from django.db import models
+
+
+def normalize_email(value: Optional[str]) -> str:
+    return (value or "").strip().lower()
+
+
+class LowercaseEmailField(models.EmailField):
+    """Email stored trimmed and lower-cased.
+
+    Values are normalized on every write (``save``, ``bulk_create``,
+    ``update``) and in lookups, so per-student filters are exact matches on
+    the plain column index instead of ``iexact`` scans.
+    """
+
+    def get_prep_value(self, value):
+        value = super().get_prep_value(value)
+        if isinstance(value, str):
+            return normalize_email(value)
+        return value
+
+    def pre_save(self, model_instance, add):
+        value = self.get_prep_value(getattr(model_instance, self.attname))
+        setattr(model_instance, self.attname, value)
+        return value
@@ -0,0 +1,24 @@
+"""Model indexes that only exist on some database backends."""
+
+from __future__ import annotations
+
+from django.contrib.postgres.indexes import GinIndex
+
+
+class PostgresGinIndex(GinIndex):
+    """``GinIndex`` that is a no-op outside PostgreSQL.
+
+    Declaring the index on the model keeps it in the migration state (so
+    ``makemigrations`` and later field changes know about it), while SQLite,
+    which has no GIN indexes or tsvectors, simply skips it.
+    """
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if schema_editor.connection.vendor != "postgresql":
+            return ""
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
+
+    def remove_sql(self, model, schema_editor, **kwargs):
+        if schema_editor.connection.vendor != "postgresql":
+            return ""
+        return super().remove_sql(model, schema_editor, **kwargs)
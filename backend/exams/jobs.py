@@ -0,0 +1,172 @@
+"""Database-backed queue for long-running CSV imports and exports.
+
+The admin enqueues ``CsvJob`` rows; ``manage.py run_jobs`` claims them one at
+a time and records progress on the row as batches commit, so the admin can
+poll the status without a broker.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import tempfile
+import traceback
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from django.core.files import File
+from django.utils import timezone
+
+from .models import CsvJob
+from .utils.csv_export import BOM, iter_csv_lines
+from .utils.csv_import import ImportSpec, ImportStats, run_import
+from .utils.expression_csv import EXPRESSION_SPEC, iter_expression_rows
+from .utils.glossary_csv import GLOSSARY_SPEC, iter_glossary_rows
+from .utils.reading_csv import READING_SPEC, iter_reading_rows
+from .utils.verb_csv import VERB_SPEC, iter_verb_rows
+
+# Export progress is written every this many rows.
+EXPORT_PROGRESS_EVERY = 1000
+# Per-row errors kept on the job; the rest are only counted as skipped.
+MAX_RECORDED_ERRORS = 200
+
+
+@dataclass(frozen=True)
+class CsvContent:
+    spec: ImportSpec
+    rows: Callable
+    filename: str
+    bom: bool = False
+
+    @property
+    def model(self):
+        return self.spec.model
+
+
+CSV_CONTENT: Dict[str, CsvContent] = {
+    "verbs": CsvContent(VERB_SPEC, iter_verb_rows, "verbs-template.csv", bom=True),
+    "expressions": CsvContent(
+        EXPRESSION_SPEC, iter_expression_rows, "expressions-template.csv"
+    ),
+    "glossary": CsvContent(GLOSSARY_SPEC, iter_glossary_rows, "glossary-template.csv"),
+    "readings": CsvContent(READING_SPEC, iter_reading_rows, "readings-template.csv"),
+}
+
+
+def content_key_for_model(model) -> Optional[str]:
+    for key, content in CSV_CONTENT.items():
+        if content.model is model:
+            return key
+    return None
+
+
+def enqueue_import(content: str, upload, *, update: bool = False, user=None) -> CsvJob:
+    job = CsvJob(
+        kind=CsvJob.Kind.IMPORT,
+        content=content,
+        update_existing=update,
+        created_by=user if user and user.is_authenticated else None,
+    )
+    job.source.save(upload.name, upload, save=False)
+    job.save()
+    return job
+
+
+def enqueue_export(content: str, *, user=None) -> CsvJob:
+    return CsvJob.objects.create(
+        kind=CsvJob.Kind.EXPORT,
+        content=content,
+        created_by=user if user and user.is_authenticated else None,
+    )
+
+
+def claim_next_job() -> Optional[CsvJob]:
+    """Mark the oldest queued job as running and return it.
+
+    The claim is a conditional UPDATE, so concurrent workers never run the
+    same job.
+    """
+    queued = CsvJob.objects.filter(status=CsvJob.Status.QUEUED)
+    for pk in queued.order_by("created_at", "pk").values_list("pk", flat=True)[:10]:
+        claimed = queued.filter(pk=pk).update(
+            status=CsvJob.Status.RUNNING, started_at=timezone.now()
+        )
+        if claimed:
+            return CsvJob.objects.get(pk=pk)
+    return None
+
+
+def run_job(job: CsvJob) -> CsvJob:
+    try:
+        content = CSV_CONTENT[job.content]
+        if job.kind == CsvJob.Kind.IMPORT:
+            _run_import(job, content)
+        else:
+            _run_export(job, content)
+    except Exception as exc:  # any failure ends up on the job
+        job.status = CsvJob.Status.FAILED
+        job.message = _failure_message(exc)
+    else:
+        job.status = CsvJob.Status.DONE
+    job.finished_at = timezone.now()
+    job.save()
+    return job
+
+
+def _run_import(job: CsvJob, content: CsvContent) -> None:
+    def report(stats: ImportStats) -> None:
+        job.processed = stats.processed
+        job.created = stats.created
+        job.updated = stats.updated
+        job.unchanged = stats.unchanged
+        job.skipped = stats.skipped
+        job.errors = stats.errors[:MAX_RECORDED_ERRORS]
+        CsvJob.objects.filter(pk=job.pk).update(
+            processed=job.processed,
+            created=job.created,
+            updated=job.updated,
+            unchanged=job.unchanged,
+            skipped=job.skipped,
+            errors=job.errors,
+        )
+
+    with job.source.open("rb") as source:
+        stream = io.TextIOWrapper(source, encoding="utf-8-sig", newline="")
+        stats = run_import(
+            content.spec,
+            csv.DictReader(stream),
+            update=job.update_existing,
+            progress=report,
+            collect_errors=True,
+            atomic=False,
+        )
+    report(stats)
+    job.message = (
+        f"Created: {stats.created} Updated: {stats.updated} "
+        f"Unchanged: {stats.unchanged} Skipped: {stats.skipped} "
+        f"({stats.duration:.1f}s)"
+    )
+
+
+def _run_export(job: CsvJob, content: CsvContent) -> None:
+    rows = content.rows(content.model.objects.all())
+    with tempfile.TemporaryFile() as buffer:
+        if content.bom:
+            buffer.write(BOM.encode("utf-8"))
+        # Line 0 is the header, so ``count`` ends at the number of rows.
+        for count, line in enumerate(iter_csv_lines(rows)):
+            buffer.write(line.encode("utf-8"))
+            if count and count % EXPORT_PROGRESS_EVERY == 0:
+                CsvJob.objects.filter(pk=job.pk).update(processed=count)
+        buffer.seek(0)
+        job.result.save(content.filename, File(buffer), save=False)
+    job.processed = count
+    job.message = f"Exported {count} rows."
+
+
+def _failure_message(exc: Exception) -> str:
+    if isinstance(exc, UnicodeDecodeError):
+        return "File must be UTF-8 encoded."
+    if isinstance(exc, ValueError):
+        return str(exc)
+    return "".join(traceback.format_exception_only(type(exc), exc)).strip()
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from exams.content_dump import CONTENT_TYPES, write_dump
+
+
+class Command(BaseCommand):
+    help = (
+        "Dump tests (with questions/options), readings, glossary, verbs and "
+        "expressions to a gzip NDJSON file keyed by natural keys."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            "-o",
+            default="content.ndjson.gz",
+            help="File to write (default: content.ndjson.gz).",
+        )
+        parser.add_argument(
+            "--only",
+            default="",
+            help=f"Comma-separated subset of: {', '.join(CONTENT_TYPES)}.",
+        )
+
+    def handle(self, *args, **options):
+        content_types = parse_content_types(options["only"])
+        output_path = Path(options["output"]).expanduser().resolve()
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with output_path.open("wb") as file_obj:
+            counts = write_dump(file_obj, content_types)
+        summary = ", ".join(f"{name}: {count}" for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Dumped {summary} to {output_path}"))
+
+
+def parse_content_types(value: str):
+    if not value:
+        return CONTENT_TYPES
+    selected = tuple(name.strip() for name in value.split(",") if name.strip())
+    unknown = set(selected) - set(CONTENT_TYPES)
+    if unknown:
+        raise CommandError(f"Unknown content types: {', '.join(sorted(unknown))}")
+    return selected
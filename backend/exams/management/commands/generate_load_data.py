@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import random
+import time
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from exams.caching import bump_content_version
+from exams.models import (
+    Answer,
+    Assignment,
+    Option,
+    Question,
+    StudentProfile,
+    Submission,
+)
+from exams.utils.access import delete_assignments
+
+# Generated students are recognisable (and replaced on every run) by domain.
+LOAD_EMAIL_DOMAIN = "load.norskkurs.test"
+LOCALES = ["en", "nb", "ru"]
+# Submissions are spread over this many days before the run.
+HISTORY_DAYS = 180
+
+
+def student_email(number: int) -> str:
+    return f"student{number:06d}@{LOAD_EMAIL_DOMAIN}"
+
+
+def load_answer_keys():
+    """``[(test_id, [(question_id, [(option_id, is_correct), ...]), ...]), ...]``
+    for published tests, in a stable order so the RNG picks the same rows."""
+    options = {}
+    for option_id, question_id, is_correct in (
+        Option.objects.filter(question__test__is_published=True)
+        .order_by("question_id", "order", "id")
+        .values_list("id", "question_id", "is_correct")
+    ):
+        options.setdefault(question_id, []).append((option_id, is_correct))
+    tests = {}
+    for question_id, test_id in (
+        Question.objects.filter(test__is_published=True)
+        .order_by("test_id", "order", "id")
+        .values_list("id", "test_id")
+    ):
+        tests.setdefault(test_id, []).append(
+            (question_id, options.get(question_id, []))
+        )
+    return sorted(tests.items())
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a deterministic load-testing dataset on top of seed_sample_data: "
+        "student profiles, assignments, submissions and answers, written with "
+        f"bulk_create in chunks. Students from a previous run (@{LOAD_EMAIL_DOMAIN}) "
+        "and their submissions are replaced, so re-running with the same options "
+        "yields the same dataset."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=2000)
+        parser.add_argument(
+            "--submissions-per-student",
+            type=int,
+            default=25,
+            help="Average number of submissions per student (default: 25).",
+        )
+        parser.add_argument(
+            "--assignments-per-student",
+            type=int,
+            default=3,
+            help="Maximum number of test assignments per student (default: 3).",
+        )
+        parser.add_argument(
+            "--content-scale",
+            type=int,
+            default=1,
+            help="Passed to seed_sample_data --scale before generating (default: 1).",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=42, help="RNG seed (default: 42)."
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Submissions written per transaction (default: 2000).",
+        )
+
+    def handle(self, *args, **options):
+        if options["students"] < 1 or options["chunk_size"] < 1:
+            raise CommandError("--students and --chunk-size must be at least 1.")
+        started = time.perf_counter()
+        rng = random.Random(options["seed"])
+
+        call_command(
+            "seed_sample_data", scale=options["content_scale"], stdout=self.stdout
+        )
+        self.reset(options["chunk_size"])
+
+        answer_keys = load_answer_keys()
+        if not answer_keys:
+            raise CommandError("No published tests to generate submissions for.")
+        emails = [student_email(number) for number in range(1, options["students"] + 1)]
+
+        student_ids = self.create_profiles(rng, emails)
+        self.create_assignments(
+            rng, student_ids, answer_keys, options["assignments_per_student"]
+        )
+        submissions, answers = self.create_submissions(
+            timezone.now(),
+            rng,
+            student_ids,
+            answer_keys,
+            options["submissions_per_student"],
+            options["chunk_size"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {len(emails)} students, {submissions} submissions and "
+                f"{answers} answers in {time.perf_counter() - started:.1f}s."
+            )
+        )
+
+    def reset(self, chunk_size):
+        """Delete the generated students, ``chunk_size`` rows per transaction.
+
+        Answers are deleted before their submissions, and assignments before
+        their profiles, each with a single statement, so no batch loads more
+        than ``chunk_size`` rows into memory.
+        """
+        suffix = f"@{LOAD_EMAIL_DOMAIN}"
+        submissions = Submission.objects.filter(
+            student__email__endswith=suffix
+        ).order_by()
+        while True:
+            with transaction.atomic():
+                pks = self._next_batch(submissions, chunk_size)
+                if not pks:
+                    break
+                Answer.objects.filter(submission_id__in=pks).delete()
+                Submission.objects.filter(pk__in=pks).delete()
+
+        profiles = StudentProfile.objects.filter(email__endswith=suffix).order_by()
+        deleted_assignments = 0
+        while True:
+            with transaction.atomic():
+                pks = self._next_batch(profiles, chunk_size)
+                if not pks:
+                    break
+                deleted_assignments += delete_assignments(
+                    Assignment.objects.filter(student_id__in=pks).values_list(
+                        "pk", flat=True
+                    )
+                )
+                # The profile signals drop the students' cached access sets.
+                StudentProfile.objects.filter(pk__in=pks).delete()
+        if deleted_assignments:
+            bump_content_version(Assignment)
+
+    @staticmethod
+    def _next_batch(queryset, size):
+        return list(queryset.values_list("pk", flat=True)[:size])
+
+    def create_profiles(self, rng, emails):
+        profiles = [
+            StudentProfile(
+                email=email,
+                stream=rng.choice(StudentProfile.Stream.values),
+                level=rng.choice(StudentProfile.Level.values),
+            )
+            for email in emails
+        ]
+        StudentProfile.objects.bulk_create(
+            profiles, batch_size=1000, ignore_conflicts=True
+        )
+        ids = dict(
+            StudentProfile.objects.filter(
+                email__endswith=f"@{LOAD_EMAIL_DOMAIN}"
+            ).values_list("email", "pk")
+        )
+        return [ids[email] for email in emails]
+
+    def create_assignments(self, rng, student_ids, answer_keys, per_student):
+        now = timezone.now()
+        test_ids = [test_id for test_id, _ in answer_keys]
+        assignments = []
+        for student_id in student_ids:
+            count = rng.randint(0, min(per_student, len(test_ids)))
+            for test_id in rng.sample(test_ids, count):
+                # A mix of open-ended, expired and still valid assignments.
+                days = rng.choice([None, None, -30, -1, 7, 90])
+                assignments.append(
+                    Assignment(
+                        test_id=test_id,
+                        student_id=student_id,
+                        expires_at=None if days is None else now + timedelta(days=days),
+                    )
+                )
+        Assignment.objects.bulk_create(
+            assignments, batch_size=1000, ignore_conflicts=True
+        )
+
+    def create_submissions(
+        self, now, rng, student_ids, answer_keys, per_student, chunk_size
+    ):
+        total_submissions = total_answers = 0
+        pending = []
+        for number, student_id in enumerate(student_ids, start=1):
+            for _ in range(rng.randint(0, 2 * per_student)):
+                test_id, questions = rng.choice(answer_keys)
+                picks = [
+                    (question_id, rng.choice(choices) if choices else (None, False))
+                    for question_id, choices in questions
+                ]
+                created_at = now - timedelta(
+                    seconds=rng.randrange(HISTORY_DAYS * 24 * 60 * 60)
+                )
+                pending.append((student_id, number, test_id, picks, created_at))
+                if len(pending) >= chunk_size:
+                    total_answers += self.write_submissions(rng, pending)
+                    total_submissions += len(pending)
+                    pending = []
+                    self.stdout.write(f"  {total_submissions} submissions...")
+        if pending:
+            total_answers += self.write_submissions(rng, pending)
+            total_submissions += len(pending)
+        return total_submissions, total_answers
+
+    def write_submissions(self, rng, pending) -> int:
+        with transaction.atomic():
+            submissions = Submission.objects.bulk_create(
+                [
+                    Submission(
+                        test_id=test_id,
+                        name=f"Student {number}",
+                        student_id=student_id,
+                        score=sum(is_correct for _, (_, is_correct) in picks),
+                        total_questions=len(picks),
+                        locale=rng.choice(LOCALES),
+                    )
+                    for student_id, number, test_id, picks, _ in pending
+                ]
+            )
+            # ``auto_now_add`` overrides ``created_at`` on insert; spread the
+            # history afterwards.
+            for submission, (*_, created_at) in zip(submissions, pending):
+                submission.created_at = created_at
+            Submission.objects.bulk_update(submissions, ["created_at"], batch_size=1000)
+            # Postgres and SQLite return the ids of bulk-inserted rows.
+            answers = [
+                Answer(
+                    submission=submission,
+                    question_id=question_id,
+                    selected_option_id=option_id,
+                    is_correct=is_correct,
+                )
+                for submission, (_, _, _, picks, _) in zip(submissions, pending)
+                for question_id, (option_id, is_correct) in picks
+            ]
+            Answer.objects.bulk_create(answers, batch_size=5000)
+        return len(answers)
@@ -5,6 +5,7 @@ from pathlib import Path
 
 from django.core.management.base import BaseCommand, CommandError
 
+from exams.utils.csv_import import IMPORT_BATCH_SIZE
 from exams.utils.verb_csv import import_verbs_from_reader
 
 
@@ -18,21 +19,61 @@ class Command(BaseCommand):
             action="store_true",
             help="Update existing verbs (matched by stream + verb) instead of creating only new rows.",
         )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate the file and report what would change without writing.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help="Rows written per bulk query.",
+        )
 
     def handle(self, *args, **options):
         csv_path = Path(options["csv_path"]).expanduser()
         if not csv_path.exists():
             raise CommandError(f"File {csv_path} does not exist.")
 
-        with csv_path.open(newline="", encoding="utf-8") as csvfile:
+        def report(stats):
+            self.stdout.write(f"  {stats.processed} rows ({stats.duration:.1f}s)")
+
+        with csv_path.open(newline="", encoding="utf-8-sig") as csvfile:
             reader = csv.DictReader(csvfile)
             try:
-                stats = import_verbs_from_reader(reader, update=options["update"])
+                stats = import_verbs_from_reader(
+                    reader,
+                    update=options["update"],
+                    batch_size=options["batch_size"],
+                    progress=report,
+                    dry_run=options["dry_run"],
+                )
             except ValueError as exc:
                 raise CommandError(str(exc)) from exc
 
+        if options["dry_run"]:
+            for change in stats.changes:
+                details = ", ".join(change.get("fields", [])) or change.get(
+                    "reason", ""
+                )
+                self.stdout.write(
+                    f"  row {change['row']}: {change['action']} "
+                    f"{change.get('key', '')} {details}".rstrip()
+                )
+            for error in stats.errors:
+                self.stdout.write(
+                    self.style.ERROR(f"  row {error['row']}: {error['error']}")
+                )
+        verb = (
+            "Dry run finished (nothing saved)"
+            if options["dry_run"]
+            else "Import finished"
+        )
         self.stdout.write(
             self.style.SUCCESS(
-                f"Import finished. Created: {stats.created}, Updated: {stats.updated}, Skipped: {stats.skipped}."
+                f"{verb}. Created: {stats.created}, Updated: {stats.updated}, "
+                f"Unchanged: {stats.unchanged}, Skipped: {stats.skipped} "
+                f"({stats.duration:.1f}s)."
             )
         )
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from exams.content_dump import CONTENT_TYPES, load_dump
+from exams.management.commands.dump_content import parse_content_types
+
+
+class Command(BaseCommand):
+    help = (
+        "Load a dump_content file: upsert content by natural key in one "
+        "transaction (nothing absent from the file is deleted)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File written by dump_content.")
+        parser.add_argument(
+            "--only",
+            default="",
+            help=f"Comma-separated subset of: {', '.join(CONTENT_TYPES)}.",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["path"]).expanduser()
+        if not path.exists():
+            raise CommandError(f"File {path} does not exist.")
+        content_types = parse_content_types(options["only"])
+        with path.open("rb") as file_obj:
+            try:
+                results = load_dump(file_obj, content_types)
+            except ValueError as exc:
+                raise CommandError(str(exc)) from exc
+        for content, stats in results.items():
+            self.stdout.write(
+                f"{content}: created {stats.created}, updated {stats.updated}, "
+                f"unchanged {stats.unchanged} ({stats.duration:.1f}s)"
+            )
+        self.stdout.write(self.style.SUCCESS("Content loaded."))
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from exams.utils.access import (
+    PURGE_BATCH_SIZE,
+    expired_assignments,
+    purge_expired_assignments,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete assignments whose expires_at has passed, in bounded batches so "
+        "no single transaction locks much of the table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=PURGE_BATCH_SIZE,
+            help=f"Rows deleted per transaction (default: {PURGE_BATCH_SIZE}).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the expired assignments.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        if options["dry_run"]:
+            count = expired_assignments().count()
+            self.stdout.write(f"{count} expired assignments would be deleted.")
+            return
+
+        deleted = purge_expired_assignments(
+            batch_size=options["batch_size"],
+            progress=lambda count: self.stdout.write(f"  {count} deleted..."),
+        )
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired assignments."))
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from exams.caching import response_cache_stats
+from exams.urls import router
+
+
+class Command(BaseCommand):
+    help = "Show hit/miss counters of the API response cache per endpoint."
+
+    def handle(self, *args, **options):
+        basenames = [basename for _, _, basename in router.registry]
+        for basename, counts in response_cache_stats(basenames).items():
+            total = counts["hits"] + counts["misses"]
+            if not total:
+                continue
+            ratio = counts["hits"] / total * 100
+            self.stdout.write(
+                f"{basename}: {counts['hits']} hits, {counts['misses']} misses "
+                f"({ratio:.1f}% hit rate)"
+            )
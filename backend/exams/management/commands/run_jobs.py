@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import time
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+
+from exams.caching import content_cache
+from exams.jobs import claim_next_job, run_job
+
+
+class Command(BaseCommand):
+    help = "Process queued CSV import/export jobs (run as a long-lived worker)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process the jobs queued right now and exit.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds to wait between polls when the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        if isinstance(content_cache(), LocMemCache):
+            # Imports bump content versions in this process only, so the web
+            # server would keep serving cached pre-import lists.
+            self.stderr.write(
+                self.style.WARNING(
+                    "The content cache is per-process (locmem); set "
+                    "CONTENT_CACHE_URL to a cache shared with the web server."
+                )
+            )
+        while True:
+            job = claim_next_job()
+            if job is None:
+                if options["once"]:
+                    return
+                time.sleep(options["interval"])
+                continue
+            self.stdout.write(f"Running job {job.pk}: {job}")
+            job = run_job(job)
+            style = (
+                self.style.SUCCESS
+                if job.status == job.Status.DONE
+                else self.style.ERROR
+            )
+            self.stdout.write(style(f"Job {job.pk} {job.status}: {job.message}"))
@@ -0,0 +1,38 @@
+import math
+
+from django.db import migrations, models
+
+WORDS_PER_MINUTE = 120
+
+
+def backfill_reading_stats(apps, schema_editor):
+    Reading = apps.get_model("exams", "Reading")
+    readings = list(Reading.objects.only("id", "body"))
+    for reading in readings:
+        reading.word_count = len((reading.body or "").split())
+        reading.reading_minutes = max(
+            1, math.ceil(reading.word_count / WORDS_PER_MINUTE)
+        )
+    Reading.objects.bulk_update(
+        readings, ["word_count", "reading_minutes"], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("exams", "0024_expression_meaning_nn"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="reading",
+            name="reading_minutes",
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name="reading",
+            name="word_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_reading_stats, migrations.RunPython.noop),
+    ]
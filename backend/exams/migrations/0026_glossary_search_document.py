@@ -0,0 +1,49 @@
+import django.contrib.postgres.search
+import django.db.models.functions.text
+from django.db import migrations, models
+
+import exams.indexes
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("exams", "0025_reading_word_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="glossaryterm",
+            name="search_document",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.functions.text.Concat(
+                    "term",
+                    models.Value(" "),
+                    "translation",
+                    models.Value(" "),
+                    "translation_en",
+                    models.Value(" "),
+                    "translation_ru",
+                    models.Value(" "),
+                    "translation_nn",
+                    models.Value(" "),
+                    "translation_nb",
+                    models.Value(" "),
+                    "explanation",
+                    output_field=models.TextField(),
+                ),
+                output_field=models.TextField(),
+            ),
+        ),
+        # Only created on PostgreSQL; SQLite uses an FTS5 shadow table
+        # maintained by exams.search.sync_sqlite_fts after migrate.
+        migrations.AddIndex(
+            model_name="glossaryterm",
+            index=exams.indexes.PostgresGinIndex(
+                django.contrib.postgres.search.SearchVector(
+                    "search_document", config="simple"
+                ),
+                name="exams_glossary_search_gin",
+            ),
+        ),
+    ]
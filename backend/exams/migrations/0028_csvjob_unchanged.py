@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exams", "0027_csv_job"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="csvjob",
+            name="unchanged",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
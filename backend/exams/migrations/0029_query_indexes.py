@@ -0,0 +1,115 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exams", "0028_csvjob_unchanged"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="assignment",
+            index=models.Index(
+                fields=["student_email", "test"], name="exams_assig_student_013084_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="exercise",
+            index=models.Index(
+                fields=["stream", "level"], name="exams_exerc_stream_4fb887_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="exercise",
+            index=models.Index(
+                condition=models.Q(("assigned_to_email__isnull", True)),
+                fields=["stream", "level"],
+                name="exercise_unassigned_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="exercise",
+            index=models.Index(
+                condition=models.Q(("assigned_to_email__isnull", False)),
+                fields=["assigned_to_email"],
+                name="exercise_assigned_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="homework",
+            index=models.Index(
+                fields=["status", "stream", "level"],
+                name="exams_homew_status_5ac831_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="homework",
+            index=models.Index(
+                condition=models.Q(("assigned_to_email__isnull", True)),
+                fields=["status", "stream", "level"],
+                name="homework_unassigned_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="homework",
+            index=models.Index(
+                condition=models.Q(("assigned_to_email__isnull", False)),
+                fields=["assigned_to_email"],
+                name="homework_assigned_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="material",
+            index=models.Index(
+                fields=["stream", "level", "is_published"],
+                name="exams_mater_stream_888a8f_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="material",
+            index=models.Index(
+                condition=models.Q(("assigned_to_email__isnull", True)),
+                fields=["stream", "level"],
+                name="material_unassigned_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="material",
+            index=models.Index(
+                condition=models.Q(("assigned_to_email__isnull", False)),
+                fields=["assigned_to_email"],
+                name="material_assigned_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="reading",
+            index=models.Index(
+                fields=["stream", "level", "is_published"],
+                name="exams_readi_stream_fa829e_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="submission",
+            index=models.Index(
+                fields=["test", "created_at"], name="exams_submi_test_id_2ce78b_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="submission",
+            index=models.Index(
+                fields=["email", "created_at"], name="exams_submi_email_5bf470_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="test",
+            index=models.Index(
+                fields=["stream", "level", "is_published"],
+                name="exams_test_stream_e392b7_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,111 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:03
+
+from django.db import migrations
+from django.db.models import F
+from django.db.models.functions import Lower, Trim
+
+import exams.fields
+
+BATCH_SIZE = 1000
+
+
+def pending_rows(model, field, *extra):
+    """``(pk, value, *extra)`` of rows whose ``field`` is not normalized yet."""
+    return list(
+        model.objects.filter(**{f"{field}__isnull": False})
+        .annotate(normalized=Lower(Trim(field)))
+        .exclude(**{field: F("normalized")})
+        .order_by("pk")
+        .values_list("pk", field, *extra)
+    )
+
+
+def normalize_column(model, field):
+    rows = pending_rows(model, field)
+    for start in range(0, len(rows), BATCH_SIZE):
+        model.objects.bulk_update(
+            [
+                model(pk=pk, **{field: value.strip().lower()})
+                for pk, value in rows[start : start + BATCH_SIZE]
+            ],
+            [field],
+        )
+
+
+def normalize_profiles(StudentProfile):
+    # Profiles differing only in case are merged into the normalized one.
+    for pk, email, user_id in pending_rows(StudentProfile, "email", "user_id"):
+        normalized = email.strip().lower()
+        kept = StudentProfile.objects.filter(email=normalized).first()
+        if kept is None:
+            StudentProfile.objects.filter(pk=pk).update(email=normalized)
+            continue
+        StudentProfile.objects.filter(pk=pk).delete()
+        if kept.user_id is None and user_id is not None:
+            StudentProfile.objects.filter(pk=kept.pk).update(user_id=user_id)
+
+
+def normalize_assignments(Assignment):
+    # (test, email) is unique, so case-only duplicates are dropped.
+    for pk, email, test_id in pending_rows(Assignment, "student_email", "test_id"):
+        normalized = email.strip().lower()
+        duplicate = Assignment.objects.filter(test_id=test_id, student_email=normalized)
+        if duplicate.exists():
+            Assignment.objects.filter(pk=pk).delete()
+        else:
+            Assignment.objects.filter(pk=pk).update(student_email=normalized)
+
+
+def normalize_emails(apps, schema_editor):
+    normalize_profiles(apps.get_model("exams", "StudentProfile"))
+    normalize_assignments(apps.get_model("exams", "Assignment"))
+    normalize_column(apps.get_model("exams", "Submission"), "email")
+    for name in ("Material", "Homework", "Exercise"):
+        normalize_column(apps.get_model("exams", name), "assigned_to_email")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exams", "0029_query_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="assignment",
+            name="student_email",
+            field=exams.fields.LowercaseEmailField(max_length=254),
+        ),
+        migrations.AlterField(
+            model_name="exercise",
+            name="assigned_to_email",
+            field=exams.fields.LowercaseEmailField(
+                blank=True, max_length=254, null=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="homework",
+            name="assigned_to_email",
+            field=exams.fields.LowercaseEmailField(
+                blank=True, max_length=254, null=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="material",
+            name="assigned_to_email",
+            field=exams.fields.LowercaseEmailField(
+                blank=True, max_length=254, null=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="studentprofile",
+            name="email",
+            field=exams.fields.LowercaseEmailField(max_length=254, unique=True),
+        ),
+        migrations.AlterField(
+            model_name="submission",
+            name="email",
+            field=exams.fields.LowercaseEmailField(blank=True, max_length=254),
+        ),
+        migrations.RunPython(normalize_emails, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,119 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+# (model, email column, foreign key) pairs to backfill.
+EMAIL_COLUMNS = [
+    ("Assignment", "student_email", "student"),
+    ("Submission", "email", "student"),
+    ("Material", "assigned_to_email", "assigned_to"),
+    ("Homework", "assigned_to_email", "assigned_to"),
+    ("Exercise", "assigned_to_email", "assigned_to"),
+]
+
+
+def profile_ids(StudentProfile, emails):
+    """``email -> profile id``, creating profiles for unknown emails."""
+    StudentProfile.objects.bulk_create(
+        [StudentProfile(email=email) for email in emails], ignore_conflicts=True
+    )
+    return dict(
+        StudentProfile.objects.filter(email__in=emails).values_list("email", "pk")
+    )
+
+
+def backfill_students(apps, schema_editor):
+    StudentProfile = apps.get_model("exams", "StudentProfile")
+    for model_name, email_field, fk_field in EMAIL_COLUMNS:
+        model = apps.get_model("exams", model_name)
+        pending = (
+            model.objects.filter(**{f"{fk_field}__isnull": True})
+            .exclude(**{f"{email_field}__isnull": True})
+            .exclude(**{email_field: ""})
+            .order_by("pk")
+        )
+        last_pk = 0
+        while True:
+            rows = list(
+                pending.filter(pk__gt=last_pk).values_list("pk", email_field)[
+                    :BATCH_SIZE
+                ]
+            )
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+            ids = profile_ids(StudentProfile, {email for _, email in rows})
+            model.objects.bulk_update(
+                [model(pk=pk, **{f"{fk_field}_id": ids[email]}) for pk, email in rows],
+                [fk_field],
+            )
+    # Assignments without an email never granted access to anyone.
+    apps.get_model("exams", "Assignment").objects.filter(student__isnull=True).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exams", "0030_lowercase_emails"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="assignment",
+            name="student",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="assignments",
+                to="exams.studentprofile",
+            ),
+        ),
+        migrations.AddField(
+            model_name="exercise",
+            name="assigned_to",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="exercises",
+                to="exams.studentprofile",
+            ),
+        ),
+        migrations.AddField(
+            model_name="homework",
+            name="assigned_to",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="homework",
+                to="exams.studentprofile",
+            ),
+        ),
+        migrations.AddField(
+            model_name="material",
+            name="assigned_to",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="materials",
+                to="exams.studentprofile",
+            ),
+        ),
+        migrations.AddField(
+            model_name="submission",
+            name="student",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="submissions",
+                to="exams.studentprofile",
+            ),
+        ),
+        migrations.RunPython(backfill_students, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,155 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+import exams.fields
+
+BATCH_SIZE = 1000
+
+EMAIL_COLUMNS = [
+    ("Assignment", "student_email", "student"),
+    ("Submission", "email", "student"),
+    ("Material", "assigned_to_email", "assigned_to"),
+    ("Homework", "assigned_to_email", "assigned_to"),
+    ("Exercise", "assigned_to_email", "assigned_to"),
+]
+
+
+def restore_emails(apps, schema_editor):
+    """Reverse only: copy the students' emails back into the old columns."""
+    for model_name, email_field, fk_field in EMAIL_COLUMNS:
+        model = apps.get_model("exams", model_name)
+        rows = (
+            model.objects.filter(**{f"{fk_field}__isnull": False})
+            .order_by("pk")
+            .values_list("pk", f"{fk_field}__email")
+        )
+        last_pk = 0
+        while batch := list(rows.filter(pk__gt=last_pk)[:BATCH_SIZE]):
+            last_pk = batch[-1][0]
+            model.objects.bulk_update(
+                [model(pk=pk, **{email_field: email}) for pk, email in batch],
+                [email_field],
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exams", "0031_student_foreign_keys"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Nullable while the column is rebuilt on the way back, so
+        # restore_emails can fill it before it becomes required again.
+        migrations.AlterField(
+            model_name="assignment",
+            name="student_email",
+            field=exams.fields.LowercaseEmailField(max_length=254, null=True),
+        ),
+        migrations.RunPython(migrations.RunPython.noop, restore_emails),
+        migrations.RemoveIndex(
+            model_name="assignment",
+            name="exams_assig_student_013084_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="exercise",
+            name="exercise_unassigned_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="exercise",
+            name="exercise_assigned_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="homework",
+            name="homework_unassigned_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="homework",
+            name="homework_assigned_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="material",
+            name="material_unassigned_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="material",
+            name="material_assigned_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="submission",
+            name="exams_submi_email_5bf470_idx",
+        ),
+        migrations.AlterUniqueTogether(
+            name="assignment",
+            unique_together={("test", "student")},
+        ),
+        migrations.RemoveField(
+            model_name="exercise",
+            name="assigned_to_email",
+        ),
+        migrations.RemoveField(
+            model_name="homework",
+            name="assigned_to_email",
+        ),
+        migrations.RemoveField(
+            model_name="material",
+            name="assigned_to_email",
+        ),
+        migrations.RemoveField(
+            model_name="submission",
+            name="email",
+        ),
+        migrations.AlterField(
+            model_name="assignment",
+            name="student",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="assignments",
+                to="exams.studentprofile",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="assignment",
+            index=models.Index(
+                fields=["student", "test"], name="exams_assig_student_28181c_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="exercise",
+            index=models.Index(
+                condition=models.Q(("assigned_to__isnull", True)),
+                fields=["stream", "level"],
+                name="exercise_unassigned_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="homework",
+            index=models.Index(
+                condition=models.Q(("assigned_to__isnull", True)),
+                fields=["status", "stream", "level"],
+                name="homework_unassigned_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="material",
+            index=models.Index(
+                condition=models.Q(("assigned_to__isnull", True)),
+                fields=["stream", "level"],
+                name="material_unassigned_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="submission",
+            index=models.Index(
+                fields=["student", "created_at"], name="exams_submi_student_079fa3_idx"
+            ),
+        ),
+        migrations.RemoveField(
+            model_name="assignment",
+            name="student_email",
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exams", "0032_drop_student_emails"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="assignment",
+            name="exams_assig_student_28181c_idx",
+        ),
+        migrations.AddIndex(
+            model_name="assignment",
+            index=models.Index(
+                fields=["student", "expires_at"], name="exams_assig_student_5550eb_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="assignment",
+            index=models.Index(
+                condition=models.Q(("expires_at__isnull", False)),
+                fields=["expires_at"],
+                name="assignment_expiring_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Assigned materials, homework and exercises used to reference students by an
+# email string, so deleting a student never touched them. PROTECT keeps that:
+# deleting a student (or their user) with assigned content is refused until the
+# content is reassigned or deleted. SET_NULL was rejected because it would
+# publish content meant for one student to everyone.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exams", "0033_assignment_expiry_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="exercise",
+            name="assigned_to",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="exercises",
+                to="exams.studentprofile",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="homework",
+            name="assigned_to",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="homework",
+                to="exams.studentprofile",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="material",
+            name="assigned_to",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="materials",
+                to="exams.studentprofile",
+            ),
+        ),
+    ]
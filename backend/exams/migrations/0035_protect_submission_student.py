@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Submissions used to keep the student's email string, so deleting a student
+# left their graded history attributable. With the foreign key, SET_NULL would
+# orphan it; PROTECT refuses to delete a student (or their user) who has
+# submissions, as 0034 does for assigned content.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exams", "0034_protect_assigned_content"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="submission",
+            name="student",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="submissions",
+                to="exams.studentprofile",
+            ),
+        ),
+    ]
@@ -1,9 +1,26 @@
 ﻿from __future__ import annotations
 
+import math
+
 from django.conf import settings
+from django.contrib.postgres.search import SearchVector
 from django.db import models
+from django.db.models.functions import Concat
 from django.utils.translation import gettext_lazy as _
 
+from .fields import LowercaseEmailField
+from .indexes import PostgresGinIndex
+
+
+class TestQuerySet(models.QuerySet):
+    def with_question_stats(self):
+        """Annotate question count and question-type mode in a single query."""
+        return self.annotate(
+            num_questions=models.Count("questions"),
+            num_question_types=models.Count("questions__question_type", distinct=True),
+            first_question_type=models.Min("questions__question_type"),
+        )
+
 
 class Test(models.Model):
     class Stream(models.TextChoices):
@@ -33,19 +50,42 @@ class Test(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TestQuerySet.as_manager()
+
     class Meta:
         ordering = ["level", "title"]
+        indexes = [
+            models.Index(fields=["stream", "level", "is_published"]),
+        ]
 
     def __str__(self) -> str:
         return f"{self.title} ({self.level})"
 
+    def _prefetched_questions(self):
+        return getattr(self, "_prefetched_objects_cache", {}).get("questions")
+
     @property
     def question_count(self) -> int:
+        # Prefer values computed by ``TestQuerySet.with_question_stats`` or a
+        # ``prefetch_related("questions")`` and only hit the database as a fallback.
+        if hasattr(self, "num_questions"):
+            return self.num_questions
+        prefetched = self._prefetched_questions()
+        if prefetched is not None:
+            return len(prefetched)
         return self.questions.count()
 
     @property
     def question_mode(self) -> str:
-        q_types = set(self.questions.values_list("question_type", flat=True))
+        if hasattr(self, "num_question_types"):
+            if self.num_question_types == 1:
+                return self.first_question_type
+            return "mixed"
+        prefetched = self._prefetched_questions()
+        if prefetched is not None:
+            q_types = {question.question_type for question in prefetched}
+        else:
+            q_types = set(self.questions.values_list("question_type", flat=True))
         if len(q_types) == 1:
             return q_types.pop()
         return "mixed"
@@ -89,7 +129,14 @@ class Option(models.Model):
 class Submission(models.Model):
     test = models.ForeignKey(Test, on_delete=models.CASCADE, related_name="submissions")
     name = models.CharField(max_length=120, blank=True)
-    email = models.EmailField(blank=True)
+    # Deleting a student must not orphan their graded history.
+    student = models.ForeignKey(
+        "StudentProfile",
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="submissions",
+    )
     score = models.PositiveIntegerField(default=0)
     total_questions = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -101,6 +148,10 @@ class Submission(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["test", "created_at"]),
+            models.Index(fields=["student", "created_at"]),
+        ]
 
     def __str__(self) -> str:
         return f"{self.test.title} submission ({self.created_at:%Y-%m-%d})"
@@ -134,7 +185,9 @@ class Answer(models.Model):
 
 class Assignment(models.Model):
     test = models.ForeignKey(Test, on_delete=models.CASCADE, related_name="assignments")
-    student_email = models.EmailField()
+    student = models.ForeignKey(
+        "StudentProfile", on_delete=models.CASCADE, related_name="assignments"
+    )
     assigned_by = models.ForeignKey(
         "auth.User",
         on_delete=models.SET_NULL,
@@ -146,11 +199,22 @@ class Assignment(models.Model):
     expires_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
-        unique_together = ("test", "student_email")
+        unique_together = ("test", "student")
         ordering = ["-created_at"]
+        indexes = [
+            # Per-student lookups of live assignments (exams.utils.access);
+            # unique_together leads with the test.
+            models.Index(fields=["student", "expires_at"]),
+            # purge_expired_assignments scans only rows that can expire.
+            models.Index(
+                fields=["expires_at"],
+                condition=models.Q(expires_at__isnull=False),
+                name="assignment_expiring_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
-        return f"{self.student_email} -> {self.test.slug}"
+        return f"{self.student.email} -> {self.test.slug}"
 
 
 class StudentProfile(models.Model):
@@ -164,7 +228,7 @@ class StudentProfile(models.Model):
         on_delete=models.CASCADE,
         related_name="student_profile",
     )
-    email = models.EmailField(unique=True)
+    email = LowercaseEmailField(unique=True)
     stream = models.CharField(
         max_length=20, choices=Stream.choices, default=Stream.BOKMAAL
     )
@@ -207,12 +271,29 @@ class Material(models.Model):
     url = models.URLField(blank=True)
     tags = models.JSONField(default=list, blank=True)
     is_published = models.BooleanField(default=True)
-    assigned_to_email = models.EmailField(blank=True, null=True)
+    assigned_to = models.ForeignKey(
+        "StudentProfile",
+        # Deleting a student must not delete teacher content.
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="materials",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["level", "title"]
+        indexes = [
+            models.Index(fields=["stream", "level", "is_published"]),
+            # Unassigned rows; the assigned ones are found through the
+            # assigned_to foreign key index.
+            models.Index(
+                fields=["stream", "level"],
+                condition=models.Q(assigned_to__isnull=True),
+                name="material_unassigned_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.title} ({self.stream}, {self.level})"
@@ -238,15 +319,36 @@ class Reading(models.Model):
     translation_ru = models.TextField(blank=True)
     tags = models.JSONField(default=list, blank=True)
     is_published = models.BooleanField(default=True)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_minutes = models.PositiveIntegerField(default=1, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Learners read slower than natives; used for the "N min read" estimate.
+    WORDS_PER_MINUTE = 120
+
     class Meta:
         ordering = ["level", "title"]
+        indexes = [
+            models.Index(fields=["stream", "level", "is_published"]),
+        ]
 
     def __str__(self) -> str:
         return f"{self.title} ({self.stream}, {self.level})"
 
+    def update_reading_stats(self) -> None:
+        self.word_count = len((self.body or "").split())
+        self.reading_minutes = max(
+            1, math.ceil(self.word_count / self.WORDS_PER_MINUTE)
+        )
+
+    def save(self, *args, **kwargs):
+        self.update_reading_stats()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "body" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "word_count", "reading_minutes"}
+        super().save(*args, **kwargs)
+
 
 class Homework(models.Model):
     class Status(models.TextChoices):
@@ -267,7 +369,14 @@ class Homework(models.Model):
     status = models.CharField(
         max_length=20, choices=Status.choices, default=Status.PUBLISHED
     )
-    assigned_to_email = models.EmailField(blank=True, null=True)
+    assigned_to = models.ForeignKey(
+        "StudentProfile",
+        # Deleting a student must not delete teacher content.
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="homework",
+    )
     student_submission = models.TextField(blank=True)
     feedback = models.TextField(blank=True)
     teacher = models.ForeignKey(
@@ -282,6 +391,14 @@ class Homework(models.Model):
 
     class Meta:
         ordering = ["-due_date", "-created_at"]
+        indexes = [
+            models.Index(fields=["status", "stream", "level"]),
+            models.Index(
+                fields=["status", "stream", "level"],
+                condition=models.Q(assigned_to__isnull=True),
+                name="homework_unassigned_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.title} ({self.level})"
@@ -307,12 +424,27 @@ class Exercise(models.Model):
     data = models.JSONField(default=dict, blank=True)
     tags = models.JSONField(default=list, blank=True)
     estimated_minutes = models.PositiveIntegerField(default=5)
-    assigned_to_email = models.EmailField(blank=True, null=True)
+    assigned_to = models.ForeignKey(
+        "StudentProfile",
+        # Deleting a student must not delete teacher content.
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="exercises",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["level", "title"]
+        indexes = [
+            models.Index(fields=["stream", "level"]),
+            models.Index(
+                fields=["stream", "level"],
+                condition=models.Q(assigned_to__isnull=True),
+                name="exercise_unassigned_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.title} ({self.kind})"
@@ -381,12 +513,89 @@ class GlossaryTerm(models.Model):
         max_length=2, choices=Test.Level.choices, default=Test.Level.A1
     )
     tags = models.JSONField(default=list, blank=True)
+    # Denormalized text the glossary search index is built from (see exams.search).
+    search_document = models.GeneratedField(
+        expression=Concat(
+            "term",
+            models.Value(" "),
+            "translation",
+            models.Value(" "),
+            "translation_en",
+            models.Value(" "),
+            "translation_ru",
+            models.Value(" "),
+            "translation_nn",
+            models.Value(" "),
+            "translation_nb",
+            models.Value(" "),
+            "explanation",
+            output_field=models.TextField(),
+        ),
+        output_field=models.TextField(),
+        db_persist=True,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["term"]
         unique_together = ("term", "stream", "level")
+        indexes = [
+            # Full-text search on PostgreSQL; SQLite uses an FTS5 table.
+            PostgresGinIndex(
+                SearchVector("search_document", config="simple"),
+                name="exams_glossary_search_gin",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.term} ({self.stream}, {self.level})"
+
+
+class CsvJob(models.Model):
+    """Queued CSV import/export, processed by ``manage.py run_jobs``."""
+
+    class Kind(models.TextChoices):
+        IMPORT = "import", _("Import")
+        EXPORT = "export", _("Export")
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", _("Queued")
+        RUNNING = "running", _("Running")
+        DONE = "done", _("Done")
+        FAILED = "failed", _("Failed")
+
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    # Key into exams.jobs.CSV_CONTENT ("verbs", "glossary", ...).
+    content = models.CharField(max_length=20)
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.QUEUED
+    )
+    update_existing = models.BooleanField(default=False)
+    source = models.FileField(upload_to="csv-jobs/source/", blank=True)
+    result = models.FileField(upload_to="csv-jobs/result/", blank=True)
+    processed = models.PositiveIntegerField(default=0)
+    created = models.PositiveIntegerField(default=0)
+    updated = models.PositiveIntegerField(default=0)
+    unchanged = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(default=0)
+    # Per-row problems: [{"row": 12, "error": "..."}].
+    errors = models.JSONField(default=list, blank=True)
+    message = models.TextField(blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="csv_jobs",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    def __str__(self) -> str:
+        return f"{self.get_kind_display()} {self.content} ({self.status})"
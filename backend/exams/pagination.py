@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import datetime
+import decimal
+import json
+from typing import Any, List, Optional, Tuple
+
+from django.core.exceptions import (
+    FieldDoesNotExist,
+    ImproperlyConfigured,
+    ValidationError,
+)
+from django.db import models
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Opt-in keyset (cursor) pagination over the queryset's own ordering.
+
+    Requests without ``page_size`` or ``cursor`` are left unpaginated so existing
+    clients keep receiving plain lists. Paginated responses look like
+    ``{"next": <url or null>, "results": [...]}``; the cursor encodes the ordering
+    values of the last row, so each page is a single indexed range scan instead
+    of an ``OFFSET``.
+    """
+
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if (
+            self.page_size_query_param not in params
+            and self.cursor_query_param not in params
+        ):
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        queryset = queryset.order_by(*(expr for _, _, expr in self.ordering))
+
+        encoded = params.get(self.cursor_query_param)
+        if encoded:
+            queryset = queryset.filter(self._after(self.decode_cursor(encoded)))
+
+        rows = list(queryset[: self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_page_size(self, request) -> int:
+        raw = request.query_params.get(self.page_size_query_param)
+        try:
+            size = int(raw) if raw else self.page_size
+        except ValueError:
+            size = self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, queryset) -> List[Tuple[models.Field, bool, Any]]:
+        """Return ``(field, descending, order expression)`` for each ordering key.
+
+        The primary key is appended as a tie-breaker so the ordering is total.
+        Nullable columns sort their NULLs last on every database backend.
+        """
+        opts = queryset.model._meta
+        names = list(queryset.query.order_by or opts.ordering)
+        if not any(name.lstrip("-") in ("pk", opts.pk.name) for name in names):
+            names.append(opts.pk.name)
+
+        ordering = []
+        for name in names:
+            if not isinstance(name, str):
+                raise ImproperlyConfigured(
+                    "KeysetPagination only supports orderings by field name."
+                )
+            descending = name.startswith("-")
+            field_name = name.lstrip("-")
+            try:
+                field = opts.pk if field_name == "pk" else opts.get_field(field_name)
+            except FieldDoesNotExist as exc:
+                raise ImproperlyConfigured(
+                    f"KeysetPagination cannot order by '{name}'."
+                ) from exc
+            expr = models.F(field.attname)
+            if descending:
+                expr = expr.desc(nulls_last=True) if field.null else expr.desc()
+            else:
+                expr = expr.asc(nulls_last=True) if field.null else expr.asc()
+            ordering.append((field, descending, expr))
+        return ordering
+
+    def _after(self, values: List[Any]) -> models.Q:
+        """Build the lexicographic "row comes after the cursor" predicate."""
+        condition = models.Q(pk__in=[])
+        equal_so_far = models.Q()
+        for (field, descending, _), value in zip(self.ordering, values):
+            name = field.attname
+            if value is None:
+                # NULLs sort last: nothing is strictly after a NULL, only ties.
+                equal_so_far &= models.Q(**{f"{name}__isnull": True})
+                continue
+            lookup = "lt" if descending else "gt"
+            greater = models.Q(**{f"{name}__{lookup}": value})
+            if field.null:
+                greater |= models.Q(**{f"{name}__isnull": True})
+            condition |= equal_so_far & greater
+            equal_so_far &= models.Q(**{name: value})
+        return condition
+
+    def encode_cursor(self, instance) -> str:
+        values = [
+            self._dump_value(field.value_from_object(instance))
+            for field, _, _ in self.ordering
+        ]
+        raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii")
+
+    def decode_cursor(self, encoded: str) -> List[Any]:
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+        except (binascii.Error, ValueError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            return [
+                None if value is None else field.to_python(value)
+                for (field, _, _), value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or not self.page:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.page_size_query_param, str(self.page_size))
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.page[-1])
+        )
+
+    @staticmethod
+    def _dump_value(value: Any) -> Any:
+        if isinstance(value, (datetime.date, datetime.time)):
+            return value.isoformat()
+        if isinstance(value, decimal.Decimal):
+            return str(value)
+        return value
@@ -0,0 +1,147 @@
+"""Ranked prefix search over ``GlossaryTerm.search_document``.
+
+PostgreSQL uses a GIN index on ``to_tsvector('simple', search_document)``
+(declared on the model, see ``exams.indexes``). SQLite, used for local
+development, gets an FTS5 shadow table kept in sync by triggers; it is
+(re)created after every ``migrate``. Other backends fall back to ``icontains``
+scans.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, List
+
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, models
+from django.db.models.expressions import RawSQL
+
+from .models import GlossaryTerm
+
+SEARCH_CONFIG = "simple"
+SQLITE_FTS_TABLE = "exams_glossaryterm_fts"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_sqlite_fts_ready: Dict[str, bool] = {}
+
+
+def search_tokens(query: str) -> List[str]:
+    return _TOKEN_RE.findall(query.casefold())
+
+
+def search_vector():
+    from django.contrib.postgres.search import SearchVector
+
+    return SearchVector("search_document", config=SEARCH_CONFIG)
+
+
+def search_glossary(queryset, query: str):
+    """Filter ``queryset`` to terms matching every word prefix in ``query``.
+
+    The result is annotated with ``search_rank`` (higher is better).
+    """
+    tokens = search_tokens(query)
+    if not tokens:
+        return queryset.annotate(
+            search_rank=models.Value(0.0, output_field=models.FloatField())
+        ).none()
+    vendor = connections[queryset.db].vendor
+    if vendor == "postgresql":
+        return _search_postgresql(queryset, tokens)
+    if vendor == "sqlite" and sqlite_fts_available(queryset.db):
+        return _search_sqlite(queryset, tokens)
+    return _search_icontains(queryset, query.strip())
+
+
+def _search_postgresql(queryset, tokens: List[str]):
+    from django.contrib.postgres.search import SearchQuery, SearchRank
+
+    ts_query = SearchQuery(
+        " & ".join(f"{token}:*" for token in tokens),
+        search_type="raw",
+        config=SEARCH_CONFIG,
+    )
+    vector = search_vector()
+    return queryset.annotate(
+        search=vector, search_rank=SearchRank(vector, ts_query)
+    ).filter(search=ts_query)
+
+
+def _search_sqlite(queryset, tokens: List[str]):
+    # Quoted tokens with a trailing "*" are FTS5 prefix queries; the implicit
+    # operator between them is AND.
+    match = " ".join(f'"{token}"*' for token in tokens)
+    table = GlossaryTerm._meta.db_table
+    matching_ids = RawSQL(
+        f"SELECT rowid FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH %s",
+        [match],
+    )
+    # bm25 ``rank`` is negative and lower is better, so flip its sign.
+    rank = RawSQL(
+        f"SELECT -rank FROM {SQLITE_FTS_TABLE} "
+        f'WHERE {SQLITE_FTS_TABLE} MATCH %s AND rowid = "{table}"."id"',
+        [match],
+        output_field=models.FloatField(),
+    )
+    return queryset.filter(pk__in=matching_ids).annotate(search_rank=rank)
+
+
+def _search_icontains(queryset, query: str):
+    return queryset.filter(
+        models.Q(term__icontains=query)
+        | models.Q(translation__icontains=query)
+        | models.Q(translation_en__icontains=query)
+        | models.Q(translation_ru__icontains=query)
+        | models.Q(translation_nb__icontains=query)
+        | models.Q(translation_nn__icontains=query)
+        | models.Q(explanation__icontains=query)
+    ).annotate(search_rank=models.Value(0.0, output_field=models.FloatField()))
+
+
+def sqlite_fts_available(using: str = DEFAULT_DB_ALIAS) -> bool:
+    if using not in _sqlite_fts_ready:
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+                [SQLITE_FTS_TABLE],
+            )
+            _sqlite_fts_ready[using] = cursor.fetchone() is not None
+    return _sqlite_fts_ready[using]
+
+
+def sync_sqlite_fts(using: str = DEFAULT_DB_ALIAS) -> None:
+    """Create the FTS5 shadow table and its triggers, then rebuild it."""
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    table = GlossaryTerm._meta.db_table
+    fts = SQLITE_FTS_TABLE
+    statements = [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"search_document, content='{table}', content_rowid='id')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, search_document) "
+        f"VALUES (new.id, new.search_document); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, search_document) "
+        f"VALUES ('delete', old.id, old.search_document); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, search_document) "
+        f"VALUES ('delete', old.id, old.search_document); "
+        f"INSERT INTO {fts}(rowid, search_document) "
+        f"VALUES (new.id, new.search_document); END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+    try:
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+    except OperationalError:
+        # SQLite built without FTS5: searches fall back to icontains.
+        _sqlite_fts_ready[using] = False
+    else:
+        _sqlite_fts_ready[using] = True
+
+
+def sync_search_index(sender, using=DEFAULT_DB_ALIAS, **kwargs) -> None:
+    """``post_migrate`` hook: table rebuilds during migrations drop triggers."""
+    sync_sqlite_fts(using)
@@ -73,6 +73,7 @@ class AnswerInputSerializer(serializers.Serializer):
 
 class SubmissionSerializer(serializers.ModelSerializer):
     percent = serializers.FloatField(read_only=True)
+    email = serializers.SerializerMethodField()
 
     class Meta:
         model = Submission
@@ -87,6 +88,9 @@ class SubmissionSerializer(serializers.ModelSerializer):
             "created_at",
         )
 
+    def get_email(self, obj) -> str:
+        return obj.student.email if obj.student_id else ""
+
 
 class AnswerSerializer(serializers.ModelSerializer):
     class Meta:
@@ -95,6 +99,8 @@ class AnswerSerializer(serializers.ModelSerializer):
 
 
 class AssignmentSerializer(serializers.ModelSerializer):
+    student_email = serializers.EmailField(source="student.email", read_only=True)
+
     class Meta:
         model = Assignment
         fields = ("id", "test", "student_email", "expires_at", "created_at")
@@ -113,7 +119,19 @@ class StudentProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ("teacher",)
 
 
+class AssignedToEmailField(serializers.EmailField):
+    """Email of the student the row is assigned to (``null`` for everyone)."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("source", "assigned_to.email")
+        kwargs.setdefault("read_only", True)
+        kwargs.setdefault("allow_null", True)
+        super().__init__(**kwargs)
+
+
 class MaterialSerializer(serializers.ModelSerializer):
+    assigned_to_email = AssignedToEmailField()
+
     class Meta:
         model = Material
         fields = (
@@ -133,6 +151,8 @@ class MaterialSerializer(serializers.ModelSerializer):
 
 
 class HomeworkSerializer(serializers.ModelSerializer):
+    assigned_to_email = AssignedToEmailField()
+
     class Meta:
         model = Homework
         fields = (
@@ -154,6 +174,8 @@ class HomeworkSerializer(serializers.ModelSerializer):
 
 
 class ExerciseSerializer(serializers.ModelSerializer):
+    assigned_to_email = AssignedToEmailField()
+
     class Meta:
         model = Exercise
         fields = (
@@ -248,6 +270,31 @@ class ReadingSerializer(serializers.ModelSerializer):
             "translation_ru",
             "tags",
             "is_published",
+            "word_count",
+            "reading_minutes",
             "created_at",
         )
         read_only_fields = ("is_published", "created_at")
+
+
+class ReadingSummarySerializer(serializers.ModelSerializer):
+    """Reading list entry without the body and translations."""
+
+    class Meta:
+        model = Reading
+        fields = (
+            "id",
+            "title",
+            "title_en",
+            "title_nb",
+            "title_nn",
+            "title_ru",
+            "slug",
+            "stream",
+            "level",
+            "tags",
+            "word_count",
+            "reading_minutes",
+            "created_at",
+        )
+        read_only_fields = fields
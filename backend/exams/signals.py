@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .caching import bump_content_version
+from .models import (
+    Assignment,
+    Exercise,
+    Expression,
+    GlossaryTerm,
+    Homework,
+    Material,
+    Option,
+    Question,
+    Reading,
+    StudentProfile,
+    Test,
+    VerbEntry,
+)
+from .utils.access import invalidate_access
+from .utils.answer_key import invalidate_answer_key
+from .utils.profiles import invalidate_profile
+
+# Models whose changes bump their content version (see exams.caching).
+CONTENT_MODELS = {
+    Assignment,
+    Exercise,
+    Expression,
+    GlossaryTerm,
+    Homework,
+    Material,
+    Option,
+    Question,
+    Reading,
+    Test,
+    VerbEntry,
+}
+
+
+def touch_test(test_id: int) -> None:
+    """Bump ``Test.updated_at`` so cached answer keys for the test go stale."""
+    Test.objects.filter(pk=test_id).update(updated_at=timezone.now())
+    invalidate_answer_key(test_id)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def question_changed(sender, instance: Question, **kwargs) -> None:
+    touch_test(instance.test_id)
+
+
+@receiver(post_save, sender=Option)
+@receiver(post_delete, sender=Option)
+def option_changed(sender, instance: Option, **kwargs) -> None:
+    test_id = (
+        Question.objects.filter(pk=instance.question_id)
+        .values_list("test_id", flat=True)
+        .first()
+    )
+    if test_id is not None:
+        touch_test(test_id)
+
+
+def content_changed(sender, **kwargs) -> None:
+    bump_content_version(sender)
+    # Bump again once the change is visible to other connections, so a
+    # response cached from pre-commit data is not kept under the new version.
+    transaction.on_commit(lambda: bump_content_version(sender))
+
+
+# Connected per model: a receiver without a sender would disable fast
+# deletes (e.g. of answers and submissions) for every model.
+for model in CONTENT_MODELS:
+    post_save.connect(content_changed, sender=model)
+    post_delete.connect(content_changed, sender=model)
+
+
+@receiver(post_save, sender=StudentProfile)
+@receiver(post_delete, sender=StudentProfile)
+def profile_changed(sender, instance: StudentProfile, **kwargs) -> None:
+    invalidate_profile(instance.email)
+    invalidate_access(instance.email)
+
+
+@receiver(post_save, sender=Assignment)
+@receiver(post_delete, sender=Assignment)
+def assignment_changed(sender, instance: Assignment, **kwargs) -> None:
+    email = (
+        StudentProfile.objects.filter(pk=instance.student_id)
+        .values_list("email", flat=True)
+        .first()
+    )
+    if email:
+        invalidate_access(email)
@@ -0,0 +1,135 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from exams.models import Assignment, StudentProfile, Test
+from exams.utils.access import allowed_test_ids, purge_expired_assignments
+
+
+class AllowedTestsCase(APITestCase):
+    def setUp(self):
+        caches["content"].clear()
+        self.student = StudentProfile.objects.create(email="ola@example.com")
+        self.test = Test.objects.create(
+            title="Restricted",
+            slug="restricted",
+            level=Test.Level.A1,
+            is_published=True,
+            is_restricted=True,
+        )
+
+    def catalog_slugs(self, email="ola@example.com"):
+        response = self.client.get(reverse("test-list"), {"student_email": email})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item["slug"] for item in response.data]
+
+    def test_cached_per_student(self):
+        Assignment.objects.create(test=self.test, student=self.student)
+        self.assertEqual(allowed_test_ids("Ola@Example.com"), {self.test.pk})
+        with self.assertNumQueries(0):
+            self.assertEqual(allowed_test_ids("ola@example.com"), {self.test.pk})
+        self.assertEqual(allowed_test_ids(""), frozenset())
+
+    def test_assignment_changes_invalidate(self):
+        self.assertNotIn("restricted", self.catalog_slugs())
+
+        assignment = Assignment.objects.create(test=self.test, student=self.student)
+        self.assertIn("restricted", self.catalog_slugs())
+
+        assignment.delete()
+        self.assertNotIn("restricted", self.catalog_slugs())
+
+    def test_expired_assignment_denies_access(self):
+        Assignment.objects.create(
+            test=self.test,
+            student=self.student,
+            expires_at=timezone.now() - timedelta(minutes=1),
+        )
+        self.assertNotIn("restricted", self.catalog_slugs())
+
+        url = reverse("test-submit", kwargs={"slug": self.test.slug})
+        response = self.client.post(
+            f"{url}?student_email=ola@example.com",
+            {"answers": [], "email": "ola@example.com"},
+            format="json",
+        )
+        # Restricted tests the student cannot see are not found at all.
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_catalog_drops_test_when_assignment_expires(self):
+        expires_at = timezone.now() + timedelta(hours=1)
+        Assignment.objects.create(
+            test=self.test, student=self.student, expires_at=expires_at
+        )
+        self.assertIn("restricted", self.catalog_slugs())
+        with mock.patch(
+            "django.utils.timezone.now", return_value=expires_at + timedelta(seconds=1)
+        ):
+            self.assertNotIn("restricted", self.catalog_slugs())
+
+    def test_cache_ends_at_next_expiry(self):
+        assignment = Assignment.objects.create(
+            test=self.test,
+            student=self.student,
+            expires_at=timezone.now() + timedelta(hours=1),
+        )
+        self.assertEqual(allowed_test_ids("ola@example.com"), {self.test.pk})
+
+        # Expire it behind the cache's back (bulk updates skip the signals).
+        Assignment.objects.filter(pk=assignment.pk).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertEqual(allowed_test_ids("ola@example.com"), {self.test.pk})
+        caches["content"].set(
+            "exams:access:ola@example.com",
+            ([self.test.pk], timezone.now() - timedelta(seconds=1)),
+        )
+        self.assertEqual(allowed_test_ids("ola@example.com"), frozenset())
+
+
+class PurgeExpiredCase(APITestCase):
+    def setUp(self):
+        caches["content"].clear()
+        student = StudentProfile.objects.create(email="ola@example.com")
+        now = timezone.now()
+        for number, expires_at in enumerate(
+            [now - timedelta(days=2), now - timedelta(minutes=1), now, None]
+        ):
+            test = Test.objects.create(
+                title=f"Test {number}", slug=f"test-{number}", is_restricted=True
+            )
+            Assignment.objects.create(test=test, student=student, expires_at=expires_at)
+        self.live = Assignment.objects.filter(test__slug="test-3")
+
+    def test_dry_run_only_counts(self):
+        out = StringIO()
+        call_command("purge_expired_assignments", dry_run=True, stdout=out)
+        self.assertIn("3 expired assignments would be deleted", out.getvalue())
+        self.assertEqual(Assignment.objects.count(), 4)
+
+    def test_deletes_in_batches(self):
+        out = StringIO()
+        call_command("purge_expired_assignments", batch_size=2, stdout=out)
+        self.assertIn("  2 deleted...\n  3 deleted...", out.getvalue())
+        self.assertIn("Deleted 3 expired assignments", out.getvalue())
+        self.assertQuerySetEqual(Assignment.objects.all(), self.live)
+
+    def test_queries_per_batch_do_not_grow_with_rows(self):
+        # Per batch: savepoint, locking SELECT, DELETE, release; plus the
+        # final empty SELECT in its own savepoint.
+        with self.assertNumQueries(2 * 4 + 3):
+            purge_expired_assignments(batch_size=2)
+        self.assertQuerySetEqual(Assignment.objects.all(), self.live)
+
+    def test_invalidates_access_of_affected_students(self):
+        purged = Test.objects.get(slug="test-0")
+        caches["content"].set("exams:access:ola@example.com", ([purged.pk], None))
+        call_command("purge_expired_assignments", stdout=StringIO())
+        self.assertEqual(allowed_test_ids("ola@example.com"), {self.live.get().test_id})
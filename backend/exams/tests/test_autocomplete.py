@@ -0,0 +1,59 @@
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from exams.models import Expression, GlossaryTerm, VerbEntry
+from exams.utils.autocomplete import fold
+
+
+class FoldCase(SimpleTestCase):
+    def test_fold_handles_norwegian_letters_and_accents(self):
+        self.assertEqual(fold("Å  GJØRE"), "a gjore")
+        self.assertEqual(fold("Smørbrød"), "smorbrod")
+        self.assertEqual(fold("Kafé"), "kafe")
+        self.assertEqual(fold("Ærlig"), "aerlig")
+
+
+class AutocompleteCase(APITestCase):
+    def setUp(self):
+        GlossaryTerm.objects.all().delete()
+        Expression.objects.all().delete()
+        GlossaryTerm.objects.create(term="Ærlig", stream="bokmaal")
+        VerbEntry.objects.create(
+            verb="å lese",
+            stream="bokmaal",
+            infinitive="å lese",
+            present="leser",
+            past="leste",
+            perfect="har lest",
+        )
+        Expression.objects.create(phrase="Ha det bra", stream="nynorsk")
+
+    def suggest(self, **params):
+        response = self.client.get(reverse("autocomplete-list"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(item["kind"], item["text"]) for item in response.data]
+
+    def test_matches_word_starts_and_forms_without_diacritics(self):
+        self.assertEqual(self.suggest(q="aer"), [("glossary", "Ærlig")])
+        self.assertEqual(self.suggest(q="les"), [("verb", "å lese")])
+        self.assertEqual(self.suggest(q="lest"), [("verb", "å lese")])
+        self.assertEqual(self.suggest(q="det"), [("expression", "Ha det bra")])
+
+    def test_filters_by_stream_and_kind(self):
+        self.assertEqual(self.suggest(q="det", stream="bokmaal"), [])
+        self.assertEqual(self.suggest(q="a", kind="verb"), [("verb", "å lese")])
+
+    def test_lookups_skip_the_database_until_content_changes(self):
+        self.suggest(q="a")
+        with self.assertNumQueries(0):
+            self.suggest(q="ha")
+        GlossaryTerm.objects.create(term="hage", stream="bokmaal")
+        self.assertIn(("glossary", "hage"), self.suggest(q="ha"))
+
+    def test_unknown_kind_is_rejected(self):
+        response = self.client.get(
+            reverse("autocomplete-list"), {"q": "a", "kind": "x"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,52 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from exams.models import Option, Question, Test
+
+
+class TestCatalogCase(APITestCase):
+    def _create_test(self, slug, question_types):
+        test = Test.objects.create(
+            title=slug.title(),
+            slug=slug,
+            level=Test.Level.A1,
+            is_published=True,
+        )
+        for order, question_type in enumerate(question_types, start=1):
+            question = Question.objects.create(
+                test=test,
+                text=f"Question {order}",
+                question_type=question_type,
+                order=order,
+            )
+            Option.objects.create(question=question, text="ja", is_correct=True)
+        return test
+
+    def test_catalog_reports_question_stats(self):
+        single = Question.QuestionType.SINGLE_CHOICE
+        fill = Question.QuestionType.FILL_IN
+        self._create_test("only-single", [single, single])
+        self._create_test("mixed", [single, fill, fill])
+        self._create_test("empty", [])
+
+        response = self.client.get(reverse("test-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        by_slug = {item["slug"]: item for item in response.data}
+        self.assertEqual(by_slug["only-single"]["question_count"], 2)
+        self.assertEqual(by_slug["only-single"]["question_mode"], single)
+        self.assertEqual(by_slug["mixed"]["question_count"], 3)
+        self.assertEqual(by_slug["mixed"]["question_mode"], "mixed")
+        self.assertEqual(by_slug["empty"]["question_count"], 0)
+        self.assertEqual(by_slug["empty"]["question_mode"], "mixed")
+
+    def test_catalog_query_count_does_not_grow_with_tests(self):
+        single = Question.QuestionType.SINGLE_CHOICE
+        for idx in range(5):
+            self._create_test(f"test-{idx}", [single, single])
+
+        # ETag validator + the annotated catalog query.
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("test-list"))
+        self.assertEqual(len(response.data), 5)
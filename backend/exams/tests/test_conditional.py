@@ -0,0 +1,59 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from exams.models import Option, Question, Reading, Test
+
+
+class ConditionalGetCase(APITestCase):
+    def setUp(self):
+        Reading.objects.all().delete()
+        self.reading = Reading.objects.create(title="Hytta", slug="hytta", body="Tekst")
+
+    def test_list_returns_304_until_content_changes(self):
+        url = reverse("readings-list")
+        first = self.client.get(url)
+        etag = first["ETag"]
+        self.assertTrue(first.has_header("Last-Modified"))
+
+        with self.assertNumQueries(1):
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(cached["ETag"], etag)
+
+        self.reading.body = "Ny tekst"
+        self.reading.save()
+        fresh = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(fresh.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(fresh["ETag"], etag)
+
+    def test_etag_depends_on_query_parameters(self):
+        url = reverse("readings-list")
+        etag = self.client.get(url)["ETag"]
+        other = self.client.get(url, {"level": "A1"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(other.status_code, status.HTTP_200_OK)
+
+    def test_retrieve_revalidates_and_missing_objects_404(self):
+        url = reverse("readings-detail", kwargs={"slug": "hytta"})
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        missing = self.client.get(reverse("readings-detail", kwargs={"slug": "nei"}))
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_malformed_pk_is_not_found(self):
+        response = self.client.get(reverse("materials-detail", kwargs={"pk": "abc"}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_test_detail_changes_when_options_change(self):
+        test = Test.objects.create(
+            title="Demo", slug="demo", level=Test.Level.A1, is_published=True
+        )
+        question = Question.objects.create(test=test, text="?")
+        option = Option.objects.create(question=question, text="ja")
+        url = reverse("test-detail", kwargs={"slug": "demo"})
+        etag = self.client.get(url)["ETag"]
+        option.text = "nei"
+        option.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,173 @@
+import gzip
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from exams.content_dump import FORMAT, VERSION, load_dump, read_records, write_dump
+from exams.models import (
+    Answer,
+    GlossaryTerm,
+    Option,
+    Question,
+    Reading,
+    Submission,
+    Test,
+    VerbEntry,
+)
+
+
+class ContentDumpTests(TestCase):
+    def setUp(self):
+        self.test = Test.objects.create(
+            title="Demo test", slug="demo-test", level=Test.Level.A1, is_published=True
+        )
+        self.question = Question.objects.create(
+            test=self.test,
+            text="Velg rett ord",
+            question_type=Question.QuestionType.SINGLE_CHOICE,
+        )
+        self.correct = Option.objects.create(
+            question=self.question, text="riktig", is_correct=True
+        )
+        Option.objects.create(question=self.question, text="feil", is_correct=False)
+        Reading.objects.create(
+            title="Hei", slug="hei", level=Test.Level.A1, body="Jeg heter Ola."
+        )
+        GlossaryTerm.objects.create(term="hus", translation="house", tags=["home"])
+        VerbEntry.objects.create(verb="lese", infinitive="å lese", present="leser")
+
+    def dump(self, **kwargs):
+        buffer = io.BytesIO()
+        counts = write_dump(buffer, **kwargs)
+        buffer.seek(0)
+        return buffer, counts
+
+    def rewrite(self, buffer, edit):
+        """Re-pack the records of ``buffer`` after passing them through ``edit``."""
+        records = edit(list(read_records(buffer)))
+        out = io.BytesIO()
+        with gzip.open(out, "wt", encoding="utf-8") as stream:
+            for record in [{"format": FORMAT, "version": VERSION}, *records]:
+                stream.write(json.dumps(record) + "\n")
+        out.seek(0)
+        return out
+
+    def test_round_trip_into_empty_database(self):
+        buffer, counts = self.dump()
+        self.assertEqual(counts["tests"], 1)
+        self.assertEqual(counts["readings"], Reading.objects.count())
+        self.assertEqual(counts["glossary"], GlossaryTerm.objects.count())
+        Test.objects.all().delete()
+        Reading.objects.all().delete()
+        GlossaryTerm.objects.all().delete()
+        VerbEntry.objects.all().delete()
+
+        results = load_dump(buffer)
+
+        self.assertEqual(results["tests"].created, 1)
+        self.assertEqual(results["readings"].created, counts["readings"])
+        test = Test.objects.get(slug="demo-test")
+        self.assertEqual(
+            [
+                (o.text, o.is_correct)
+                for o in Option.objects.filter(question__test=test)
+            ],
+            [("riktig", True), ("feil", False)],
+        )
+        self.assertEqual(Reading.objects.get(slug="hei").word_count, 3)
+        self.assertEqual(GlossaryTerm.objects.get(term="hus").tags, ["home"])
+        self.assertEqual(VerbEntry.objects.get(verb="lese").present, "leser")
+
+    def test_reload_keeps_ids_and_only_touches_changed_tests(self):
+        buffer, _ = self.dump()
+        before = Test.objects.get(pk=self.test.pk).updated_at
+        results = load_dump(buffer)
+        self.assertEqual(results["tests"].unchanged, 1)
+        self.assertEqual(results["verbs"].unchanged, 1)
+        self.assertEqual(Test.objects.get(pk=self.test.pk).updated_at, before)
+
+        buffer, _ = self.dump()
+        self.correct.text = "endret"
+        self.correct.save()
+        Option.objects.create(question=self.question, text="ekstra")
+        load_dump(buffer)
+
+        options = list(self.question.options.all())
+        self.assertEqual([o.text for o in options], ["riktig", "feil"])
+        self.assertEqual(options[0].pk, self.correct.pk)
+        self.assertGreater(Test.objects.get(pk=self.test.pk).updated_at, before)
+
+    def test_questions_are_matched_by_order(self):
+        self.question.order = 1
+        self.question.save()
+        second = Question.objects.create(test=self.test, text="Andre", order=2)
+
+        def reverse(records):
+            records[0]["questions"].reverse()
+            records[0]["questions"][0]["text"] = "Andre (endret)"
+            return records
+
+        load_dump(self.rewrite(self.dump(content_types=["tests"])[0], reverse))
+
+        self.assertEqual(
+            list(self.test.questions.values_list("pk", "text")),
+            [(self.question.pk, "Velg rett ord"), (second.pk, "Andre (endret)")],
+        )
+        self.assertEqual(self.question.options.count(), 2)
+
+    def test_refuses_to_delete_answered_questions(self):
+        submission = Submission.objects.create(test=self.test)
+        Answer.objects.create(
+            submission=submission, question=self.question, selected_option=self.correct
+        )
+
+        def drop_questions(records):
+            records[0]["questions"] = []
+            return records
+
+        with self.assertRaises(ValueError):
+            load_dump(
+                self.rewrite(self.dump(content_types=["tests"])[0], drop_questions)
+            )
+        self.assertTrue(Answer.objects.filter(question=self.question).exists())
+        self.assertEqual(self.question.options.count(), 2)
+
+    def test_split_runs_of_one_type_are_all_loaded(self):
+        VerbEntry.objects.create(verb="skrive", infinitive="å skrive")
+
+        def interleave(records):
+            verbs = [r for r in records if r["model"] == "verbs"]
+            rest = [r for r in records if r["model"] != "verbs"]
+            return [verbs[0], *rest, *verbs[1:]]
+
+        buffer = self.rewrite(self.dump()[0], interleave)
+        VerbEntry.objects.all().delete()
+
+        results = load_dump(buffer)
+
+        self.assertEqual(results["verbs"].created, 2)
+        self.assertEqual(VerbEntry.objects.count(), 2)
+
+    def test_rejects_files_that_are_not_dumps(self):
+        other = io.BytesIO()
+        with gzip.open(other, "wt") as stream:
+            stream.write('{"format": "other"}\n')
+        other.seek(0)
+        with self.assertRaises(ValueError):
+            load_dump(other)
+
+    def test_commands_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "content.ndjson.gz")
+            out = io.StringIO()
+            call_command("dump_content", output=path, only="verbs", stdout=out)
+            self.assertIn("verbs: 1", out.getvalue())
+            VerbEntry.objects.all().delete()
+            out = io.StringIO()
+            call_command("load_content", path, stdout=out)
+        self.assertIn("verbs: created 1", out.getvalue())
+        self.assertTrue(VerbEntry.objects.filter(verb="lese").exists())
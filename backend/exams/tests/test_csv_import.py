@@ -0,0 +1,305 @@
+import csv
+import io
+import tempfile
+
+from django.contrib.auth.models import Permission, User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from exams.caching import content_versions
+from exams.jobs import claim_next_job, enqueue_export, run_job
+from exams.models import CsvJob, Expression, GlossaryTerm, Reading, VerbEntry
+from exams.utils.glossary_csv import import_glossary_from_reader
+from exams.utils.reading_csv import import_readings_from_reader
+from exams.utils.verb_csv import CSV_HEADER, import_verbs_from_reader
+
+
+def verb_row(verb, stream="bokmaal", **overrides):
+    row = {column: "" for column in CSV_HEADER}
+    row.update(
+        verb=verb,
+        stream=stream,
+        infinitive=verb,
+        present=f"{verb}r",
+        past="-",
+        perfect="-",
+    )
+    row.update(overrides)
+    return row
+
+
+def csv_reader(rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_HEADER)
+    writer.writeheader()
+    writer.writerows(rows)
+    buffer.seek(0)
+    return csv.DictReader(buffer)
+
+
+class VerbImportCase(TestCase):
+    def setUp(self):
+        VerbEntry.objects.all().delete()
+
+    def test_import_creates_updates_and_skips(self):
+        VerbEntry.objects.create(
+            verb="lese",
+            stream="bokmaal",
+            infinitive="-",
+            present="-",
+            past="-",
+            perfect="-",
+        )
+        rows = [
+            verb_row("lese", tags="a;b"),
+            verb_row("skrive"),
+            verb_row("skrive", translation_en="write"),
+            verb_row("snakke", stream="klingon"),
+        ]
+        stats = import_verbs_from_reader(csv_reader(rows), update=True, batch_size=2)
+
+        self.assertEqual((stats.created, stats.updated, stats.skipped), (1, 2, 1))
+        self.assertGreaterEqual(stats.duration, 0)
+        lese = VerbEntry.objects.get(verb="lese")
+        self.assertEqual(lese.present, "leser")
+        self.assertEqual(lese.tags, ["a", "b"])
+        self.assertEqual(VerbEntry.objects.get(verb="skrive").translation_en, "write")
+
+    def test_dry_run_reports_diff_without_writing(self):
+        VerbEntry.objects.create(
+            verb="lese",
+            stream="bokmaal",
+            infinitive="lese",
+            present="leser",
+            past="-",
+            perfect="-",
+        )
+        VerbEntry.objects.create(
+            verb="gå",
+            stream="bokmaal",
+            infinitive="gå",
+            present="går",
+            past="-",
+            perfect="-",
+        )
+        rows = [
+            verb_row("lese"),
+            verb_row("gå", present="går nå"),
+            verb_row("skrive"),
+            verb_row("skrive", translation_en="write"),
+            verb_row("snakke", stream="klingon"),
+        ]
+        # Read-only: one key lookup for the first batch; the second batch only
+        # repeats a key the dry run already planned.
+        with self.assertNumQueries(1):
+            stats = import_verbs_from_reader(
+                csv_reader(rows), update=True, dry_run=True, batch_size=3
+            )
+
+        self.assertEqual(
+            (stats.created, stats.updated, stats.unchanged, stats.skipped),
+            (1, 2, 1, 1),
+        )
+        by_row = {change["row"]: change for change in stats.changes}
+        self.assertEqual(by_row[2]["fields"], ["present"])
+        self.assertEqual(by_row[3]["action"], "create")
+        self.assertEqual(by_row[4]["action"], "update")
+        self.assertEqual(by_row[5]["reason"], "unknown stream 'klingon'")
+        self.assertFalse(VerbEntry.objects.filter(verb="skrive").exists())
+
+    def test_query_count_does_not_grow_with_rows(self):
+        rows = [verb_row(f"verb{idx}") for idx in range(40)]
+        # Savepoint pair, key preload and one bulk insert.
+        with self.assertNumQueries(4):
+            stats = import_verbs_from_reader(csv_reader(rows))
+        self.assertEqual(stats.created, 40)
+
+        with self.assertNumQueries(3):
+            stats = import_verbs_from_reader(csv_reader(rows))
+        self.assertEqual(stats.unchanged, 40)
+
+    def test_content_version_is_bumped_on_commit(self):
+        before = content_versions(VerbEntry)
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                import_verbs_from_reader(csv_reader([verb_row("lese")]))
+                self.assertEqual(content_versions(VerbEntry), before)
+        self.assertNotEqual(content_versions(VerbEntry), before)
+
+
+class ContentImportCase(TestCase):
+    def test_glossary_upsert_keeps_legacy_translation(self):
+        GlossaryTerm.objects.create(term="hus", translation="old")
+        rows = [
+            {"term": "hus", "translation": "house"},
+            {"term": "bil", "translation_nb": "bil", "level": "a2"},
+            {"term": ""},
+        ]
+        stats = import_glossary_from_reader(rows, update=True)
+
+        self.assertEqual((stats.created, stats.updated, stats.skipped), (1, 1, 1))
+        house = GlossaryTerm.objects.get(term="hus")
+        self.assertEqual(house.translation_en, "house")
+        bil = GlossaryTerm.objects.get(term="bil")
+        self.assertEqual((bil.level, bil.translation), ("A2", "bil"))
+
+    def test_reading_import_computes_reading_stats(self):
+        rows = [{"title": "Ny dag", "body": "ord " * 130, "stream": "nynorsk"}]
+        import_readings_from_reader(rows)
+        reading = Reading.objects.get(slug="ny-dag")
+        self.assertEqual((reading.word_count, reading.reading_minutes), (130, 2))
+        self.assertEqual(reading.title_nn, "Ny dag")
+
+        rows[0]["body"] = "ord"
+        stats = import_readings_from_reader(rows, update=True)
+        self.assertEqual(stats.updated, 1)
+        reading.refresh_from_db()
+        self.assertEqual((reading.word_count, reading.reading_minutes), (1, 1))
+
+
+class CsvExportCase(TestCase):
+    def setUp(self):
+        self.client.force_login(
+            User.objects.create_superuser("admin", "admin@example.com", "pw")
+        )
+
+    def test_verb_export_streams_and_round_trips(self):
+        VerbEntry.objects.all().delete()
+        VerbEntry.objects.create(
+            verb="lese",
+            infinitive="å lese",
+            present="leser",
+            past="leste",
+            perfect="har lest",
+            examples_present="Jeg leser.\nHun leser.",
+            tags=["a1", "vanlig"],
+        )
+        response = self.client.get(reverse("admin:exams_verbentry_export_csv"))
+
+        self.assertTrue(response.streaming)
+        content = b"".join(response.streaming_content).decode("utf-8")
+        self.assertTrue(content.startswith("\ufeff"))
+        rows = list(csv.DictReader(io.StringIO(content.lstrip("\ufeff"))))
+        self.assertEqual(rows[0]["examples_present"], "Jeg leser. | Hun leser.")
+        self.assertEqual(rows[0]["tags"], "a1;vanlig")
+
+        stats = import_verbs_from_reader(
+            csv.DictReader(io.StringIO(content.lstrip("\ufeff"))), update=True
+        )
+        # An export re-imports as a no-op.
+        self.assertEqual((stats.unchanged, stats.updated), (1, 0))
+        entry = VerbEntry.objects.get()
+        self.assertEqual(entry.examples_present, "Jeg leser.\nHun leser.")
+
+    def test_reading_export_streams(self):
+        Reading.objects.all().delete()
+        Reading.objects.create(title="Dag", slug="dag", body="tekst", tags=["x"])
+        response = self.client.get(reverse("admin:exams_reading_export_csv"))
+        content = b"".join(response.streaming_content).decode("utf-8")
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(
+            (rows[0]["slug"], rows[0]["tags"], rows[0]["is_published"]),
+            ("dag", "x", "1"),
+        )
+
+    def test_import_view_streams_upload_with_bom(self):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=CSV_HEADER)
+        writer.writeheader()
+        writer.writerow(verb_row("svømme"))
+        upload = SimpleUploadedFile(
+            "verbs.csv", ("\ufeff" + buffer.getvalue()).encode("utf-8")
+        )
+        response = self.client.post(
+            reverse("admin:exams_verbentry_import_csv"), {"csv_file": upload}
+        )
+        self.assertRedirects(response, reverse("admin:exams_verbentry_changelist"))
+        self.assertTrue(VerbEntry.objects.filter(verb="svømme").exists())
+
+    def test_import_view_rejects_non_utf8_upload(self):
+        upload = SimpleUploadedFile("glossary.csv", "term\nsvømme\n".encode("latin-1"))
+        response = self.client.post(
+            reverse("admin:exams_glossaryterm_import_csv"), {"csv_file": upload}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "File must be UTF-8 encoded.")
+        self.assertFalse(GlossaryTerm.objects.filter(term__startswith="sv").exists())
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class CsvJobCase(TestCase):
+    def setUp(self):
+        self.client.force_login(
+            User.objects.create_superuser("admin", "admin@example.com", "pw")
+        )
+        GlossaryTerm.objects.all().delete()
+
+    def test_background_import_records_progress_and_row_errors(self):
+        upload = SimpleUploadedFile(
+            "expressions.csv",
+            "phrase,stream\nGod morgen,bokmaal\nHei,klingon\nHallo,\n".encode(),
+        )
+        response = self.client.post(
+            reverse("admin:exams_expression_import_csv"),
+            {"csv_file": upload, "run_in_background": "on"},
+        )
+        job = CsvJob.objects.get()
+        self.assertRedirects(
+            response, reverse("admin:exams_csvjob_change", args=[job.pk])
+        )
+        self.assertEqual(job.status, CsvJob.Status.QUEUED)
+
+        call_command("run_jobs", "--once", stdout=io.StringIO())
+
+        status = self.client.get(reverse("admin:exams_csvjob_status", args=[job.pk]))
+        self.assertEqual(status.json()["status"], CsvJob.Status.DONE)
+        self.assertEqual((status.json()["processed"], status.json()["created"]), (3, 2))
+        self.assertEqual(status.json()["errors"][0]["row"], 2)
+        self.assertTrue(Expression.objects.filter(phrase="Hallo").exists())
+
+    def test_background_export_produces_download(self):
+        GlossaryTerm.objects.create(term="hus", translation_en="house")
+        self.client.get(
+            reverse("admin:exams_glossaryterm_export_csv"), {"background": 1}
+        )
+        job = run_job(claim_next_job())
+
+        self.assertEqual((job.status, job.processed), (CsvJob.Status.DONE, 1))
+        self.assertIsNone(claim_next_job())
+        response = self.client.get(
+            reverse("admin:exams_csvjob_download", args=[job.pk])
+        )
+        content = b"".join(response.streaming_content).decode("utf-8")
+        self.assertIn("hus,house", content)
+
+    def test_job_views_are_limited_to_permitted_authors(self):
+        job = enqueue_export("glossary", user=User.objects.get(username="admin"))
+        url = reverse("admin:exams_csvjob_status", args=[job.pk])
+        staff = User.objects.create_user("teacher", password="pw", is_staff=True)
+        self.client.force_login(staff)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        staff.user_permissions.add(Permission.objects.get(codename="view_csvjob"))
+        self.assertEqual(self.client.get(url).status_code, 404)
+        own = enqueue_export("glossary", user=staff)
+        response = self.client.get(reverse("admin:exams_csvjob_status", args=[own.pk]))
+        self.assertEqual(response.json()["id"], own.pk)
+
+    def test_import_view_dry_run_renders_report(self):
+        GlossaryTerm.objects.create(term="hus", translation="house")
+        upload = SimpleUploadedFile(
+            "glossary.csv", "term,translation\nhus,home\nbil,car\n".encode()
+        )
+        response = self.client.post(
+            reverse("admin:exams_glossaryterm_import_csv"),
+            {"csv_file": upload, "update_existing": "on", "dry_run": "on"},
+        )
+        self.assertEqual(response.status_code, 200)
+        report = response.context["report"]
+        self.assertEqual((report.created, report.updated), (1, 1))
+        self.assertContains(response, "Dry run: nothing was saved")
+        self.assertEqual(GlossaryTerm.objects.get(term="hus").translation, "house")
+        self.assertFalse(GlossaryTerm.objects.filter(term="bil").exists())
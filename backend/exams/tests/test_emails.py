@@ -0,0 +1,50 @@
+from importlib import import_module
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+
+from exams.models import StudentProfile
+
+normalize_profiles = import_module(
+    "exams.migrations.0030_lowercase_emails"
+).normalize_profiles
+
+
+class LowercaseEmailFieldTests(TestCase):
+    def test_writes_and_lookups_are_normalized(self):
+        profile = StudentProfile.objects.create(email=" Ola@Example.COM ")
+        self.assertEqual(profile.email, "ola@example.com")
+        StudentProfile.objects.bulk_create([StudentProfile(email="Kari@X.no")])
+        StudentProfile.objects.filter(pk=profile.pk).update(email="Per@X.no")
+
+        self.assertEqual(
+            list(StudentProfile.objects.values_list("email", flat=True)),
+            ["kari@x.no", "per@x.no"],
+        )
+        self.assertTrue(StudentProfile.objects.filter(email="PER@x.no").exists())
+        self.assertTrue(StudentProfile.objects.filter(email__in=["KARI@X.NO"]).exists())
+
+    def test_migration_merges_profiles_differing_in_case(self):
+        user = User.objects.create_user("ola")
+        kept = StudentProfile.objects.create(email="ola@example.com")
+        StudentProfile.objects.create(email="kari@example.com")
+        with connection.cursor() as cursor:
+            # Rows written before the field normalized on save.
+            cursor.execute(
+                "INSERT INTO exams_studentprofile (email, stream, level, "
+                "allow_stream_change, user_id, created_at, updated_at) VALUES "
+                "('Ola@Example.com', 'bokmaal', 'A1', 1, %s, %s, %s)",
+                [user.pk, kept.created_at, kept.created_at],
+            )
+            cursor.execute(
+                "UPDATE exams_studentprofile SET email = 'KARI@example.com ' "
+                "WHERE email = 'kari@example.com'"
+            )
+
+        normalize_profiles(StudentProfile)
+
+        self.assertEqual(
+            list(StudentProfile.objects.values_list("email", "user_id")),
+            [("kari@example.com", None), ("ola@example.com", user.pk)],
+        )
@@ -0,0 +1,58 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from exams.models import GlossaryTerm
+from exams.search import search_glossary
+
+
+class GlossarySearchCase(APITestCase):
+    def setUp(self):
+        GlossaryTerm.objects.all().delete()
+        GlossaryTerm.objects.create(term="å gå", translation_en="to walk")
+        GlossaryTerm.objects.create(term="gåte", translation_en="riddle")
+        GlossaryTerm.objects.create(
+            term="bil", translation_en="car", explanation="Kjøretøy med fire hjul"
+        )
+
+    def search(self, query):
+        response = self.client.get(reverse("glossary-list"), {"q": query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item["term"] for item in response.data]
+
+    def test_prefix_matches_across_columns(self):
+        self.assertCountEqual(self.search("gå"), ["å gå", "gåte"])
+        self.assertEqual(self.search("wal"), ["å gå"])
+        self.assertEqual(self.search("kjøre"), ["bil"])
+
+    def test_all_words_must_match(self):
+        self.assertEqual(self.search("fire hjul"), ["bil"])
+        self.assertEqual(self.search("fire riddle"), [])
+
+    def test_index_follows_updates_and_deletes(self):
+        term = GlossaryTerm.objects.get(term="bil")
+        term.translation_en = "automobile"
+        term.save()
+        self.assertEqual(self.search("auto"), ["bil"])
+        self.assertEqual(self.search("car"), [])
+        term.delete()
+        self.assertEqual(self.search("auto"), [])
+
+    def test_punctuation_only_query_returns_nothing(self):
+        self.assertEqual(self.search('"*'), [])
+
+    @skipUnless(connection.vendor == "postgresql", "tsvector search")
+    def test_postgres_search_uses_gin_index(self):
+        sql, params = (
+            search_glossary(GlossaryTerm.objects.all(), "gå")
+            .values("pk")
+            .query.sql_with_params()
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN {sql}", params)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        self.assertIn("exams_glossary_search_gin", plan)
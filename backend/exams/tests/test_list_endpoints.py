@@ -0,0 +1,152 @@
+from datetime import timedelta
+
+from django.db.models import ProtectedError
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from exams.models import Homework, Material, Reading, StudentProfile, VerbEntry
+
+
+class KeysetPaginationCase(APITestCase):
+    def _collect(self, url, params):
+        items = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            items.extend(response.data["results"])
+            if not response.data["next"]:
+                return items
+            response = self.client.get(response.data["next"])
+
+    def test_lists_stay_unpaginated_without_opt_in(self):
+        VerbEntry.objects.create(
+            verb="å lese",
+            infinitive="å lese",
+            present="leser",
+            past="leste",
+            perfect="har lest",
+        )
+        response = self.client.get(reverse("verbs-list"))
+        self.assertIsInstance(response.data, list)
+
+    def test_pages_cover_ordering_with_duplicates(self):
+        for idx in range(7):
+            VerbEntry.objects.create(
+                verb=f"verb {idx % 3}",
+                infinitive="-",
+                present="-",
+                past="-",
+                perfect="-",
+            )
+        expected = list(
+            VerbEntry.objects.order_by("verb", "id").values_list("id", flat=True)
+        )
+        items = self._collect(reverse("verbs-list"), {"page_size": 2})
+        self.assertEqual([item["id"] for item in items], expected)
+
+    def test_pages_handle_nullable_ordering_fields(self):
+        now = timezone.now()
+        for idx in range(3):
+            Homework.objects.create(
+                title=f"Due {idx}", instructions="-", due_date=now + timedelta(days=idx)
+            )
+            Homework.objects.create(title=f"Open {idx}", instructions="-")
+        items = self._collect(reverse("homework-list"), {"page_size": 2})
+        titles = [item["title"] for item in items]
+        self.assertEqual(titles[:3], ["Due 2", "Due 1", "Due 0"])
+        self.assertEqual(sorted(titles[3:]), ["Open 0", "Open 1", "Open 2"])
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(reverse("verbs-list"), {"cursor": "garbage"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class FieldProjectionCase(APITestCase):
+    def setUp(self):
+        # Drop the readings seeded by data migrations.
+        Reading.objects.all().delete()
+        Reading.objects.create(
+            title="På butikken", slug="pa-butikken", body="Lang tekst " * 50
+        )
+
+    def test_fields_limit_payload_and_columns(self):
+        with self.assertNumQueries(2) as ctx:
+            response = self.client.get(
+                reverse("readings-list"), {"fields": "title,slug"}
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data, [{"title": "På butikken", "slug": "pa-butikken"}]
+        )
+        self.assertNotIn('"body"', ctx.captured_queries[-1]["sql"])
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get(reverse("readings-list"), {"fields": "nope"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class AssignedContentCase(APITestCase):
+    def setUp(self):
+        ola = StudentProfile.objects.create(email="ola@example.com")
+        Material.objects.create(title="For alle")
+        Material.objects.create(title="For Ola", assigned_to=ola)
+
+    def test_assigned_rows_are_keyed_by_student_but_shown_by_email(self):
+        url = reverse("materials-list")
+        response = self.client.get(url, {"student_email": "Ola@Example.com"})
+        self.assertEqual(
+            [(item["title"], item["assigned_to_email"]) for item in response.data],
+            [("For Ola", "ola@example.com"), ("For alle", None)],
+        )
+        response = self.client.get(url, {"student_email": "kari@example.com"})
+        self.assertEqual([item["title"] for item in response.data], ["For alle"])
+
+    def test_deleting_a_student_keeps_assigned_content(self):
+        with self.assertRaises(ProtectedError):
+            StudentProfile.objects.get(email="ola@example.com").delete()
+        self.assertTrue(Material.objects.filter(title="For Ola").exists())
+
+    def test_projected_email_is_read_with_the_rows(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                reverse("materials-list"),
+                {
+                    "fields": "title,assigned_to_email",
+                    "student_email": "ola@example.com",
+                },
+            )
+        self.assertEqual(
+            response.data[0],
+            {"title": "For Ola", "assigned_to_email": "ola@example.com"},
+        )
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("materials-list"), {"fields": "title"})
+        self.assertEqual(response.data, [{"title": "For Ola"}, {"title": "For alle"}])
+
+
+class ReadingSummaryCase(APITestCase):
+    def setUp(self):
+        Reading.objects.all().delete()
+        self.reading = Reading.objects.create(
+            title="Morgen", slug="morgen", body="ord " * 250, translation_en="word"
+        )
+
+    def test_word_count_is_computed_on_save(self):
+        self.assertEqual(self.reading.word_count, 250)
+        self.assertEqual(self.reading.reading_minutes, 3)
+
+    def test_summary_list_omits_full_text(self):
+        with self.assertNumQueries(2) as ctx:
+            response = self.client.get(reverse("readings-list"), {"view": "summary"})
+        item = response.data[0]
+        self.assertEqual(item["slug"], "morgen")
+        self.assertEqual(item["word_count"], 250)
+        self.assertNotIn("body", item)
+        self.assertNotIn("translation_en", item)
+        self.assertNotIn('"body"', ctx.captured_queries[-1]["sql"])
+
+        detail = self.client.get(reverse("readings-detail", kwargs={"slug": "morgen"}))
+        self.assertEqual(detail.data["translation_en"], "word")
+        self.assertIn("body", detail.data)
@@ -0,0 +1,75 @@
+import io
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from exams.management.commands.generate_load_data import HISTORY_DAYS, Command
+from exams.models import Answer, Assignment, StudentProfile, Submission
+
+
+class GenerateLoadDataTests(TestCase):
+    def generate(self, **options):
+        options = {
+            "students": 5,
+            "submissions_per_student": 2,
+            "chunk_size": 3,
+            **options,
+        }
+        call_command("generate_load_data", stdout=io.StringIO(), **options)
+        return list(
+            Answer.objects.order_by(
+                "submission__student__email", "submission_id", "question_id"
+            ).values_list(
+                "submission__student__email",
+                "submission__test__slug",
+                "selected_option__text",
+            )
+        )
+
+    def test_generates_consistent_rows(self):
+        answers = self.generate()
+        self.assertEqual(StudentProfile.objects.count(), 5)
+        self.assertTrue(answers)
+        for submission in Submission.objects.all():
+            self.assertEqual(submission.answers.count(), submission.total_questions)
+            self.assertEqual(
+                submission.answers.filter(is_correct=True).count(), submission.score
+            )
+        self.assertFalse(
+            Assignment.objects.exclude(
+                student__email__endswith="@load.norskkurs.test"
+            ).exists()
+        )
+
+    def test_same_seed_same_dataset(self):
+        first = self.generate(seed=7)
+        second = self.generate(seed=7)
+        self.assertEqual(first, second)
+        self.assertEqual(Answer.objects.count(), len(first))
+        self.assertNotEqual(self.generate(seed=8), first)
+
+    def test_reset_queries_do_not_grow_with_rows(self):
+        counts = []
+        for students in (3, 9):
+            self.generate(students=students)
+            with CaptureQueriesContext(connection) as queries:
+                Command().reset(chunk_size=1000)
+            counts.append(len(queries))
+            self.assertFalse(Submission.objects.exists())
+            self.assertFalse(Assignment.objects.exists())
+        self.assertEqual(counts[0], counts[1])
+        self.assertFalse(
+            StudentProfile.objects.filter(
+                email__endswith="@load.norskkurs.test"
+            ).exists()
+        )
+
+    def test_submissions_are_spread_over_time(self):
+        self.generate()
+        created = Submission.objects.values_list("created_at", flat=True)
+        self.assertEqual(len(set(created)), len(created))
+        self.assertLess(timezone.now() - min(created), timedelta(days=HISTORY_DAYS))
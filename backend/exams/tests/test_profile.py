@@ -0,0 +1,46 @@
+from django.core.cache import caches
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from exams.models import StudentProfile, Test
+
+
+class ProfileMeCase(APITestCase):
+    def setUp(self):
+        caches["content"].clear()
+
+    def test_get_me_is_read_only_and_cached(self):
+        url = reverse("profile-me")
+        response = self.client.get(url, {"student_email": "Ola@Example.com"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["stream"], Test.Stream.BOKMAAL)
+        self.assertFalse(StudentProfile.objects.exists())
+
+        with self.assertNumQueries(0):
+            self.client.get(url, {"student_email": "ola@example.com"})
+
+    def test_profile_changes_invalidate_cached_snapshot(self):
+        url = reverse("profile-me")
+        self.client.get(url, {"student_email": "kari@example.com"})
+
+        response = self.client.post(
+            reverse("profile-stream"),
+            {"email": "kari@example.com", "stream": Test.Stream.NYNORSK},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(url, {"student_email": "kari@example.com"})
+        self.assertEqual(response.data["stream"], Test.Stream.NYNORSK)
+
+        StudentProfile.objects.filter(email="kari@example.com").get().delete()
+        response = self.client.get(url, {"student_email": "kari@example.com"})
+        self.assertEqual(response.data["stream"], Test.Stream.BOKMAAL)
+
+    def test_post_me_creates_profile(self):
+        response = self.client.post(
+            reverse("profile-me"), {"student_email": "Nils@Example.com"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(
+            StudentProfile.objects.filter(email="nils@example.com").exists()
+        )
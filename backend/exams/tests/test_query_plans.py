@@ -0,0 +1,162 @@
+"""EXPLAIN-based checks that the hot list/submit queries use their indexes.
+
+The plans are taken on near-empty tables, so sequential scans are disabled on
+PostgreSQL to see which index the planner would pick with real data.
+"""
+
+from unittest import skipUnless
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from exams.models import (
+    Assignment,
+    Exercise,
+    Homework,
+    Material,
+    Reading,
+    StudentProfile,
+    Submission,
+    Test,
+)
+from exams.utils.access import active_assignments, expired_assignments
+
+
+def index_name(model, *fields):
+    for index in model._meta.indexes:
+        if tuple(index.fields) == fields and index.condition is None:
+            return index.name
+    raise LookupError(f"No index on {model.__name__}{fields}")
+
+
+class QueryPlanCase(APITestCase):
+    def setUp(self):
+        self.test = Test.objects.create(
+            title="Restricted",
+            slug="restricted",
+            level=Test.Level.A1,
+            is_published=True,
+            is_restricted=True,
+        )
+        self.student = StudentProfile.objects.create(email="ola@example.com")
+        Assignment.objects.create(test=self.test, student=self.student)
+
+    def explain(self, sql, params=()):
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute("SET LOCAL enable_seqscan = off")
+                cursor.execute(f"EXPLAIN {sql}", params)
+            else:
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            return "\n".join(str(row[-1]) for row in cursor.fetchall())
+
+    def request_plans(self, method, url, data=None):
+        with CaptureQueriesContext(connection) as ctx:
+            getattr(self.client, method)(url, data, format="json")
+        return [
+            self.explain(query["sql"])
+            for query in ctx.captured_queries
+            if query["sql"].startswith("SELECT")
+        ]
+
+    def assertUsesIndex(self, plans, name):
+        if isinstance(plans, str):
+            plans = [plans]
+        self.assertTrue(
+            any(name in plan for plan in plans),
+            f"{name} not used by:\n" + "\n---\n".join(plans),
+        )
+
+    def assertAssignmentsByStudent(self, plans):
+        """The allowed-tests lookup reads assignments through a student index."""
+        lookups = [plan for plan in plans if "exams_assignment" in plan]
+        self.assertTrue(lookups, "no assignment lookup:\n" + "\n---\n".join(plans))
+        for plan in lookups:
+            self.assertNotIn("SCAN exams_assignment", plan)
+            self.assertNotIn("Seq Scan on exams_assignment", plan)
+
+    def test_catalog_filters(self):
+        plans = self.request_plans(
+            "get",
+            reverse("test-list"),
+            {"stream": "bokmaal", "level": "A1", "student_email": "ola@example.com"},
+        )
+        self.assertUsesIndex(plans, index_name(Test, "stream", "level", "is_published"))
+        self.assertAssignmentsByStudent(plans)
+
+    def test_submit_assignment_check(self):
+        url = reverse("test-submit", kwargs={"slug": self.test.slug})
+        plans = self.request_plans(
+            "post",
+            f"{url}?student_email=ola@example.com",
+            {"answers": [], "email": "ola@example.com"},
+        )
+        self.assertAssignmentsByStudent(plans)
+
+    def test_content_lists(self):
+        params = {
+            "stream": "bokmaal",
+            "level": "A1",
+            "student_email": "ola@example.com",
+        }
+        cases = [
+            ("materials-list", index_name(Material, "stream", "level", "is_published")),
+            ("readings-list", index_name(Reading, "stream", "level", "is_published")),
+            ("homework-list", index_name(Homework, "status", "stream", "level")),
+            ("exercises-list", index_name(Exercise, "stream", "level")),
+        ]
+        for url_name, name in cases:
+            with self.subTest(url_name):
+                self.assertUsesIndex(
+                    self.request_plans("get", reverse(url_name), params), name
+                )
+
+    @skipUnless(connection.vendor == "postgresql", "needs bitmap OR scans")
+    def test_assigned_or_unassigned_without_stream(self):
+        plans = self.request_plans(
+            "get", reverse("materials-list"), {"student_email": "ola@example.com"}
+        )
+        self.assertUsesIndex(plans, "material_unassigned_idx")
+        self.assertUsesIndex(plans, "assigned_to_id")
+
+    def test_assigned_rows_use_the_foreign_key_index(self):
+        for model in (Material, Homework, Exercise):
+            with self.subTest(model.__name__):
+                sql, params = (
+                    model.objects.filter(assigned_to=self.student)
+                    .values("pk")
+                    .query.sql_with_params()
+                )
+                self.assertUsesIndex(self.explain(sql, params), "assigned_to_id")
+
+    def test_submission_history(self):
+        for lookup, fields in [
+            ({"test": self.test}, ("test", "created_at")),
+            ({"student": self.student}, ("student", "created_at")),
+        ]:
+            with self.subTest(fields[0]):
+                sql, params = (
+                    Submission.objects.filter(**lookup)
+                    .values("pk")
+                    .query.sql_with_params()
+                )
+                self.assertUsesIndex(
+                    self.explain(sql, params), index_name(Submission, *fields)
+                )
+
+    def test_assignment_expiry(self):
+        now = timezone.now()
+        cases = [
+            (
+                active_assignments(now).filter(student=self.student),
+                index_name(Assignment, "student", "expires_at"),
+            ),
+            (expired_assignments(now), "assignment_expiring_idx"),
+        ]
+        for queryset, name in cases:
+            with self.subTest(name):
+                sql, params = queryset.order_by().values("pk").query.sql_with_params()
+                self.assertUsesIndex(self.explain(sql, params), name)
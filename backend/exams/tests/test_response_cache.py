@@ -0,0 +1,62 @@
+from django.core.cache import caches
+from django.db.models.deletion import Collector
+from django.http import QueryDict
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from exams.caching import normalize_params, response_cache_stats
+from exams.models import Answer, CsvJob, Expression
+
+
+class ResponseCacheCase(APITestCase):
+    def setUp(self):
+        caches["content"].clear()
+        Expression.objects.all().delete()
+        Expression.objects.create(phrase="Ha det bra", stream="bokmaal")
+
+    def test_repeat_requests_are_served_from_cache(self):
+        url = reverse("expressions-list")
+        first = self.client.get(url, {"stream": "bokmaal"})
+        self.assertEqual(first["X-Cache"], "MISS")
+        # Only the ETag validator query remains; serialization is skipped.
+        with self.assertNumQueries(1):
+            second = self.client.get(url, {"stream": " BOKMAAL "})
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(
+            response_cache_stats(["expressions"]),
+            {"expressions": {"hits": 1, "misses": 1}},
+        )
+
+    def test_saves_and_deletes_invalidate(self):
+        url = reverse("expressions-list")
+        self.client.get(url)
+        expression = Expression.objects.create(phrase="Takk for maten")
+        response = self.client.get(url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(response.data), 2)
+        expression.delete()
+        self.assertEqual(len(self.client.get(url).data), 1)
+
+    def test_cached_body_matches_its_etag_when_a_bump_is_lost(self):
+        url = reverse("expressions-list")
+        etag = self.client.get(url)["ETag"]
+        # ``update()`` sends no signals, so the content version stays put.
+        Expression.objects.update(phrase="Ha det godt", updated_at=timezone.now())
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data[0]["phrase"], "Ha det godt")
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_non_content_models_keep_fast_deletes(self):
+        collector = Collector(using="default")
+        self.assertTrue(collector.can_fast_delete(Answer.objects.all()))
+        self.assertTrue(collector.can_fast_delete(CsvJob.objects.all()))
+
+    def test_normalize_params_ignores_order_case_and_blanks(self):
+        self.assertEqual(
+            normalize_params(QueryDict("level=a1&stream=Bokmaal&q=")),
+            normalize_params(QueryDict("stream=bokmaal&level=A1")),
+        )
@@ -0,0 +1,67 @@
+import io
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from exams.management.commands.seed_sample_data import TESTS_PER_LEVEL
+from exams.models import Option, Test, VerbEntry
+
+
+class SeedSampleDataTests(TestCase):
+    def seed(self, **options):
+        out = io.StringIO()
+        call_command("seed_sample_data", stdout=out, **options)
+        return out.getvalue()
+
+    def test_second_run_writes_nothing(self):
+        self.seed()
+        tests = Test.objects.filter(slug__contains="-praksis-")
+        self.assertEqual(tests.count(), 4 * TESTS_PER_LEVEL)
+        verbs = VerbEntry.objects.count()
+        option_ids = set(Option.objects.values_list("pk", flat=True))
+
+        # Tests, questions and options, then verbs: one lookup each, no writes.
+        with self.assertNumQueries(8):
+            output = self.seed()
+
+        self.assertIn("tests: created 0, updated 0, unchanged 40", output)
+        self.assertIn("verbs: created 0, updated 0", output)
+        self.assertEqual(VerbEntry.objects.count(), verbs)
+        self.assertEqual(set(Option.objects.values_list("pk", flat=True)), option_ids)
+
+    def test_reseed_keeps_edited_content(self):
+        self.seed()
+        option = Option.objects.filter(question__test__slug="a1-praksis-01").first()
+        option.text = "endret"
+        option.save()
+        verb = VerbEntry.objects.first()
+        verb.present = "endret"
+        verb.save()
+
+        output = self.seed()
+
+        self.assertIn(
+            "tests: created 0, updated 0, unchanged 39, kept edited 1", output
+        )
+        self.assertIn("kept edited 1", output.splitlines()[1])
+        option.refresh_from_db()
+        verb.refresh_from_db()
+        self.assertEqual(option.text, "endret")
+        self.assertEqual(verb.present, "endret")
+
+    def test_overwrite_repairs_edited_content(self):
+        self.seed()
+        option = Option.objects.filter(question__test__slug="a1-praksis-01").first()
+        option.text = "endret"
+        option.save()
+
+        output = self.seed(overwrite=True)
+
+        self.assertIn("tests: created 0, updated 1, unchanged 39", output)
+        option.refresh_from_db()
+        self.assertNotEqual(option.text, "endret")
+
+    def test_scale_adds_synthetic_copies(self):
+        self.seed(scale=2)
+        self.assertTrue(Test.objects.filter(slug="b2-praksis-20").exists())
+        self.assertTrue(VerbEntry.objects.filter(verb="å lese #2").exists())
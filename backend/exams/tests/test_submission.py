@@ -1,8 +1,9 @@
+from django.db.models import ProtectedError
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from exams.models import Option, Question, Test
+from exams.models import Option, Question, StudentProfile, Submission, Test
 
 
 class TestSubmitCase(APITestCase):
@@ -30,7 +31,12 @@ class TestSubmitCase(APITestCase):
         response = self.client.post(
             url,
             {
-                "answers": [{"question": self.question.id, "selected_option": self.correct_option.id}],
+                "answers": [
+                    {
+                        "question": self.question.id,
+                        "selected_option": self.correct_option.id,
+                    }
+                ],
                 "name": "Tester",
             },
             format="json",
@@ -38,3 +44,92 @@ class TestSubmitCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data["summary"]["score"], 1)
         self.assertEqual(response.data["summary"]["percent"], 100)
+
+    def test_submit_grades_fill_in_and_builds_review(self):
+        fill = Question.objects.create(
+            test=self.test,
+            text="Skriv ordet",
+            question_type=Question.QuestionType.FILL_IN,
+            order=2,
+            explanation="Hus er et substantiv.",
+        )
+        Option.objects.create(question=fill, text="Hus", is_correct=True)
+        url = reverse("test-submit", kwargs={"slug": self.test.slug})
+        response = self.client.post(
+            url,
+            {
+                "answers": [
+                    {
+                        "question": self.question.id,
+                        "selected_option": self.correct_option.id,
+                    },
+                    {"question": fill.id, "text_response": "  hus "},
+                ],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["summary"]["score"], 2)
+        self.assertEqual(len(response.data["answers"]), 2)
+        self.assertTrue(all(answer["id"] for answer in response.data["answers"]))
+        review = response.data["review"]
+        self.assertEqual(review[1]["correct_answers"], ["Hus"])
+        self.assertEqual(review[1]["explanation"], "Hus er et substantiv.")
+
+    def test_submission_is_linked_to_the_student_profile(self):
+        url = reverse("test-submit", kwargs={"slug": self.test.slug})
+        response = self.client.post(
+            url, {"answers": [], "email": " Kari@Example.com"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["submission"]["email"], "kari@example.com")
+        profile = StudentProfile.objects.get(email="kari@example.com")
+        self.assertEqual(
+            profile.submissions.get().pk, response.data["submission"]["id"]
+        )
+
+    def test_deleting_a_student_keeps_their_submissions(self):
+        url = reverse("test-submit", kwargs={"slug": self.test.slug})
+        self.client.post(
+            url, {"answers": [], "email": "kari@example.com"}, format="json"
+        )
+        profile = StudentProfile.objects.get(email="kari@example.com")
+        with self.assertRaises(ProtectedError):
+            profile.delete()
+        self.assertEqual(Submission.objects.get().student, profile)
+
+    def test_submit_query_count_does_not_grow_with_questions(self):
+        for order in range(2, 12):
+            question = Question.objects.create(
+                test=self.test, text=f"Q{order}", order=order
+            )
+            Option.objects.create(question=question, text="ja", is_correct=True)
+            Option.objects.create(question=question, text="nei")
+        url = reverse("test-submit", kwargs={"slug": self.test.slug})
+        # test + questions + options, savepoint pair, submission + answers insert
+        with self.assertNumQueries(7):
+            response = self.client.post(url, {"answers": []}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["summary"]["total_questions"], 11)
+        # The compiled answer key is reused by the next submission.
+        with self.assertNumQueries(5):
+            self.client.post(url, {"answers": []}, format="json")
+
+    def test_option_change_invalidates_answer_key(self):
+        url = reverse("test-submit", kwargs={"slug": self.test.slug})
+        payload = {
+            "answers": [
+                {
+                    "question": self.question.id,
+                    "selected_option": self.correct_option.id,
+                }
+            ]
+        }
+        self.client.post(url, payload, format="json")
+
+        self.correct_option.is_correct = False
+        self.correct_option.save()
+
+        response = self.client.post(url, payload, format="json")
+        self.assertEqual(response.data["summary"]["score"], 0)
+        self.assertEqual(response.data["review"][0]["correct_answers"], [])
@@ -0,0 +1,39 @@
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from exams.data import verb_library
+
+
+class VerbLibraryTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(verb_library, "_verbs_by_stream", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_builds_once_and_memoizes(self):
+        with mock.patch.object(
+            verb_library, "build_verbs", wraps=verb_library.build_verbs
+        ) as build:
+            first = verb_library.get_verbs_by_stream()
+            self.assertIs(verb_library.VERBS_BY_STREAM, first)
+        build.assert_called_once()
+        self.assertEqual(set(first), {"bokmaal", "nynorsk", "english"})
+
+    def test_reuses_artifact_keyed_by_blueprint_digest(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with override_settings(VERB_LIBRARY_CACHE_DIR=tmpdir):
+                built = verb_library.get_verbs_by_stream()
+                self.assertTrue(verb_library.artifact_path(tmpdir).exists())
+
+                verb_library._verbs_by_stream = None
+                with mock.patch.object(verb_library, "build_verbs") as build:
+                    loaded = verb_library.get_verbs_by_stream()
+                build.assert_not_called()
+                self.assertEqual(loaded, built)
+
+    def test_digest_follows_blueprint_data(self):
+        digest = verb_library.blueprint_digest()
+        with mock.patch.object(verb_library, "ARTIFACT_FORMAT", 0):
+            self.assertNotEqual(verb_library.blueprint_digest(), digest)
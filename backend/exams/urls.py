@@ -1,6 +1,7 @@
 from rest_framework.routers import DefaultRouter
 
 from .views import (
+    AutocompleteViewSet,
     ExerciseViewSet,
     ExpressionViewSet,
     GlossaryTermViewSet,
@@ -22,5 +23,6 @@ router.register(r"verbs", VerbEntryViewSet, basename="verbs")
 router.register(r"expressions", ExpressionViewSet, basename="expressions")
 router.register(r"glossary", GlossaryTermViewSet, basename="glossary")
 router.register(r"readings", ReadingViewSet, basename="readings")
+router.register(r"autocomplete", AutocompleteViewSet, basename="autocomplete")
 
 urlpatterns = router.urls
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Callable, FrozenSet, Optional
+
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from ..caching import bump_content_version, content_cache
+from ..fields import normalize_email
+from ..models import Assignment
+
+CACHE_KEY_PREFIX = "exams:access"
+PURGE_BATCH_SIZE = 1000
+
+
+def _cache_key(email: str) -> str:
+    return f"{CACHE_KEY_PREFIX}:{email}"
+
+
+def active_assignments(now: Optional[datetime] = None):
+    """Assignments that still grant access (no expiry, or not expired yet)."""
+    now = now or timezone.now()
+    return Assignment.objects.filter(
+        models.Q(expires_at__isnull=True) | models.Q(expires_at__gt=now)
+    )
+
+
+def expired_assignments(now: Optional[datetime] = None):
+    """Assignments past their expiry; served by ``assignment_expiring_idx``."""
+    return Assignment.objects.filter(expires_at__lte=now or timezone.now())
+
+
+def purge_expired_assignments(
+    *,
+    batch_size: int = PURGE_BATCH_SIZE,
+    now: Optional[datetime] = None,
+    progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    """Delete expired assignments, ``batch_size`` rows per transaction.
+
+    Returns the number of deleted rows. Each batch is one locking SELECT and
+    one DELETE; per-row signals are skipped, so the cached access sets of the
+    affected students are dropped here (once per student) and the Assignment
+    content version is bumped once at the end.
+    """
+    now = now or timezone.now()
+    expired = expired_assignments(now).order_by()
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            # Locking the rows keeps an assignment from being extended between
+            # the expiry check and the delete.
+            rows = list(
+                expired.select_for_update(of=("self",)).values_list(
+                    "pk", "student__email"
+                )[:batch_size]
+            )
+            if not rows:
+                break
+            deleted += delete_assignments([pk for pk, _ in rows])
+            for email in {email for _, email in rows if email}:
+                invalidate_access(email)
+        if progress:
+            progress(deleted)
+    if deleted:
+        bump_content_version(Assignment)
+        transaction.on_commit(lambda: bump_content_version(Assignment))
+    return deleted
+
+
+def delete_assignments(pks) -> int:
+    """``DELETE ... WHERE id IN (pks)`` in one statement; nothing references
+    assignments, so there is nothing for the ORM's collector to cascade.
+
+    The per-row signals are skipped: callers drop the affected access sets and
+    bump the Assignment content version themselves.
+    """
+    pks = list(pks)
+    if not pks:
+        return 0
+    quote = connection.ops.quote_name
+    meta = Assignment._meta
+    placeholders = ", ".join(["%s"] * len(pks))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {quote(meta.db_table)} "
+            f"WHERE {quote(meta.pk.column)} IN ({placeholders})",
+            pks,
+        )
+        return cursor.rowcount
+
+
+def allowed_test_ids(email: str) -> FrozenSet[int]:
+    """Ids of the tests assigned to ``email`` that have not expired.
+
+    Cached per student together with the earliest expiry among them, so the
+    set is rebuilt as soon as an assignment runs out; assignment changes
+    delete the entry (see ``exams.signals``).
+    """
+    email = normalize_email(email)
+    if not email:
+        return frozenset()
+    now = timezone.now()
+    cache = content_cache()
+    cached = cache.get(_cache_key(email))
+    if cached is not None:
+        test_ids, valid_until = cached
+        if valid_until is None or valid_until > now:
+            return frozenset(test_ids)
+
+    rows = list(
+        active_assignments(now)
+        .filter(student__email=email)
+        .order_by()
+        .values_list("test_id", "expires_at")
+    )
+    test_ids = sorted({test_id for test_id, _ in rows})
+    valid_until = min((expires for _, expires in rows if expires), default=None)
+    timeout = getattr(settings, "ACCESS_CACHE_TIMEOUT", 300)
+    if valid_until is not None:
+        timeout = max(1, min(timeout, int((valid_until - now).total_seconds()) + 1))
+    cache.set(_cache_key(email), (test_ids, valid_until), timeout)
+    return frozenset(test_ids)
+
+
+def invalidate_access(email: str) -> None:
+    key = _cache_key(normalize_email(email))
+    content_cache().delete(key)
+    transaction.on_commit(lambda: content_cache().delete(key))
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+from ..models import Question, Test
+
+CACHE_KEY_PREFIX = "exams:answer-key"
+
+_local_keys: Dict[int, "AnswerKey"] = {}
+_local_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class QuestionKey:
+    question_id: int
+    question_type: str
+    order: int
+    text: str
+    explanation: str
+    option_texts: Dict[int, str]
+    correct_option_ids: FrozenSet[int]
+    accepted_texts: FrozenSet[str]
+    correct_answers: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class AnswerKey:
+    test_id: int
+    version: str
+    questions: Tuple[QuestionKey, ...]
+
+
+def normalize_response(value: str) -> str:
+    return (value or "").strip().casefold()
+
+
+def answer_key_version(test: Test) -> str:
+    return test.updated_at.isoformat() if test.updated_at else ""
+
+
+def compile_answer_key(test: Test) -> AnswerKey:
+    questions = []
+    for question in Question.objects.filter(test=test).prefetch_related("options"):
+        options = list(question.options.all())
+        correct = [option for option in options if option.is_correct]
+        questions.append(
+            QuestionKey(
+                question_id=question.id,
+                question_type=question.question_type,
+                order=question.order,
+                text=question.text,
+                explanation=question.explanation,
+                option_texts={option.id: option.text for option in options},
+                correct_option_ids=frozenset(option.id for option in correct),
+                accepted_texts=frozenset(
+                    normalize_response(option.text) for option in correct
+                ),
+                correct_answers=tuple(option.text for option in correct),
+            )
+        )
+    return AnswerKey(
+        test_id=test.id, version=answer_key_version(test), questions=tuple(questions)
+    )
+
+
+def _shared_cache():
+    return caches[getattr(settings, "ANSWER_KEY_CACHE_ALIAS", "default")]
+
+
+def _cache_key(test_id: int, version: str) -> str:
+    return f"{CACHE_KEY_PREFIX}:{test_id}:{version}"
+
+
+def get_answer_key(test: Test) -> AnswerKey:
+    """Return the compiled answer key for ``test``.
+
+    Keys are looked up in-process first, then in the shared Django cache, and
+    compiled from the database only on a miss. The version is the test's
+    ``updated_at``, which the question/option signals bump on every change.
+    """
+    version = answer_key_version(test)
+    with _local_lock:
+        key = _local_keys.get(test.id)
+    if key is not None and key.version == version:
+        return key
+
+    cache = _shared_cache()
+    cache_key = _cache_key(test.id, version)
+    key: Optional[AnswerKey] = cache.get(cache_key)
+    if key is None:
+        key = compile_answer_key(test)
+        cache.set(
+            cache_key, key, getattr(settings, "ANSWER_KEY_CACHE_TIMEOUT", 60 * 60 * 24)
+        )
+    with _local_lock:
+        _local_keys[test.id] = key
+    return key
+
+
+def invalidate_answer_key(test_id: int) -> None:
+    with _local_lock:
+        _local_keys.pop(test_id, None)
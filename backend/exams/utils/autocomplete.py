@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+from ..caching import content_versions
+from ..models import Expression, GlossaryTerm, VerbEntry
+
+KIND_GLOSSARY = "glossary"
+KIND_VERB = "verb"
+KIND_EXPRESSION = "expression"
+KINDS = (KIND_GLOSSARY, KIND_VERB, KIND_EXPRESSION)
+
+# Letters that NFKD does not decompose, folded the way learners type them on a
+# keyboard without a Norwegian layout.
+_LETTER_FOLDS = str.maketrans({"æ": "ae", "ø": "o", "å": "a", "ß": "ss"})
+
+
+def fold(value: str) -> str:
+    """Casefold and strip diacritics: ``"Å gjøre"`` -> ``"a gjore"``."""
+    value = (value or "").casefold().translate(_LETTER_FOLDS)
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.split())
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    kind: str
+    id: int
+    text: str
+    stream: str
+
+
+class AutocompleteIndex:
+    """Sorted array of folded keys; a prefix lookup is one bisect plus a scan."""
+
+    def __init__(self, entries: Iterable[Tuple[str, Suggestion]]):
+        pairs = sorted(
+            {(key, suggestion) for key, suggestion in entries if key},
+            key=lambda pair: (pair[0], pair[1].text, pair[1].id),
+        )
+        self.keys: List[str] = [key for key, _ in pairs]
+        self.suggestions: List[Suggestion] = [suggestion for _, suggestion in pairs]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def lookup(
+        self,
+        prefix: str,
+        *,
+        stream: Optional[str] = None,
+        kinds: Optional[Sequence[str]] = None,
+        limit: int = 10,
+    ) -> List[Suggestion]:
+        folded = fold(prefix)
+        if not folded:
+            return []
+        results: List[Suggestion] = []
+        seen = set()
+        position = bisect_left(self.keys, folded)
+        while position < len(self.keys) and len(results) < limit:
+            if not self.keys[position].startswith(folded):
+                break
+            suggestion = self.suggestions[position]
+            position += 1
+            if stream and suggestion.stream != stream:
+                continue
+            if kinds and suggestion.kind not in kinds:
+                continue
+            if (suggestion.kind, suggestion.id) in seen:
+                continue
+            seen.add((suggestion.kind, suggestion.id))
+            results.append(suggestion)
+        return results
+
+
+def _word_keys(*texts: str) -> List[str]:
+    """Index every word start, so "lese" finds "å lese" and "leser"."""
+    keys = []
+    for text in texts:
+        words = fold(text).split()
+        keys.extend(" ".join(words[idx:]) for idx in range(len(words)))
+    return keys
+
+
+def _iter_entries() -> Iterable[Tuple[str, Suggestion]]:
+    for pk, term, stream in GlossaryTerm.objects.values_list("id", "term", "stream"):
+        suggestion = Suggestion(KIND_GLOSSARY, pk, term, stream)
+        for key in _word_keys(term):
+            yield key, suggestion
+    for pk, verb, stream, *forms in VerbEntry.objects.values_list(
+        "id", "verb", "stream", "infinitive", "present", "past", "perfect"
+    ):
+        suggestion = Suggestion(KIND_VERB, pk, verb, stream)
+        for key in _word_keys(verb, *forms):
+            yield key, suggestion
+    for pk, phrase, stream in Expression.objects.values_list("id", "phrase", "stream"):
+        suggestion = Suggestion(KIND_EXPRESSION, pk, phrase, stream)
+        for key in _word_keys(phrase):
+            yield key, suggestion
+
+
+def build_index() -> AutocompleteIndex:
+    return AutocompleteIndex(_iter_entries())
+
+
+class _IndexHolder:
+    """Per-process lazily built index.
+
+    The index remembers the content versions (see ``exams.caching``) it was
+    built from, so every worker rebuilds on its first lookup after a change;
+    ``AUTOCOMPLETE_MAX_AGE`` bounds staleness when the cache is process-local.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index: Optional[AutocompleteIndex] = None
+        self._version = None
+        self._built_at = 0.0
+
+    def get(self) -> AutocompleteIndex:
+        version = content_versions(GlossaryTerm, VerbEntry, Expression)
+        max_age = getattr(settings, "AUTOCOMPLETE_MAX_AGE", 300)
+        with self._lock:
+            fresh = (
+                self._index is not None
+                and self._version == version
+                and time.monotonic() - self._built_at < max_age
+            )
+            if not fresh:
+                self._index = build_index()
+                self._version = version
+                self._built_at = time.monotonic()
+            return self._index
+
+
+_holder = _IndexHolder()
+
+
+def get_index() -> AutocompleteIndex:
+    return _holder.get()
+
+
+def autocomplete(
+    prefix: str,
+    *,
+    stream: Optional[str] = None,
+    kinds: Optional[Sequence[str]] = None,
+    limit: int = 10,
+) -> List[Suggestion]:
+    return get_index().lookup(prefix, stream=stream, kinds=kinds, limit=limit)
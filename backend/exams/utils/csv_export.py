@@ -0,0 +1,41 @@
+"""Streaming CSV export helpers shared by the ``*_csv`` modules."""
+
+from __future__ import annotations
+
+import csv
+from typing import Iterable, Iterator, Sequence
+
+from django.http import StreamingHttpResponse
+
+EXPORT_CHUNK_SIZE = 2000
+BOM = "\ufeff"
+
+
+class Echo:
+    """File-like object whose ``write`` hands the formatted line back."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_csv_lines(rows: Iterable[Sequence], *, bom: bool = False) -> Iterator[str]:
+    if bom:
+        yield BOM
+    writer = csv.writer(Echo())
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def write_csv(file_obj, rows: Iterable[Sequence], *, bom: bool = False) -> None:
+    for line in iter_csv_lines(rows, bom=bom):
+        file_obj.write(line)
+
+
+def streaming_csv_response(
+    filename: str, rows: Iterable[Sequence], *, bom: bool = False
+) -> StreamingHttpResponse:
+    response = StreamingHttpResponse(
+        iter_csv_lines(rows, bom=bom), content_type="text/csv"
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
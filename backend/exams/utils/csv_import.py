@@ -0,0 +1,362 @@
+"""Shared batched CSV importer used by the ``*_csv`` modules.
+
+An ``ImportSpec`` describes one content type: its natural key, a normalizer per
+CSV column and hooks for defaults and legacy columns. ``run_import`` streams the
+rows, looks up the natural keys of each batch with one query and writes the
+batch with ``bulk_create``/``bulk_update`` (or a single upsert when the key is
+backed by a unique constraint), all inside one transaction.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from ..caching import bump_content_version
+
+IMPORT_BATCH_SIZE = 500
+
+Normalizer = Callable[[Optional[str]], Any]
+Hook = Callable[[Dict[str, Any], Mapping[str, Any]], None]
+
+
+class SkipRow(Exception):
+    """Raised by a hook to count the current row as skipped; the optional
+    message is the reason shown in dry-run reports."""
+
+
+@dataclass
+class ImportStats:
+    created: int = 0
+    updated: int = 0
+    # Rows matching an existing record field for field; never written.
+    unchanged: int = 0
+    skipped: int = 0
+    duration: float = 0.0
+    # Rows rejected by a hook when errors are collected (also counted as
+    # skipped): [{"row": 3, "error": "..."}], rows numbered from 1.
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    # Dry runs only: {"row", "action", "key", "fields" | "reason"} per row that
+    # would be created, updated or skipped.
+    changes: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def processed(self) -> int:
+        return self.created + self.updated + self.unchanged + self.skipped
+
+
+Progress = Callable[[ImportStats], None]
+
+
+@dataclass(frozen=True)
+class ImportSpec:
+    model: type
+    key_fields: Tuple[str, ...]
+    # CSV column -> normalizer; the normalized value is stored under the same
+    # name, so columns double as model field names.
+    fields: Mapping[str, Normalizer]
+    # Run in order after normalization with ``(values, raw_row)``.
+    hooks: Sequence[Hook] = ()
+    required_columns: Tuple[str, ...] = ()
+    # Called on every instance before it is written (e.g. derived fields).
+    prepare: Optional[Callable[[models.Model], None]] = None
+    extra_update_fields: Tuple[str, ...] = ()
+    # ``key_fields`` is backed by a unique constraint, so batches can be
+    # written as ``INSERT ... ON CONFLICT DO UPDATE``.
+    unique_key: bool = False
+
+    @property
+    def compare_fields(self) -> Tuple[str, ...]:
+        """Imported fields an existing row is diffed on."""
+        concrete = {field.name for field in self.model._meta.concrete_fields}
+        return tuple(
+            name
+            for name in self.fields
+            if name not in self.key_fields and name in concrete
+        )
+
+    @property
+    def update_fields(self) -> Tuple[str, ...]:
+        names = [name for name in self.fields if name not in self.key_fields]
+        names.extend(self.extra_update_fields)
+        names.append("updated_at")
+        concrete = {field.name for field in self.model._meta.concrete_fields}
+        return tuple(dict.fromkeys(name for name in names if name in concrete))
+
+    def parse(self, row: Mapping[str, Any]) -> Dict[str, Any]:
+        values = {
+            name: normalize(row.get(name)) for name, normalize in self.fields.items()
+        }
+        for hook in self.hooks:
+            hook(values, row)
+        return values
+
+    def key(self, values: Mapping[str, Any]) -> Tuple:
+        return tuple(values[name] for name in self.key_fields)
+
+
+def text(value: Optional[str]) -> str:
+    return (value or "").strip()
+
+
+def lower(value: Optional[str]) -> str:
+    return text(value).lower()
+
+
+def upper(value: Optional[str]) -> str:
+    return text(value).upper()
+
+
+def tags(value: Optional[str]) -> list:
+    return [tag.strip() for tag in (value or "").split(";") if tag.strip()]
+
+
+def flag(value: Optional[str]) -> bool:
+    return (value or "1").strip() not in {"0", "false", "False"}
+
+
+def require(*names: str) -> Hook:
+    """Skip rows where all of ``names`` are empty."""
+
+    def hook(values, row):
+        if not any(values.get(name) for name in names):
+            raise SkipRow(f"empty {' / '.join(names)}")
+
+    return hook
+
+
+def model_defaults(model, *names: str) -> Hook:
+    """Fill empty ``names`` with the model field defaults."""
+
+    def hook(values, row):
+        for name in names:
+            if not values.get(name):
+                values[name] = model._meta.get_field(name).default
+
+    return hook
+
+
+@contextmanager
+def read_upload(upload) -> Iterator[csv.DictReader]:
+    """Rows of an uploaded CSV, decoded incrementally from the upload's file.
+
+    A UTF-8 BOM (as written by the verb export and Excel) is dropped. Decoding
+    errors surface while iterating, as ``UnicodeDecodeError``.
+    """
+    upload.seek(0)
+    stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    try:
+        yield csv.DictReader(stream)
+    finally:
+        # Leave the upload open; Django closes it with the request.
+        stream.detach()
+
+
+def run_import(
+    spec: ImportSpec,
+    reader: Iterable[Mapping[str, Any]],
+    *,
+    update: bool = False,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    progress: Optional[Progress] = None,
+    collect_errors: bool = False,
+    atomic: bool = True,
+    dry_run: bool = False,
+) -> ImportStats:
+    """Import ``reader`` rows; duplicate natural keys resolve to the oldest row.
+
+    Raises ``ValueError`` for missing columns or rows a hook rejects (and
+    ``UnicodeDecodeError`` from undecodable uploads), in which case nothing is
+    written. With ``collect_errors`` rejected rows are recorded in
+    ``stats.errors`` and skipped instead. ``atomic=False`` commits every batch
+    on its own, so long imports do not hold one transaction and ``progress``
+    (called with the running stats after every batch) reflects committed rows.
+
+    ``dry_run`` validates every row and computes the same diff without writing
+    anything; the per-row outcome is listed in ``stats.changes``.
+    """
+    started = time.perf_counter()
+    if spec.required_columns:
+        fieldnames = getattr(reader, "fieldnames", None) or []
+        missing = set(spec.required_columns) - set(fieldnames)
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(sorted(missing))}")
+
+    run = _ImportRun(spec, update, collect_errors or dry_run, dry_run)
+    rows = iter(reader)
+    with transaction.atomic() if atomic and not dry_run else nullcontext():
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            with nullcontext() if atomic or dry_run else transaction.atomic():
+                run.import_batch(batch)
+            if progress:
+                run.stats.duration = time.perf_counter() - started
+                progress(run.stats)
+
+    stats = run.stats
+    if not dry_run and (stats.created or stats.updated):
+        # Bulk writes skip the model signals that bump content versions. Bump
+        # once the rows are committed (callers may wrap the import in an outer
+        # transaction), so no response is cached from pre-commit data under
+        # the new version.
+        transaction.on_commit(lambda: bump_content_version(spec.model))
+    stats.duration = time.perf_counter() - started
+    return stats
+
+
+class _ImportRun:
+    def __init__(self, spec: ImportSpec, update: bool, collect_errors: bool, dry_run):
+        self.spec = spec
+        self.update = update
+        self.collect_errors = collect_errors
+        self.dry_run = dry_run
+        self.stats = ImportStats()
+        self.rows_read = 0
+        # Dry runs write nothing, so rows planned by earlier batches are
+        # remembered here instead of being found in the database.
+        self.planned: Dict[Tuple, Dict[str, Any]] = {}
+
+    def import_batch(self, batch) -> None:
+        spec, stats = self.spec, self.stats
+        parsed = []
+        for row in batch:
+            self.rows_read += 1
+            try:
+                values = spec.parse(row)
+            except SkipRow as exc:
+                stats.skipped += 1
+                self._record(self.rows_read, "skip", reason=str(exc))
+                continue
+            except ValueError as exc:
+                if not self.collect_errors:
+                    raise
+                stats.errors.append({"row": self.rows_read, "error": str(exc)})
+                stats.skipped += 1
+                continue
+            parsed.append((self.rows_read, spec.key(values), values))
+        if not parsed:
+            return
+
+        keys = {key for _, key, _ in parsed}
+        existing = _existing_rows(spec, keys - self.planned.keys())
+        current = {key: values for key, (_, values) in existing.items()}
+        current.update((key, self.planned[key]) for key in keys & self.planned.keys())
+        to_create: Dict[Tuple, Dict[str, Any]] = {}
+        to_update: Dict[Tuple, Dict[str, Any]] = {}
+        for row_number, key, values in parsed:
+            if key not in current:
+                to_create[key] = current[key] = values
+                stats.created += 1
+                self._record(row_number, "create", key=key)
+                continue
+            changed = [
+                name
+                for name in spec.compare_fields
+                if current[key].get(name) != values[name]
+            ]
+            if not changed:
+                stats.unchanged += 1
+            elif not self.update:
+                stats.skipped += 1
+                self._record(row_number, "skip", key=key, reason="exists")
+            else:
+                # A key repeated in the file updates what the first
+                # occurrence is about to create.
+                target = to_create if key in to_create else to_update
+                target[key] = current[key] = values
+                stats.updated += 1
+                self._record(row_number, "update", key=key, fields=changed)
+
+        if self.dry_run:
+            self.planned.update(to_create)
+            self.planned.update(to_update)
+            return
+        self._write(
+            [spec.model(**values) for values in to_create.values()],
+            [
+                spec.model(pk=existing[key][0], **values)
+                for key, values in to_update.items()
+            ],
+        )
+
+    def _record(self, row_number: int, action: str, key=None, **details) -> None:
+        if self.dry_run:
+            entry = {"row": row_number, "action": action, **details}
+            if key is not None:
+                entry["key"] = " / ".join(str(part) for part in key)
+            self.stats.changes.append(entry)
+
+    def _write(self, to_create, to_update) -> None:
+        spec = self.spec
+        if spec.prepare:
+            for instance in (*to_create, *to_update):
+                spec.prepare(instance)
+
+        if (
+            spec.unique_key
+            and connection.features.supports_update_conflicts_with_target
+        ):
+            if to_create or to_update:
+                options = (
+                    {
+                        "update_conflicts": True,
+                        "unique_fields": spec.key_fields,
+                        "update_fields": spec.update_fields,
+                    }
+                    if self.update
+                    else {"ignore_conflicts": True}
+                )
+                for instance in to_update:
+                    # Conflicts are resolved on the natural key, not the pk.
+                    instance.pk = None
+                spec.model.objects.bulk_create(to_create + to_update, **options)
+            return
+
+        if to_create:
+            spec.model.objects.bulk_create(to_create)
+        if to_update:
+            # bulk_update does not apply ``auto_now``.
+            now = timezone.now()
+            for instance in to_update:
+                instance.updated_at = now
+            spec.model.objects.bulk_update(to_update, spec.update_fields)
+
+
+def _existing_rows(spec: ImportSpec, keys) -> Dict[Tuple, Tuple[int, Dict[str, Any]]]:
+    """``key -> (pk, compared field values)`` for the keys already stored."""
+    if not keys:
+        return {}
+    first = spec.key_fields[0]
+    columns = ("pk", *spec.key_fields, *spec.compare_fields)
+    queryset = (
+        spec.model.objects.filter(**{f"{first}__in": {key[0] for key in keys}})
+        .order_by("-pk")
+        .values(*columns)
+    )
+    existing = {}
+    for row in queryset:
+        key = tuple(row[name] for name in spec.key_fields)
+        if key in keys:
+            existing[key] = (row["pk"], row)
+    return existing
@@ -1,100 +1,67 @@
-import csv
-from dataclasses import dataclass
-from typing import Iterable, TextIO
+from typing import Iterable, Iterator, TextIO
+
+from django.db.models import QuerySet
 
 from ..models import Expression, Test
+from .csv_export import EXPORT_CHUNK_SIZE, write_csv
+from .csv_import import ImportSpec, ImportStats, lower, require, run_import, tags, text
+
+EXPORT_HEADER = [
+    "phrase",
+    "meaning_en",
+    "meaning_nb",
+    "meaning_nn",
+    "meaning_ru",
+    "example",
+    "stream",
+    "tags",
+]
 
 
-@dataclass
-class ImportStats:
-    created: int
-    updated: int
-    skipped: int
+def iter_expression_rows(queryset: QuerySet[Expression]) -> Iterator[list]:
+    yield EXPORT_HEADER
+    values = queryset.values_list(*EXPORT_HEADER).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    for *row, tags_value in values:
+        yield [*row, ";".join(tags_value or [])]
 
 
 def export_expressions_to_file(
     file_obj: TextIO,
-    queryset: Iterable[Expression],
+    queryset: QuerySet[Expression],
 ) -> None:
-    fieldnames = [
-        "phrase",
-        "meaning_en",
-        "meaning_nb",
-        "meaning_nn",
-        "meaning_ru",
-        "example",
-        "stream",
-        "tags",
-    ]
-    writer = csv.DictWriter(file_obj, fieldnames=fieldnames)
-    writer.writeheader()
-    for item in queryset:
-        writer.writerow(
-            {
-                "phrase": item.phrase,
-                "meaning_en": item.meaning_en,
-                "meaning_nb": item.meaning_nb,
-                "meaning_nn": item.meaning_nn,
-                "meaning_ru": item.meaning_ru,
-                "example": item.example,
-                "stream": item.stream,
-                "tags": ";".join(item.tags or []),
-            }
+    write_csv(file_obj, iter_expression_rows(queryset))
+
+
+def _validate_stream(values, row) -> None:
+    if not values["stream"]:
+        values["stream"] = Expression._meta.get_field("stream").default
+    elif values["stream"] not in Test.Stream.values:
+        raise ValueError(
+            f"Invalid stream '{values['stream']}' for phrase '{values['phrase']}'. "
+            f"Use one of: {', '.join(Test.Stream.values)}."
         )
 
 
+EXPRESSION_SPEC = ImportSpec(
+    model=Expression,
+    key_fields=("phrase", "stream"),
+    fields={
+        "phrase": text,
+        "stream": lower,
+        "meaning_en": text,
+        "meaning_nb": text,
+        "meaning_nn": text,
+        "meaning_ru": text,
+        "example": text,
+        "tags": tags,
+    },
+    hooks=(require("phrase"), _validate_stream),
+)
+
+
 def import_expressions_from_reader(
     reader: Iterable[dict],
     update: bool = False,
+    **options,
 ) -> ImportStats:
-    created = updated = skipped = 0
-    for row in reader:
-        phrase = (row.get("phrase") or "").strip()
-        if not phrase:
-            skipped += 1
-            continue
-        stream_raw = (row.get("stream") or "").strip().lower()
-        if not stream_raw:
-            stream = Expression._meta.get_field("stream").default
-        else:
-            if stream_raw not in Test.Stream.values:
-                raise ValueError(
-                    f"Invalid stream '{stream_raw}' for phrase '{phrase}'. "
-                    f"Use one of: {', '.join(Test.Stream.values)}."
-                )
-            stream = stream_raw
-
-        meaning_en = (row.get("meaning_en") or "").strip()
-        meaning_nb = (row.get("meaning_nb") or "").strip()
-        meaning_nn = (row.get("meaning_nn") or "").strip()
-        meaning_ru = (row.get("meaning_ru") or "").strip()
-
-        defaults = {
-            "meaning_en": meaning_en,
-            "meaning_nb": meaning_nb,
-            "meaning_nn": meaning_nn,
-            "meaning_ru": meaning_ru,
-            "example": (row.get("example") or "").strip(),
-            "tags": [
-                t.strip() for t in (row.get("tags") or "").split(";") if t.strip()
-            ],
-        }
-
-        obj, created_flag = Expression.objects.get_or_create(
-            phrase=phrase,
-            stream=stream,
-            defaults=defaults,
-        )
-        if created_flag:
-            created += 1
-            continue
-
-        if update:
-            for key, value in defaults.items():
-                setattr(obj, key, value)
-            obj.save()
-            updated += 1
-        else:
-            skipped += 1
-
-    return ImportStats(created=created, updated=updated, skipped=skipped)
+    return run_import(EXPRESSION_SPEC, reader, update=update, **options)
@@ -1,98 +1,87 @@
-import csv
-from dataclasses import dataclass
-from typing import Iterable, TextIO
+from typing import Iterable, Iterator, TextIO
+
+from django.db.models import QuerySet
 
 from ..models import GlossaryTerm
+from .csv_export import EXPORT_CHUNK_SIZE, write_csv
+from .csv_import import (
+    ImportSpec,
+    ImportStats,
+    lower,
+    model_defaults,
+    require,
+    run_import,
+    tags,
+    text,
+    upper,
+)
 
+EXPORT_HEADER = [
+    "term",
+    "translation_en",
+    "translation_ru",
+    "translation_nn",
+    "translation_nb",
+    "tags",
+]
 
-@dataclass
-class ImportStats:
-    created: int
-    updated: int
-    skipped: int
 
+def iter_glossary_rows(queryset: QuerySet[GlossaryTerm]) -> Iterator[list]:
+    yield EXPORT_HEADER
+    values = queryset.values_list(*EXPORT_HEADER).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    for *row, tags_value in values:
+        yield [*row, ";".join(tags_value or [])]
 
-def export_glossary_to_file(file_obj: TextIO, queryset: Iterable[GlossaryTerm]) -> None:
-    fieldnames = [
-        "term",
-        "translation_en",
-        "translation_ru",
-        "translation_nn",
-        "translation_nb",
-        "tags",
-    ]
-    writer = csv.DictWriter(file_obj, fieldnames=fieldnames)
-    writer.writeheader()
-    for item in queryset:
-        writer.writerow(
-            {
-                "term": item.term,
-                "translation_en": item.translation_en,
-                "translation_ru": item.translation_ru,
-                "translation_nn": item.translation_nn,
-                "translation_nb": item.translation_nb,
-                "tags": ";".join(item.tags or []),
-            }
-        )
 
+def export_glossary_to_file(file_obj: TextIO, queryset: QuerySet[GlossaryTerm]) -> None:
+    write_csv(file_obj, iter_glossary_rows(queryset))
 
-def import_glossary_from_reader(
-    reader: Iterable[dict], update: bool = False
-) -> ImportStats:
-    created = updated = skipped = 0
-    for row in reader:
-        term = (row.get("term") or "").strip()
-        if not term:
-            skipped += 1
-            continue
 
-        stream = (row.get("stream") or "").strip().lower()
-        level = (row.get("level") or "").strip().upper()
+def _legacy_translation(values, row) -> None:
+    # Backwards compatibility: if only a generic "translation"
+    # column is present, prefer it as English.
+    if values["translation"] and not (
+        values["translation_en"] or values["translation_ru"]
+    ):
+        values["translation_en"] = values["translation"]
 
-        if not stream:
-            stream = GlossaryTerm._meta.get_field("stream").default
-        if not level:
-            level = GlossaryTerm._meta.get_field("level").default
+    # Fallback for the legacy "translation" field used in search.
+    if not values["translation"]:
+        values["translation"] = (
+            values["translation_en"]
+            or values["translation_nb"]
+            or values["translation_ru"]
+            or values["translation_nn"]
+        )
 
-        base_translation = (row.get("translation") or "").strip()
-        translation_en = (row.get("translation_en") or "").strip()
-        translation_ru = (row.get("translation_ru") or "").strip()
-        translation_nn = (row.get("translation_nn") or "").strip()
-        translation_nb = (row.get("translation_nb") or "").strip()
 
-        # Backwards compatibility: if only a generic "translation"
-        # column is present, prefer it as English.
-        if base_translation and not (translation_en or translation_ru):
-            translation_en = base_translation
+GLOSSARY_SPEC = ImportSpec(
+    model=GlossaryTerm,
+    key_fields=("term", "stream", "level"),
+    fields={
+        "term": text,
+        "stream": lower,
+        "level": upper,
+        "translation": text,
+        "translation_en": text,
+        "translation_ru": text,
+        "translation_nn": text,
+        "translation_nb": text,
+        "explanation": text,
+        "tags": tags,
+    },
+    hooks=(
+        require("term"),
+        model_defaults(GlossaryTerm, "stream", "level"),
+        _legacy_translation,
+    ),
+    unique_key=True,
+)
 
-        # Fallback for the legacy "translation" field used in search.
-        if not base_translation:
-            base_translation = (
-                translation_en or translation_nb or translation_ru or translation_nn
-            )
 
-        defaults = {
-            "translation": base_translation,
-            "translation_en": translation_en,
-            "translation_ru": translation_ru,
-            "translation_nn": translation_nn,
-            "translation_nb": translation_nb,
-            "explanation": (row.get("explanation") or "").strip(),
-            "tags": [
-                t.strip() for t in (row.get("tags") or "").split(";") if t.strip()
-            ],
-        }
-        obj, created_flag = GlossaryTerm.objects.get_or_create(
-            term=term, stream=stream, level=level, defaults=defaults
-        )
-        if created_flag:
-            created += 1
-            continue
-        if update:
-            for key, value in defaults.items():
-                setattr(obj, key, value)
-            obj.save()
-            updated += 1
-        else:
-            skipped += 1
-    return ImportStats(created=created, updated=updated, skipped=skipped)
+def import_glossary_from_reader(
+    reader: Iterable[dict],
+    update: bool = False,
+    **options,
+) -> ImportStats:
+    return run_import(GLOSSARY_SPEC, reader, update=update, **options)
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.db import connection
+
+from ..models import Answer, Question, Submission
+from .answer_key import AnswerKey, QuestionKey, normalize_response
+
+
+@dataclass
+class GradedAnswer:
+    question: QuestionKey
+    selected_option_id: Optional[int]
+    text_response: str
+    is_correct: bool
+
+
+@dataclass
+class GradingResult:
+    answers: List[GradedAnswer] = field(default_factory=list)
+
+    @property
+    def score(self) -> int:
+        return sum(1 for answer in self.answers if answer.is_correct)
+
+    @property
+    def total_questions(self) -> int:
+        return len(self.answers)
+
+
+def grade_answers(
+    answer_key: AnswerKey, validated_answers: Iterable[Dict[str, Any]]
+) -> GradingResult:
+    """Grade answers against a compiled answer key without touching the database."""
+    answers_lookup: Dict[int, Dict[str, Any]] = {
+        payload["question"]: payload for payload in validated_answers
+    }
+    result = GradingResult()
+    for question in answer_key.questions:
+        payload = answers_lookup.get(question.question_id) or {}
+        selected_option_id: Optional[int] = None
+        text_response: str = payload.get("text_response") or ""
+        is_correct = False
+
+        if question.question_type == Question.QuestionType.SINGLE_CHOICE:
+            option_id = payload.get("selected_option")
+            if option_id and option_id in question.option_texts:
+                selected_option_id = option_id
+                is_correct = option_id in question.correct_option_ids
+        else:
+            # Fill-in answers are compared with the correct option text if it exists
+            is_correct = normalize_response(text_response) in question.accepted_texts
+
+        result.answers.append(
+            GradedAnswer(
+                question=question,
+                selected_option_id=selected_option_id,
+                text_response=text_response,
+                is_correct=is_correct,
+            )
+        )
+    return result
+
+
+def save_answers(submission: Submission, result: GradingResult) -> List[Answer]:
+    """Bulk-insert graded answers and return the saved instances in question order."""
+    answers = Answer.objects.bulk_create(
+        [
+            Answer(
+                submission=submission,
+                question_id=graded.question.question_id,
+                selected_option_id=graded.selected_option_id,
+                text_response=graded.text_response,
+                is_correct=graded.is_correct,
+            )
+            for graded in result.answers
+        ]
+    )
+    if answers and not connection.features.can_return_rows_from_bulk_insert:
+        # Backends that cannot return primary keys from a bulk insert need one
+        # extra read so the response can expose answer ids.
+        saved = {answer.question_id: answer for answer in submission.answers.all()}
+        answers = [saved[answer.question_id] for answer in answers]
+    return answers
+
+
+def build_review(result: GradingResult) -> List[Dict[str, Any]]:
+    review = []
+    for graded in result.answers:
+        question = graded.question
+        review.append(
+            {
+                "question": question.question_id,
+                "order": question.order,
+                "text": question.text,
+                "question_type": question.question_type,
+                "selected_text": (
+                    question.option_texts[graded.selected_option_id]
+                    if graded.selected_option_id
+                    else graded.text_response
+                ),
+                "is_correct": graded.is_correct,
+                "correct_answers": list(question.correct_answers),
+                "explanation": question.explanation,
+            }
+        )
+    return sorted(review, key=lambda item: item["order"])
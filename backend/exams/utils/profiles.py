@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.db import transaction
+
+from ..caching import content_cache
+from ..fields import normalize_email
+from ..models import StudentProfile, Test
+
+CACHE_KEY_PREFIX = "exams:profile"
+_MISSING = "missing"
+
+
+def _cache_key(email: str) -> str:
+    return f"{CACHE_KEY_PREFIX}:{email}"
+
+
+def profile_snapshot(profile: Optional[StudentProfile]) -> Dict[str, Any]:
+    if profile is None:
+        return {
+            "stream": Test.Stream.BOKMAAL,
+            "level": Test.Level.A1,
+            "allow_stream_change": True,
+        }
+    return {
+        "stream": profile.stream,
+        "level": profile.level,
+        "allow_stream_change": profile.allow_stream_change,
+    }
+
+
+def get_profile_snapshot(email: str) -> Dict[str, Any]:
+    """Read-only, cached profile lookup; unknown emails get the defaults.
+
+    Never creates rows: profiles are created by ``ensure_profile`` on explicit
+    write paths, and cache entries are dropped by the StudentProfile signals.
+    """
+    email = normalize_email(email)
+    if not email:
+        return profile_snapshot(None)
+    cache = content_cache()
+    cached = cache.get(_cache_key(email))
+    if cached is not None:
+        return profile_snapshot(None) if cached == _MISSING else cached
+    profile = (
+        StudentProfile.objects.filter(email=email)
+        .only("stream", "level", "allow_stream_change")
+        .first()
+    )
+    snapshot = profile_snapshot(profile)
+    cache.set(
+        _cache_key(email),
+        snapshot if profile else _MISSING,
+        getattr(settings, "PROFILE_CACHE_TIMEOUT", 300),
+    )
+    return snapshot
+
+
+def ensure_profile(email: str, user=None) -> StudentProfile:
+    """Create the profile for ``email`` if needed and link it to ``user``."""
+    profile, _ = StudentProfile.objects.get_or_create(
+        email=normalize_email(email),
+        defaults={"stream": Test.Stream.BOKMAAL, "level": Test.Level.A1},
+    )
+    if user is not None and user.is_authenticated and not profile.user_id:
+        profile.user = user
+        profile.save(update_fields=["user"])
+    return profile
+
+
+def invalidate_profile(email: str) -> None:
+    key = _cache_key(normalize_email(email))
+    content_cache().delete(key)
+    transaction.on_commit(lambda: content_cache().delete(key))
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 import csv
-from dataclasses import dataclass
-from typing import Iterable, TextIO
+from typing import Iterator, TextIO
 
-from django.core.exceptions import MultipleObjectsReturned
+from django.db.models import QuerySet
 
 from exams.models import Test, VerbEntry
 
+from .csv_export import EXPORT_CHUNK_SIZE, write_csv
+from .csv_import import ImportSpec, ImportStats, SkipRow, run_import, tags, text
+
 CSV_HEADER = [
     "verb",
     "stream",
@@ -28,90 +30,36 @@ CSV_HEADER = [
 EXAMPLE_SEPARATOR = " | "
 
 
-def export_verbs_to_file(file_obj: TextIO, queryset: Iterable[VerbEntry]) -> None:
-    file_obj.write("\ufeff")
-    writer = csv.writer(file_obj)
-    writer.writerow(CSV_HEADER)
-    for entry in queryset:
-        writer.writerow(
-            [
-                entry.verb,
-                entry.stream,
-                entry.infinitive,
-                entry.present,
-                entry.past,
-                entry.perfect,
-                entry.examples_infinitive.replace("\n", EXAMPLE_SEPARATOR),
-                entry.examples_present.replace("\n", EXAMPLE_SEPARATOR),
-                entry.examples_past.replace("\n", EXAMPLE_SEPARATOR),
-                entry.examples_perfect.replace("\n", EXAMPLE_SEPARATOR),
-                entry.translation_en,
-                entry.translation_ru,
-                entry.translation_nb,
-                ";".join(entry.tags or []),
-            ]
-        )
-
-
-@dataclass
-class ImportStats:
-    created: int = 0
-    updated: int = 0
-    skipped: int = 0
-
-
-def import_verbs_from_reader(reader: csv.DictReader, *, update: bool = False) -> ImportStats:
-    stats = ImportStats()
-    missing = set(CSV_HEADER) - set(reader.fieldnames or [])
-    if missing:
-        raise ValueError(f"Missing columns: {', '.join(sorted(missing))}")
-
-    for row in reader:
-        stream = row["stream"].strip()
-        if stream not in Test.Stream.values:
-            stats.skipped += 1
-            continue
-        tags = [tag.strip() for tag in row.get("tags", "").split(";") if tag.strip()]
-        defaults = {
-            "infinitive": row["infinitive"].strip(),
-            "present": row["present"].strip(),
-            "past": row["past"].strip(),
-            "perfect": row["perfect"].strip(),
-            "examples_infinitive": _parse_examples(row["examples_infinitive"]),
-            "examples_present": _parse_examples(row["examples_present"]),
-            "examples_past": _parse_examples(row["examples_past"]),
-            "examples_perfect": _parse_examples(row["examples_perfect"]),
-            "translation_en": row.get("translation_en", "").strip(),
-            "translation_ru": row.get("translation_ru", "").strip(),
-            "translation_nb": row.get("translation_nb", "").strip(),
-            "tags": tags,
-        }
-        verb_key = row["verb"].strip()
-        try:
-            entry, created_flag = VerbEntry.objects.get_or_create(
-                verb=verb_key,
-                stream=stream,
-                defaults=defaults,
-            )
-        except MultipleObjectsReturned:
-            entry = (
-                VerbEntry.objects.filter(verb=verb_key, stream=stream)
-                .order_by("id")
-                .first()
-            )
-            created_flag = False
-
-        if created_flag:
-            stats.created += 1
-        elif update and entry:
-            for field, value in defaults.items():
-                setattr(entry, field, value)
-            entry.save()
-            stats.updated += 1
-        else:
-            stats.skipped += 1
-
-    return stats
+EXAMPLE_FIELDS = {
+    "examples_infinitive",
+    "examples_present",
+    "examples_past",
+    "examples_perfect",
+}
+
+
+def iter_verb_rows(queryset: QuerySet[VerbEntry]) -> Iterator[list]:
+    """Header plus one CSV row per verb, streamed from a ``values_list``."""
+    yield CSV_HEADER
+    example_positions = [
+        idx for idx, name in enumerate(CSV_HEADER) if name in EXAMPLE_FIELDS
+    ]
+    values = queryset.values_list(*CSV_HEADER).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    for row in values:
+        row = list(row)
+        for idx in example_positions:
+            row[idx] = row[idx].replace("\n", EXAMPLE_SEPARATOR)
+        row[-1] = ";".join(row[-1] or [])
+        yield row
+
+
+def export_verbs_to_file(file_obj: TextIO, queryset: QuerySet[VerbEntry]) -> None:
+    write_csv(file_obj, iter_verb_rows(queryset), bom=True)
+
+
+def _valid_stream(values, row) -> None:
+    if values["stream"] not in Test.Stream.values:
+        raise SkipRow(f"unknown stream '{values['stream']}'")
 
 
 def _parse_examples(cell: str) -> str:
@@ -121,3 +69,37 @@ def _parse_examples(cell: str) -> str:
     if EXAMPLE_SEPARATOR in value:
         return "\n".join(part.strip() for part in value.split(EXAMPLE_SEPARATOR))
     return value
+
+
+VERB_SPEC = ImportSpec(
+    model=VerbEntry,
+    key_fields=("verb", "stream"),
+    fields={
+        "verb": text,
+        "stream": text,
+        "infinitive": text,
+        "present": text,
+        "past": text,
+        "perfect": text,
+        "examples_infinitive": _parse_examples,
+        "examples_present": _parse_examples,
+        "examples_past": _parse_examples,
+        "examples_perfect": _parse_examples,
+        "translation_en": text,
+        "translation_ru": text,
+        "translation_nb": text,
+        "tags": tags,
+    },
+    hooks=(_valid_stream,),
+    required_columns=tuple(CSV_HEADER),
+)
+
+
+def import_verbs_from_reader(
+    reader: csv.DictReader,
+    *,
+    update: bool = False,
+    **options,
+) -> ImportStats:
+    """Import verbs matched by ``(verb, stream)``; options go to ``run_import``."""
+    return run_import(VERB_SPEC, reader, update=update, **options)
@@ -1,16 +1,16 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
-
 from django.contrib.auth import logout
 from django.db import models, transaction
 from rest_framework import mixins, status, viewsets
 from rest_framework.authentication import SessionAuthentication
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
+from .caching import CachedListMixin
+from .conditional import ConditionalGetMixin
 from .models import (
-    Answer,
     Assignment,
     Exercise,
     Expression,
@@ -25,6 +25,8 @@ from .models import (
     Test,
     VerbEntry,
 )
+from .pagination import KeysetPagination
+from .search import search_glossary
 from .serializers import (
     AnswerInputSerializer,
     AnswerSerializer,
@@ -35,12 +37,23 @@ from .serializers import (
     HomeworkSerializer,
     MaterialSerializer,
     ReadingSerializer,
+    ReadingSummarySerializer,
     StudentProfileSerializer,
     SubmissionSerializer,
     TestDetailSerializer,
     TestListSerializer,
     VerbEntrySerializer,
 )
+from .utils.access import allowed_test_ids
+from .utils.answer_key import get_answer_key
+from .utils.autocomplete import KINDS, autocomplete
+from .utils.grading import build_review, grade_answers, save_answers
+from .utils.profiles import (
+    ensure_profile,
+    get_profile_snapshot,
+    normalize_email,
+    profile_snapshot,
+)
 
 
 class CsrfExemptSessionAuthentication(SessionAuthentication):
@@ -48,16 +61,32 @@ class CsrfExemptSessionAuthentication(SessionAuthentication):
         return
 
 
-class TestViewSet(viewsets.ReadOnlyModelViewSet):
+class TestViewSet(ConditionalGetMixin, CachedListMixin, viewsets.ReadOnlyModelViewSet):
     authentication_classes = (CsrfExemptSessionAuthentication,)
+    cache_dependencies = (Test, Question, Option, Assignment)
     serializer_class = TestListSerializer
     lookup_field = "slug"
     lookup_value_regex = "[^/]+"
 
     def get_queryset(self):
-        base_qs = Test.objects.filter(is_published=True).prefetch_related(
-            "questions__options"
-        )
+        qs = self.get_catalog_queryset()
+        if self.action == "list":
+            return qs.with_question_stats()
+        if self.action == "retrieve":
+            return qs.prefetch_related("questions__options")
+        return qs
+
+    def get_validator_queryset(self):
+        return self.filter_queryset(self.get_catalog_queryset())
+
+    def get_cache_variant(self, request) -> str:
+        # Assignments expire without any write, so the cached catalog is keyed
+        # by the restricted tests the student can open right now.
+        email = request.query_params.get("student_email", "")
+        return ",".join(str(test_id) for test_id in sorted(allowed_test_ids(email)))
+
+    def get_catalog_queryset(self):
+        base_qs = Test.objects.filter(is_published=True)
         stream = (self.request.query_params.get("stream") or "").strip().lower()
         level = (self.request.query_params.get("level") or "").strip().upper()
         if stream:
@@ -68,11 +97,8 @@ class TestViewSet(viewsets.ReadOnlyModelViewSet):
         if not email:
             return base_qs.filter(is_restricted=False).order_by("level", "title")
 
-        allowed_ids = Assignment.objects.filter(student_email=email).values_list(
-            "test_id", flat=True
-        )
         return base_qs.filter(
-            models.Q(is_restricted=False) | models.Q(id__in=allowed_ids)
+            models.Q(is_restricted=False) | models.Q(id__in=allowed_test_ids(email))
         ).order_by("level", "title")
 
     def get_serializer_class(self):
@@ -86,10 +112,7 @@ class TestViewSet(viewsets.ReadOnlyModelViewSet):
         test = self.get_object()
         email = (request.data.get("email") or "").strip().lower()
         if test.is_restricted and email:
-            has_assignment = Assignment.objects.filter(
-                test=test, student_email=email
-            ).exists()
-            if not has_assignment:
+            if test.pk not in allowed_test_ids(email):
                 return Response(
                     {"detail": "This test is restricted. Ask your teacher for access."},
                     status=status.HTTP_403_FORBIDDEN,
@@ -104,88 +127,17 @@ class TestViewSet(viewsets.ReadOnlyModelViewSet):
         serializer.is_valid(raise_exception=True)
         validated_answers = serializer.validated_data
 
+        result = grade_answers(get_answer_key(test), validated_answers)
         submission = Submission.objects.create(
             test=test,
             name=request.data.get("name", "").strip(),
-            email=email,
-            total_questions=test.questions.count(),
+            student=ensure_profile(email) if email else None,
+            score=result.score,
+            total_questions=result.total_questions,
             locale=(request.data.get("locale") or "en")[:5],
         )
-
-        score = 0
-        answers_to_create = []
-        answers_lookup: Dict[int, Dict[str, Any]] = {
-            payload["question"]: payload for payload in validated_answers
-        }
-
-        for question in test.questions.all():
-            payload = answers_lookup.get(question.id)
-            selected_option: Optional[Option] = None
-            text_response: str = (payload or {}).get("text_response") or ""
-            is_correct = False
-
-            if question.question_type == Question.QuestionType.SINGLE_CHOICE:
-                option_id = (payload or {}).get("selected_option")
-                if option_id:
-                    try:
-                        selected_option = question.options.get(id=option_id)
-                        is_correct = selected_option.is_correct
-                    except Option.DoesNotExist:
-                        selected_option = None
-                        is_correct = False
-            else:
-                # Fill-in answers are compared with the correct option text if it exists
-                correct_texts = [
-                    option.text.strip().casefold()
-                    for option in question.options.filter(is_correct=True)
-                ]
-                normalized_response = text_response.strip().casefold()
-                is_correct = (
-                    normalized_response in correct_texts if correct_texts else False
-                )
-
-            if is_correct:
-                score += 1
-
-            answers_to_create.append(
-                Answer(
-                    submission=submission,
-                    question=question,
-                    selected_option=selected_option,
-                    text_response=text_response,
-                    is_correct=is_correct,
-                )
-            )
-
-        Answer.objects.bulk_create(answers_to_create)
-        submission.score = score
-        submission.save(update_fields=["score"])
-
-        review_payload = []
-        for created_answer in submission.answers.select_related(
-            "question", "selected_option"
-        ).all():
-            question = created_answer.question
-            correct_texts = [
-                option.text for option in question.options.filter(is_correct=True)
-            ]
-            selected_text = (
-                created_answer.selected_option.text
-                if created_answer.selected_option
-                else created_answer.text_response
-            )
-            review_payload.append(
-                {
-                    "question": question.id,
-                    "order": question.order,
-                    "text": question.text,
-                    "question_type": question.question_type,
-                    "selected_text": selected_text,
-                    "is_correct": created_answer.is_correct,
-                    "correct_answers": correct_texts,
-                    "explanation": question.explanation,
-                }
-            )
+        answers = save_answers(submission, result)
+        score = result.score
 
         response_payload = {
             "summary": {
@@ -196,8 +148,8 @@ class TestViewSet(viewsets.ReadOnlyModelViewSet):
                 "incorrect": max(submission.total_questions - score, 0),
             },
             "submission": SubmissionSerializer(submission).data,
-            "answers": AnswerSerializer(submission.answers.all(), many=True).data,
-            "review": sorted(review_payload, key=lambda item: item["order"]),
+            "answers": AnswerSerializer(answers, many=True).data,
+            "review": build_review(result),
         }
         return Response(response_payload, status=status.HTTP_201_CREATED)
 
@@ -205,43 +157,41 @@ class TestViewSet(viewsets.ReadOnlyModelViewSet):
 class ProfileViewSet(viewsets.ViewSet):
     authentication_classes = (CsrfExemptSessionAuthentication,)
 
-    @action(detail=False, methods=["get"])
+    @action(detail=False, methods=["get", "post"])
     def me(self, request):
+        """Current visitor and their stream/level.
+
+        GET is a cached read that never writes; POST explicitly creates the
+        student profile (and links it to the logged-in user).
+        """
         user = request.user
         is_authenticated = bool(user and user.is_authenticated)
         is_teacher = bool(is_authenticated and (user.is_staff or user.is_superuser))
         display_name = ""
         username = ""
-        student_email = (
-            (request.query_params.get("student_email") or "").strip().lower()
-        )
-        profile_email = student_email or getattr(user, "email", "") or ""
-        profile = None
-        if profile_email:
-            profile, _ = StudentProfile.objects.get_or_create(
-                email=profile_email,
-                defaults={"stream": Test.Stream.BOKMAAL, "level": Test.Level.A1},
-            )
-            if is_authenticated and not profile.user:
-                profile.user = user
-                profile.save(update_fields=["user"])
         if is_authenticated:
             username = user.get_username()
             display_name = (user.get_full_name() or username or "").strip()
-            if not profile and user.email:
-                profile, _ = StudentProfile.objects.get_or_create(
-                    email=user.email,
-                    defaults={"stream": Test.Stream.BOKMAAL, "level": Test.Level.A1},
+        params = request.data if request.method == "POST" else request.query_params
+        profile_email = normalize_email(
+            params.get("student_email") or getattr(user, "email", "")
+        )
+        if request.method == "POST":
+            if not profile_email:
+                return Response(
+                    {"detail": "Email required to create a profile."},
+                    status=status.HTTP_400_BAD_REQUEST,
                 )
+            snapshot = profile_snapshot(ensure_profile(profile_email, user))
+        else:
+            snapshot = get_profile_snapshot(profile_email)
         return Response(
             {
                 "is_teacher": is_teacher,
                 "is_authenticated": is_authenticated,
                 "username": username,
                 "display_name": display_name,
-                "stream": profile.stream if profile else Test.Stream.BOKMAAL,
-                "level": profile.level if profile else Test.Level.A1,
-                "allow_stream_change": profile.allow_stream_change if profile else True,
+                **snapshot,
             }
         )
 
@@ -266,10 +216,7 @@ class ProfileViewSet(viewsets.ViewSet):
                 {"detail": "Email required to update stream."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        profile, _ = StudentProfile.objects.get_or_create(
-            email=email,
-            defaults={"stream": Test.Stream.BOKMAAL, "level": Test.Level.A1},
-        )
+        profile = ensure_profile(email, request.user)
         if not profile.allow_stream_change:
             return Response(
                 {"detail": "Stream change is locked for this student."},
@@ -292,56 +239,141 @@ class FilteredStreamLevelMixin:
             qs = qs.filter(stream=stream)
         if level and hasattr(qs.model, "level"):
             qs = qs.filter(level=level)
-        if hasattr(qs.model, "assigned_to_email") and email:
+        if hasattr(qs.model, "assigned_to") and email:
+            student_ids = StudentProfile.objects.filter(email=email).values("pk")
             qs = qs.filter(
-                models.Q(assigned_to_email__isnull=True)
-                | models.Q(assigned_to_email=email)
+                models.Q(assigned_to__isnull=True)
+                | models.Q(assigned_to__in=student_ids)
             )
         return qs
 
 
+class FieldProjectionMixin:
+    """Support ``?fields=a,b`` on list endpoints.
+
+    Unrequested serializer fields are dropped from the payload and unrequested
+    model columns are deferred, so large text columns are never read from the
+    database unless a client asks for them.
+    """
+
+    fields_query_param = "fields"
+
+    def get_projected_fields(self):
+        if getattr(self, "action", None) != "list":
+            return None
+        raw = self.request.query_params.get(self.fields_query_param) or ""
+        requested = [name.strip() for name in raw.split(",") if name.strip()]
+        if not requested:
+            return None
+        available = self.get_serializer_class().Meta.fields
+        unknown = sorted(set(requested) - set(available))
+        if unknown:
+            raise ValidationError(
+                {self.fields_query_param: f"Unknown fields: {', '.join(unknown)}."}
+            )
+        return [name for name in available if name in requested]
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        projected = self.get_projected_fields()
+        if not projected:
+            return queryset
+        opts = queryset.model._meta
+        concrete = {field.name for field in opts.concrete_fields}
+        ordering = {
+            name.lstrip("-")
+            for name in (queryset.query.order_by or opts.ordering)
+            if isinstance(name, str)
+        }
+        # Serializer fields may read another column (``source=``); relations
+        # that are select_related cannot be deferred.
+        fields = self.get_serializer_class()().fields
+        sources = {
+            fields[name].source_attrs[0]
+            for name in projected
+            if fields[name].source_attrs
+        }
+        if isinstance(queryset.query.select_related, dict):
+            sources.update(queryset.query.select_related)
+        columns = (sources | ordering | {opts.pk.name}) & concrete
+        return queryset.only(*sorted(columns))
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        projected = self.get_projected_fields()
+        if projected:
+            fields = getattr(serializer, "child", serializer).fields
+            for name in list(fields):
+                if name not in projected:
+                    fields.pop(name)
+        return serializer
+
+
 class MaterialViewSet(
-    mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet
+    FieldProjectionMixin,
+    ConditionalGetMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet,
 ):
     authentication_classes = (CsrfExemptSessionAuthentication,)
     serializer_class = MaterialSerializer
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
-        qs = Material.objects.filter(is_published=True)
+        qs = Material.objects.filter(is_published=True).select_related("assigned_to")
         return FilteredStreamLevelMixin.filter_by_stream_level(self, qs).order_by(
             "level", "title"
         )
 
 
 class HomeworkViewSet(
-    mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet
+    FieldProjectionMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet,
 ):
     authentication_classes = (CsrfExemptSessionAuthentication,)
     serializer_class = HomeworkSerializer
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
-        qs = Homework.objects.filter(status=Homework.Status.PUBLISHED)
+        qs = Homework.objects.filter(status=Homework.Status.PUBLISHED).select_related(
+            "assigned_to"
+        )
         return FilteredStreamLevelMixin.filter_by_stream_level(self, qs).order_by(
             "-due_date", "-created_at"
         )
 
 
 class ExerciseViewSet(
-    mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet
+    FieldProjectionMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet,
 ):
     authentication_classes = (CsrfExemptSessionAuthentication,)
     serializer_class = ExerciseSerializer
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
-        qs = Exercise.objects.all()
+        qs = Exercise.objects.all().select_related("assigned_to")
         return FilteredStreamLevelMixin.filter_by_stream_level(self, qs).order_by(
             "level", "title"
         )
 
 
-class VerbEntryViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+class VerbEntryViewSet(
+    FieldProjectionMixin,
+    ConditionalGetMixin,
+    CachedListMixin,
+    mixins.ListModelMixin,
+    viewsets.GenericViewSet,
+):
     authentication_classes = (CsrfExemptSessionAuthentication,)
     serializer_class = VerbEntrySerializer
+    pagination_class = KeysetPagination
+    cache_dependencies = (VerbEntry,)
 
     def get_queryset(self):
         qs = VerbEntry.objects.all()
@@ -350,9 +382,17 @@ class VerbEntryViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
         )
 
 
-class ExpressionViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+class ExpressionViewSet(
+    FieldProjectionMixin,
+    ConditionalGetMixin,
+    CachedListMixin,
+    mixins.ListModelMixin,
+    viewsets.GenericViewSet,
+):
     authentication_classes = (CsrfExemptSessionAuthentication,)
     serializer_class = ExpressionSerializer
+    pagination_class = KeysetPagination
+    cache_dependencies = (Expression,)
 
     def get_queryset(self):
         qs = Expression.objects.all()
@@ -361,39 +401,113 @@ class ExpressionViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
         )
 
 
-class GlossaryTermViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+class GlossaryTermViewSet(
+    FieldProjectionMixin,
+    ConditionalGetMixin,
+    CachedListMixin,
+    mixins.ListModelMixin,
+    viewsets.GenericViewSet,
+):
     authentication_classes = (CsrfExemptSessionAuthentication,)
     serializer_class = GlossaryTermSerializer
+    pagination_class = KeysetPagination
+    cache_dependencies = (GlossaryTerm,)
+
+    def get_search_term(self) -> str:
+        return (self.request.query_params.get("q") or "").strip()
+
+    @property
+    def paginator(self):
+        # Ranked search results are ordered by relevance, which has no keyset.
+        if self.get_search_term():
+            return None
+        return super().paginator
 
     def get_queryset(self):
         qs = GlossaryTerm.objects.all()
         stream = (self.request.query_params.get("stream") or "").strip().lower()
         if stream:
             qs = qs.filter(stream=stream)
-        search_term = (self.request.query_params.get("q") or "").strip()
+        search_term = self.get_search_term()
         if search_term:
-            qs = qs.filter(
-                models.Q(term__icontains=search_term)
-                | models.Q(translation__icontains=search_term)
-                | models.Q(translation_en__icontains=search_term)
-                | models.Q(translation_ru__icontains=search_term)
-                | models.Q(translation_nb__icontains=search_term)
-                | models.Q(translation_nn__icontains=search_term)
-                | models.Q(explanation__icontains=search_term)
-            )
+            return search_glossary(qs, search_term).order_by("-search_rank", "term")
         return qs.order_by("term")
 
 
 class ReadingViewSet(
-    mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet
+    FieldProjectionMixin,
+    ConditionalGetMixin,
+    CachedListMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet,
 ):
     authentication_classes = (CsrfExemptSessionAuthentication,)
     serializer_class = ReadingSerializer
+    pagination_class = KeysetPagination
+    cache_dependencies = (Reading,)
     lookup_field = "slug"
     lookup_value_regex = "[^/]+"
 
+    def is_summary_list(self) -> bool:
+        return (
+            self.action == "list"
+            and self.request.query_params.get("view", "").strip().lower() == "summary"
+        )
+
+    def get_serializer_class(self):
+        if self.is_summary_list():
+            return ReadingSummarySerializer
+        return super().get_serializer_class()
+
     def get_queryset(self):
         qs = Reading.objects.filter(is_published=True)
+        if self.is_summary_list():
+            qs = qs.only(*ReadingSummarySerializer.Meta.fields)
         return FilteredStreamLevelMixin.filter_by_stream_level(self, qs).order_by(
             "level", "title"
         )
+
+
+class AutocompleteViewSet(viewsets.ViewSet):
+    """Prefix suggestions over glossary terms, verbs and expressions.
+
+    Served from an in-process index (see ``exams.utils.autocomplete``), so a
+    lookup never touches the database once the index is built.
+    """
+
+    authentication_classes = (CsrfExemptSessionAuthentication,)
+    max_limit = 50
+
+    def list(self, request):
+        query = (request.query_params.get("q") or "").strip()
+        stream = (request.query_params.get("stream") or "").strip().lower()
+        kinds = [
+            kind.strip()
+            for kind in (request.query_params.get("kind") or "").split(",")
+            if kind.strip()
+        ]
+        unknown = sorted(set(kinds) - set(KINDS))
+        if unknown:
+            raise ValidationError({"kind": f"Unknown kinds: {', '.join(unknown)}."})
+        try:
+            limit = int(request.query_params.get("limit") or 10)
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer."})
+        suggestions = autocomplete(
+            query,
+            stream=stream or None,
+            kinds=kinds or None,
+            limit=max(1, min(limit, self.max_limit)),
+        )
+        return Response(
+            [
+                {
+                    "kind": suggestion.kind,
+                    "id": suggestion.id,
+                    "text": suggestion.text,
+                    "stream": suggestion.stream,
+                }
+                for suggestion in suggestions
+            ]
+        )
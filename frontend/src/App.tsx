@@ -4,6 +4,7 @@ import Header from "./components/Header";
 import Footer from "./components/Footer";
 
 import {
+  createProfile,
   fetchExercises,
   fetchExpressions,
   fetchGlossary,
@@ -48,6 +49,15 @@ const normalizeVocabId = (id: string): string => {
   return id;
 };
 
+// Creates the student profile once per email (or logged-in user) so that
+// teachers can assign content to students who have only browsed so far.
+const ensureProfile = (marker: string, email?: string) => {
+  if (!marker || localStorage.getItem("norskkurs_profile_for") === marker) return;
+  createProfile(email)
+    .then(() => localStorage.setItem("norskkurs_profile_for", marker))
+    .catch(() => null);
+};
+
 type Section =
   | "readings"
   | "materials"
@@ -171,6 +181,9 @@ const App = () => {
       .then((data) => {
         setAuth(data);
         setIsTeacher(data.is_teacher);
+        if (data.is_authenticated && !data.is_teacher && !studentEmail) {
+          ensureProfile(`user:${data.username ?? ""}`);
+        }
         if (data.stream) {
           setStream(data.stream);
           localStorage.setItem("norskkurs_stream", data.stream);
@@ -989,7 +1002,12 @@ const App = () => {
                 onChange={(e) => {
                   setStudentEmail(e.target.value.trim());
                 }}
-                onBlur={() => setVisibleCount(12)}
+                onBlur={(e) => {
+                  setVisibleCount(12);
+                  if (studentEmail && e.target.validity.valid) {
+                    ensureProfile(studentEmail.toLowerCase(), studentEmail);
+                  }
+                }}
               />
             </div>
             <div className="search-row">
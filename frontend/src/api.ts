@@ -54,6 +54,15 @@ export const fetchProfile = async (): Promise<ProfileInfo> => {
   return res.data;
 };
 
+// GET profile/me/ never writes; the profile row is created explicitly here.
+export const createProfile = async (studentEmail?: string): Promise<ProfileInfo> => {
+  const res = await api.post<ProfileInfo>(
+    "profile/me/",
+    studentEmail ? { student_email: studentEmail } : {},
+  );
+  return res.data;
+};
+
 export const logoutProfile = async (): Promise<void> => {
   await api.post("profile/logout/");
 };